@@ -54,6 +54,7 @@ export function useMultiAgent() {
   const historicalData = ref(null)  // 缓存历史数据，供性能对比使用
   const optimizationResults = ref(null)
   const experimentWorkorder = ref(null)
+  const simulationJobs = ref({})  // 后台模拟任务进度 { job_id: { status, progress, error } }
 
   // 结果列表（按时间顺序显示）
   const results = ref([])
@@ -175,6 +176,11 @@ export function useMultiAgent() {
         handleToolResult(data)
         break
 
+      case 'tool_progress':
+        // 后台模拟任务进度（对话轮次结束后仍会推送）
+        handleToolProgress(data)
+        break
+
       case 'structured_content':
         // 从 Agent 输出中提取的结构化内容（优化方案摘要、工单信息等）
         handleStructuredContent(data.data)
@@ -305,6 +311,20 @@ export function useMultiAgent() {
     }
   }
 
+  /**
+   * 处理后台模拟任务进度
+   */
+  const handleToolProgress = (data) => {
+    const { job_id, tool, status, progress, error } = data
+    const name = data.display_name || 'TopPhi 模拟'
+    simulationJobs.value = { ...simulationJobs.value, [job_id]: { tool, status, progress, error } }
+    if (status === 'completed') {
+      ElMessage.success(`${name}已完成，可询问助手查看结果`)
+    } else if (status === 'failed') {
+      ElMessage.error(`${name}失败: ${error || '未知错误'}`)
+    }
+  }
+
   /**
    * 处理工具结果
    * 
@@ -340,9 +360,20 @@ export function useMultiAgent() {
       return
     }
     
-    if (tool.includes('simulate_topphi')) {
-      addResult('topphi', display_name || 'TopPhi 模拟', result)
-    } else if (tool.includes('predict_ml')) {
+    // 模拟任务句柄/状态 - 进度由 tool_progress 推送，完成后展示模拟结果
+    // 参数扫描结果为描述符汇总表，按通用结果展示
+    if (tool.includes('simulate_topphi') || tool.includes('simulation_job') || tool.includes('parameter_sweep')) {
+      if (result.status === 'completed' && result.result) {
+        if (result.kind === 'sweep') {
+          addResult('other', '参数扫描', result.result)
+        } else {
+          addResult('topphi', display_name || 'TopPhi 模拟', result.result)
+        }
+      }
+      return
+    }
+    
+    if (tool.includes('predict_ml')) {
       performancePrediction.value = result  // 缓存 ML 预测结果
       addResult('performance', display_name || 'ML 性能预测', result)
     } else if (tool.includes('compare_historical')) {
@@ -785,6 +816,7 @@ export function useMultiAgent() {
     performancePrediction,
     optimizationResults,
     experimentWorkorder,
+    simulationJobs,
     
     // 参数
     sessionParams,
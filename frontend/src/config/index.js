@@ -29,7 +29,8 @@ export const WS_BASE_URL = import.meta.env.VITE_WS_BASE_URL || (
 export const WS_ENDPOINTS = {
   chat: `${WS_BASE_URL}/ws/coating/chat`,       // 对话式模式（v2.0 推荐）
   coating: `${WS_BASE_URL}/ws/coating/agent`,   // 多Agent模式（旧版）
-  coatingLegacy: `${WS_BASE_URL}/ws/coating`    // 原工作流模式（备用）
+  coatingLegacy: `${WS_BASE_URL}/ws/coating`,   // 原工作流模式（备用）
+  vtkStream: `${WS_BASE_URL}/ws/vtk/stream`      // VTK时间序列帧推流
 }
 
 // API端点
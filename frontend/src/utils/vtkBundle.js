@@ -0,0 +1,74 @@
+/**
+ * 时间序列数据包解码工具
+ * 对应后端 /api/vtk/bundle（src/vtk/bundle.py）：
+ * "VTKS" | uint32 头部长度 | JSON头部 | 各帧 zlib 压缩数据
+ * 首帧为量化关键帧，后续帧为与前一帧的整数差分
+ */
+
+const INT_TYPES = {
+  int8: Int8Array,
+  int16: Int16Array,
+  int32: Int32Array
+}
+
+/**
+ * 解压 zlib 数据（浏览器原生 DecompressionStream）
+ */
+const inflate = async (bytes) => {
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'))
+  return new Uint8Array(await new Response(stream).arrayBuffer())
+}
+
+/**
+ * 字节平面重排的逆操作
+ */
+const unshuffle = (planes, itemSize, count) => {
+  const bytes = new Uint8Array(itemSize * count)
+  for (let p = 0; p < itemSize; p++) {
+    const base = p * count
+    for (let i = 0; i < count; i++) {
+      bytes[i * itemSize + p] = planes[base + i]
+    }
+  }
+  return bytes.buffer
+}
+
+/**
+ * 解码时间序列数据包
+ * @param {ArrayBuffer} buffer - 数据包内容
+ * @returns {Promise<{header: Object, frames: Float32Array[]}>}
+ */
+export const decodeTimeSeriesBundle = async (buffer) => {
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4))
+  if (magic !== 'VTKS') {
+    throw new Error('时间序列数据包格式错误')
+  }
+
+  const headerLength = new DataView(buffer).getUint32(4, true)
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)))
+  if (header.codec !== 'zlib') {
+    throw new Error(`浏览器不支持的压缩方式: ${header.codec}`)
+  }
+
+  const count = header.point_count
+  const base = 8 + headerLength
+  const current = new Int32Array(count)
+  const frames = []
+
+  for (const entry of header.frames) {
+    const IntArray = INT_TYPES[entry.dtype]
+    if (!IntArray) throw new Error(`不支持的数据类型: ${entry.dtype}`)
+
+    const planes = await inflate(new Uint8Array(buffer, base + entry.offset, entry.length))
+    const values = new IntArray(unshuffle(planes, IntArray.BYTES_PER_ELEMENT, count))
+
+    const frame = new Float32Array(count)
+    for (let i = 0; i < count; i++) {
+      current[i] = entry.kind === 'key' ? values[i] : current[i] + values[i]
+      frame[i] = current[i] * header.quantum
+    }
+    frames.push(frame)
+  }
+
+  return { header, frames }
+}
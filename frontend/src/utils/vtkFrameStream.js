@@ -0,0 +1,99 @@
+/**
+ * VTK 时间序列帧推流客户端
+ * 对应后端 /ws/vtk/stream（src/api/websocket/vtk_stream.py）：
+ * 服务端按播放顺序推送二进制帧，保持领先播放头 window 帧；
+ * 二进制消息格式: "VTKF" | uint32 元信息长度 | JSON元信息 | 帧数据（同 /api/vtk/files?format=binary）
+ */
+import { WS_ENDPOINTS } from '../config'
+
+/**
+ * 拆分二进制推流消息
+ * @returns {{ meta: Object, payload: ArrayBuffer }}
+ */
+export const decodeStreamFrame = (buffer) => {
+  const view = new DataView(buffer)
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4))
+  if (magic !== 'VTKF') throw new Error('不是有效的推流帧')
+  const metaLength = view.getUint32(4, true)
+  const meta = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, metaLength)))
+  return { meta, payload: buffer.slice(8 + metaLength) }
+}
+
+export class VtkFrameStream {
+  /**
+   * @param {Object} options
+   * @param {string} options.token 登录令牌
+   * @param {(meta: Object, payload: ArrayBuffer) => void} options.onFrame 收到帧时回调
+   * @param {(info: Object) => void} [options.onInfo] 收到帧列表时回调
+   */
+  constructor({ token, onFrame, onInfo = () => {} }) {
+    this.token = token
+    this.onFrame = onFrame
+    this.onInfo = onInfo
+    this.ws = null
+    this.generation = 0
+  }
+
+  /**
+   * 建立连接并订阅文件夹
+   * @returns {Promise<void>} 连接成功后 resolve，失败时 reject（调用方回退到 HTTP）
+   */
+  connect(folder, { window = 4, lod = null, loop = false, start = 0 } = {}) {
+    return new Promise((resolve, reject) => {
+      const ws = new WebSocket(`${WS_ENDPOINTS.vtkStream}?token=${this.token}`)
+      ws.binaryType = 'arraybuffer'
+      this.ws = ws
+
+      ws.onopen = () => {
+        this.send({ type: 'subscribe', folder, window, lod, loop, start })
+        resolve()
+      }
+      ws.onerror = () => reject(new Error('推流连接失败'))
+      ws.onclose = () => { this.ws = null }
+
+      ws.onmessage = (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          const { meta, payload } = decodeStreamFrame(event.data)
+          // 丢弃 seek 之前在途的旧帧
+          if (meta.generation < this.generation) return
+          this.generation = meta.generation
+          this.onFrame(meta, payload)
+          return
+        }
+        const message = JSON.parse(event.data)
+        if (message.type === 'stream_info') this.onInfo(message)
+        else if (message.type === 'stream_error') console.warn('[VTK推流]', message.message)
+      }
+    })
+  }
+
+  send(message) {
+    if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+      this.ws.send(JSON.stringify(message))
+    }
+  }
+
+  /** 播放头前进（释放服务端的预取窗口） */
+  position(index) {
+    this.send({ type: 'position', index })
+  }
+
+  /** 拖动进度条：服务端取消在途推送，从 index 重新开始 */
+  seek(index) {
+    this.generation += 1
+    this.send({ type: 'seek', index })
+  }
+
+  /** 调整预取深度 */
+  setWindow(size) {
+    this.send({ type: 'window', size })
+  }
+
+  close() {
+    if (this.ws) {
+      this.send({ type: 'stop' })
+      this.ws.close()
+      this.ws = null
+    }
+  }
+}
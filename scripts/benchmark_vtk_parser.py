@@ -0,0 +1,92 @@
+"""
+VTK 解析器基准测试
+
+对比三种读取方式在同一文件上的耗时与峰值内存：
+- naive: 逐行读取 + Python split + float()（旧代码路径读取数据段的方式）
+- read_field: src/vtk/parser.py 分块 numpy.fromstring
+- iter_planes: 逐 z 平面流式读取（只保留当前平面）
+
+用法:
+    python scripts/benchmark_vtk_parser.py [VTK文件] [--repeat N]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.vtk.parser import iter_planes, read_field  # noqa: E402
+from src.vtk.reader import parse_header, read_header  # noqa: E402
+
+
+def naive_read(path: Path) -> np.ndarray:
+    """逐行 split 的朴素读取"""
+    lines, _ = read_header(path)
+    meta = parse_header(lines)
+    nx, ny, nz = meta["dimensions"]
+    values = []
+    with open(path, "r", encoding="utf-8") as f:
+        for _ in range(len(lines)):
+            f.readline()
+        for line in f:
+            values.extend(float(token) for token in line.split())
+    return np.asarray(values[:nx * ny * nz]).reshape(nz, ny, nx)
+
+
+def streaming_reduce(path: Path) -> float:
+    """逐平面累加（代表常量内存的流式处理）"""
+    total = 0.0
+    for _, plane in iter_planes(path):
+        total += float(plane.sum())
+    return total
+
+
+def measure(func, path: Path, repeat: int):
+    """返回 (最短耗时秒, 峰值内存 MB, 结果)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VTK 解析器基准测试")
+    parser.add_argument("file", nargs="?", default=str(PROJECT_ROOT / "涂层-调幅分解" / "conc-500.vtk"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    print(f"文件: {path} ({path.stat().st_size / 1024 / 1024:.2f} MB)")
+
+    naive_time, naive_mem, expected = measure(naive_read, path, args.repeat)
+    field_time, field_mem, actual = measure(lambda p: read_field(p)[0], path, args.repeat)
+    stream_time, stream_mem, total = measure(streaming_reduce, path, args.repeat)
+
+    if not np.allclose(expected, actual):
+        raise SystemExit("read_field 结果与朴素读取不一致")
+    if not np.isclose(total, float(expected.sum())):
+        raise SystemExit("iter_planes 结果与朴素读取不一致")
+
+    print(f"{'方式':<12}{'耗时(s)':>10}{'峰值内存(MB)':>16}{'加速比':>10}")
+    for name, elapsed, memory in (
+        ("naive", naive_time, naive_mem),
+        ("read_field", field_time, field_mem),
+        ("iter_planes", stream_time, stream_mem),
+    ):
+        print(f"{name:<12}{elapsed:>10.3f}{memory:>16.1f}{naive_time / elapsed:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+热启动基准测试
+
+以一个基准配方的冷启动末帧为邻居，对若干"微调一个参数"的配方分别做：
+- cold: 从噪声开始演化 steps 步（参考结果）
+- warm: 由邻居末帧热启动（src/simulation/warmstart.py 的 warm_start_state），演化剩余步数
+- seed: 换一个随机种子的冷启动，给出同一配方不同实现之间的结构差异作为对照
+
+收敛判据为结构因子一阶矩波长 L = 1/<k>：某一帧的 L 与冷启动末帧的 L 相对偏差小于 --tol 即视为
+达到相同的结构，记录冷/热启动各自需要演化的步数。
+
+用法:
+    python scripts/benchmark_warm_start.py [--grid 64] [--steps 500] [--tol 0.05]
+"""
+import argparse
+import dataclasses
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.simulation.config import SimulationConfig  # noqa: E402
+from src.simulation.phasefield import CahnHilliardSolver, PhaseFieldParams, material_parameters  # noqa: E402
+from src.simulation.warmstart import PARAMETER_SCALES, parameter_point, warm_start_state  # noqa: E402
+from src.vtk.analytics import characteristic_wavelengths, radial_spectrum, structure_factor  # noqa: E402
+
+# (Al, Ti, 温度 °C) 相对基准的微调
+NUDGES = [(1, -1, 0), (2, -2, 0), (0, 0, 10), (0, 0, -10), (0, 0, 25), (-2, 2, 15)]
+
+
+def mean_wavelength(field: np.ndarray) -> float:
+    k, spectrum = radial_spectrum(structure_factor(field), field.shape, [1.0, 1.0, 1.0])
+    return characteristic_wavelengths(k, spectrum)["mean_wavelength"]
+
+
+def evolve(
+    params: PhaseFieldParams, initial: Optional[np.ndarray] = None, start_step: int = 0
+) -> Tuple[List[Tuple[int, float]], np.ndarray, float]:
+    """演化到 params.steps，返回 (每个输出帧的 (步数, L), 末帧, 耗时秒)"""
+    solver = CahnHilliardSolver(params, initial)
+    solver.step_count = start_step
+    history = [(start_step, mean_wavelength(solver.field))]
+    start = time.perf_counter()
+    while solver.step_count < params.steps:
+        solver.step(min(params.save_every, params.steps - solver.step_count))
+        history.append((solver.step_count, mean_wavelength(solver.field)))
+    return history, solver.field, time.perf_counter() - start
+
+
+def steps_to_reach(history: List[Tuple[int, float]], reference: float, tol: float) -> Optional[int]:
+    """第一个 L 与参考值相对偏差小于 tol 的帧（相对起始步），未达到为 None"""
+    start = history[0][0]
+    return next((step - start for step, length in history if abs(length / reference - 1) < tol), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="热启动基准测试")
+    parser.add_argument("--grid", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--tol", type=float, default=0.05, help="L 的相对偏差容差")
+    parser.add_argument("--al", type=float, default=30.0)
+    parser.add_argument("--ti", type=float, default=20.0)
+    parser.add_argument("--temperature", type=float, default=500.0)
+    parser.add_argument("--min-steps", type=int, default=40)
+    args = parser.parse_args()
+
+    config = SimulationConfig(grid=args.grid, steps=args.steps)
+    base = material_parameters({"al_content": args.al, "ti_content": args.ti}, {"deposition_temperature": args.temperature}, config)
+    _, neighbour_field, base_time = evolve(base)
+    neighbour = parameter_point(base, args.temperature)
+    print(f"基准: Al={args.al} Ti={args.ti} T={args.temperature}°C, {args.grid}³ × {args.steps} 步, 耗时 {base_time:.1f} s")
+    print(f"收敛判据: |L / L_cold - 1| < {args.tol}\n")
+
+    header = (
+        f"{'微调':<18} {'距离':>6} {'起始步':>6} {'冷:达到':>7} {'热:达到':>7} {'冷:步数':>7} {'热:步数':>7} "
+        f"{'冷:秒':>6} {'热:秒':>6} {'L冷':>7} {'L热':>7} {'L换种子':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    saved = []
+    for d_al, d_ti, d_t in NUDGES:
+        temperature = args.temperature + d_t
+        params = material_parameters(
+            {"al_content": args.al + d_al, "ti_content": args.ti + d_ti}, {"deposition_temperature": temperature}, config
+        )
+        distance = float(np.hypot(
+            (params.c0 - base.c0) / PARAMETER_SCALES[0], (temperature - args.temperature) / PARAMETER_SCALES[1]
+        ))
+        cold, _, cold_time = evolve(params)
+        reference = cold[-1][1]
+        initial, start_step = warm_start_state(neighbour_field, neighbour, params, args.min_steps)
+        warm, _, warm_time = evolve(params, initial, start_step)
+        seed, _, _ = evolve(dataclasses.replace(params, seed=params.seed + 1))
+        cold_reach, warm_reach = steps_to_reach(cold, reference, args.tol), steps_to_reach(warm, reference, args.tol)
+        if warm_reach is not None:
+            saved.append(cold_reach - warm_reach)
+        print(
+            f"{f'Al{d_al:+g} T{d_t:+g}':<18} {distance:>6.2f} {start_step:>6} {cold_reach:>7} "
+            f"{warm_reach if warm_reach is not None else '-':>7} {params.steps:>7} {params.steps - start_step:>7} "
+            f"{cold_time:>6.1f} {warm_time:>6.1f} {reference:>7.2f} {warm[-1][1]:>7.2f} {seed[-1][1]:>8.2f}"
+        )
+
+    if saved:
+        print(f"\n达到相同结构平均节省 {np.mean(saved):.0f} 步（{len(saved)}/{len(NUDGES)} 个配方在容差内）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+VTK 接口负载测试：对话推流延迟是否受 VTK 文件请求影响
+
+在同一个事件循环中运行 VTK 路由与一个模拟对话推流的 WebSocket 端点
+（每隔 --interval 毫秒推送一个 token，与对话 Agent 逐 token 推送相同），
+测量客户端收到的 token 间隔：
+1. baseline: 无 VTK 请求
+2. offloaded: 并发请求 VTK 列表/元数据接口（阻塞 I/O 经 run_io 提交到有界线程池）
+3. inline: 同样的负载，但 run_io 替换为在事件循环中直接执行（改造前的行为，对照组）
+
+--slow-io 给 os.stat / os.scandir / open 增加固定延迟，模拟 NFS 等慢速存储。
+
+用法:
+    python scripts/load_test_vtk.py [--clients 16] [--duration 5] [--slow-io 20]
+"""
+import argparse
+import asyncio
+import builtins
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+import websockets  # noqa: E402
+from fastapi import FastAPI, WebSocket  # noqa: E402
+from loguru import logger  # noqa: E402
+
+from src.api.routes import vtk_routes  # noqa: E402
+from src.vtk import get_latency_metrics  # noqa: E402
+
+
+HOST = "127.0.0.1"
+
+
+def build_app(interval: float) -> FastAPI:
+    """VTK 路由 + 模拟对话推流端点"""
+    app = FastAPI()
+    app.include_router(vtk_routes.router)
+
+    @app.websocket("/probe/chat")
+    async def probe_chat(websocket: WebSocket):
+        await websocket.accept()
+        try:
+            while True:
+                await websocket.send_text("token")
+                await asyncio.sleep(interval)
+        except Exception:
+            pass
+
+    return app
+
+
+def slow_down_io(delay: float) -> None:
+    """给文件系统调用增加固定延迟（模拟慢速存储）"""
+    def wrap(func):
+        def slow(*args, **kwargs):
+            time.sleep(delay)
+            return func(*args, **kwargs)
+        return slow
+
+    os.stat = wrap(os.stat)
+    os.scandir = wrap(os.scandir)
+    builtins.open = wrap(builtins.open)
+
+
+async def measure_tokens(port: int, duration: float) -> np.ndarray:
+    """接收推流 token，返回相邻 token 的间隔（毫秒）"""
+    stamps: List[float] = []
+    async with websockets.connect(f"ws://{HOST}:{port}/probe/chat") as ws:
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            await ws.recv()
+            stamps.append(time.perf_counter())
+    return np.diff(stamps) * 1000
+
+
+async def vtk_client(client: httpx.AsyncClient, urls: List[str], stop: asyncio.Event, latencies: List[float]) -> None:
+    """循环请求 VTK 接口"""
+    i = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(urls[i % len(urls)])
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        i += 1
+
+
+async def run_phase(port: int, duration: float, clients: int, urls: List[str]) -> Dict[str, float]:
+    """运行一个阶段，返回 token 间隔与 VTK 请求延迟统计"""
+    stop = asyncio.Event()
+    latencies: List[float] = []
+    async with httpx.AsyncClient(base_url=f"http://{HOST}:{port}", timeout=60) as client:
+        workers = [asyncio.create_task(vtk_client(client, urls, stop, latencies)) for _ in range(clients)]
+        gaps = await measure_tokens(port, duration)
+        stop.set()
+        await asyncio.gather(*workers)
+    result = {
+        "token_p50": float(np.percentile(gaps, 50)),
+        "token_p99": float(np.percentile(gaps, 99)),
+        "token_max": float(gaps.max()),
+        "requests": len(latencies),
+    }
+    if latencies:
+        result["vtk_p50"] = float(np.percentile(latencies, 50))
+        result["vtk_p99"] = float(np.percentile(latencies, 99))
+    return result
+
+
+async def run_inline(func, *args, **kwargs):
+    """改造前的行为：阻塞调用直接在事件循环中执行"""
+    return func(*args, **kwargs)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="VTK 接口负载下的对话推流延迟测试")
+    parser.add_argument("--clients", type=int, default=16, help="并发 VTK 客户端数")
+    parser.add_argument("--duration", type=float, default=5.0, help="每个阶段的时长（秒）")
+    parser.add_argument("--interval", type=float, default=10.0, help="模拟推流的 token 间隔（毫秒）")
+    parser.add_argument("--slow-io", type=float, default=0.0, help="文件系统调用附加延迟（毫秒）")
+    parser.add_argument("--folder", default="涂层-调幅分解", help="时间序列文件夹")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    logger.remove()
+    urls = [
+        "/api/vtk/list",
+        f"/api/vtk/timeseries/{args.folder}",
+        f"/api/vtk/file-info?filepath={args.folder}/conc-0.vtk",
+        f"/api/vtk/stats/{args.folder}/conc-0.vtk",
+    ]
+
+    server = uvicorn.Server(uvicorn.Config(build_app(args.interval / 1000), host=HOST, port=args.port, log_level="warning"))
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    # 预热：生成索引与统计缓存，之后各阶段只测 I/O 路径
+    async with httpx.AsyncClient(base_url=f"http://{HOST}:{args.port}", timeout=120) as client:
+        for url in urls:
+            (await client.get(url)).raise_for_status()
+    if args.slow_io:
+        slow_down_io(args.slow_io / 1000)
+
+    results = {"baseline": await run_phase(args.port, args.duration, 0, urls)}
+    get_latency_metrics().reset()
+    results["offloaded"] = await run_phase(args.port, args.duration, args.clients, urls)
+    server_metrics = get_latency_metrics().summary()
+    offloaded_run_io = vtk_routes.run_io
+    vtk_routes.run_io = run_inline
+    results["inline"] = await run_phase(args.port, args.duration, args.clients, urls)
+    vtk_routes.run_io = offloaded_run_io
+
+    server.should_exit = True
+    await serve
+
+    print(f"并发 {args.clients}，token 间隔 {args.interval:g} ms，I/O 附加延迟 {args.slow_io:g} ms\n")
+    print(f"{'阶段':<12}{'token p50':>11}{'token p99':>11}{'token max':>11}{'VTK请求':>9}{'VTK p50':>10}{'VTK p99':>10}")
+    for name, r in results.items():
+        print(
+            f"{name:<12}{r['token_p50']:>11.1f}{r['token_p99']:>11.1f}{r['token_max']:>11.1f}{r['requests']:>9}"
+            f"{r.get('vtk_p50', 0):>10.1f}{r.get('vtk_p99', 0):>10.1f}"
+        )
+    print("\noffloaded 阶段服务端处理耗时（/api/vtk/metrics）:")
+    for route, m in server_metrics.items():
+        print(f"  {route}: {m['total']} 次, p50 {m['p50_ms']} ms, p99 {m['p99_ms']} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -350,6 +350,10 @@ def _build_state_summary(state: CoatingState) -> str:
             parts.append(f"  - 相结构: {topphi['phase']}")
         if 'lattice_constant' in topphi:
             parts.append(f"  - 晶格常数: {topphi['lattice_constant']}")
+        microstructure = topphi.get('microstructure') or {}
+        if microstructure.get('mean_wavelength'):
+            parts.append(f"  - 调幅波长: {microstructure['mean_wavelength']:.2f}")
+            parts.append(f"  - 富相体积分数: {microstructure['volume_fraction']['rich']:.3f}")
     
     # 历史对比
     hist = state.get("historical_comparison", {})
@@ -590,6 +594,15 @@ class ConversationalGraphManager:
                         elif "compare_historical" in tool_name:
                             input_state["historical_comparison"] = result_data
                             logger.debug(f"[Manager] 缓存历史对比结果到状态")
+                        elif (
+                            ("get_simulation_job" in tool_name or "simulate_topphi" in tool_name)
+                            and result_data.get("status") == "completed"
+                            and result_data.get("kind") != "sweep"
+                            and result_data.get("result")
+                        ):
+                            # simulate_topphi 命中结果缓存时直接返回 completed + result
+                            input_state["topphi_simulation"] = result_data["result"]
+                            logger.debug(f"[Manager] 缓存 TopPhi 模拟结果到状态")
                     
                     # 发送工具结果（用于前端展示）
                     if result_data:
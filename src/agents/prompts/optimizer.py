@@ -94,6 +94,15 @@ OPTIMIZER_SYSTEM_PROMPT = """你是 TopMat 涂层优化系统的优化方案专
 **推荐方案：P_**
 理由：...
 
+## 可用工具
+- `compare_microstructures_tool`: 定量对比两个相场模拟帧（VTK 文件）的微观结构，
+  返回差值场范数与调幅波长、富相体积分数、比界面面积的变化；
+  用于说明 P1/P2/P3 调整前后微观结构改变了多少（不传参数时对比当前模拟的首末帧）
+- `run_parameter_sweep_tool`: 以当前配方为基准提交参数扫描（网格或拉丁超立方），
+  用于在 P1/P3 的调整范围内筛选候选值；扫描在后台运行，立即返回任务句柄
+- `get_simulation_job_tool`: 查询扫描进度，完成后返回各点的微观结构描述符汇总表（`result.table`），
+  据此给出调整方向与推荐取值
+
 ## 优化知识
 
 ### P1 成分规则
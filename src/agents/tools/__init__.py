@@ -20,8 +20,13 @@ from .validation_tools import (
 )
 from .analysis_tools import (
     simulate_topphi_tool,
+    get_simulation_job_tool,
+    cancel_simulation_job_tool,
+    run_parameter_sweep_tool,
     predict_ml_performance_tool,
     compare_historical_tool,
+    analyze_coarsening_kinetics_tool,
+    compare_microstructures_tool,
 )
 from .state_tools import update_params
 
@@ -47,11 +52,19 @@ VALIDATOR_TOOLS = SHARED_TOOLS + [
 ANALYST_TOOLS = SHARED_TOOLS + [
     update_params,  # 参数更新工具
     simulate_topphi_tool,
+    get_simulation_job_tool,     # 模拟任务状态与结果
+    cancel_simulation_job_tool,  # 取消模拟任务
+    run_parameter_sweep_tool,    # 参数扫描（批量模拟）
     predict_ml_performance_tool,
     compare_historical_tool,
+    analyze_coarsening_kinetics_tool,
 ]
 
-OPTIMIZER_TOOLS = SHARED_TOOLS + []
+OPTIMIZER_TOOLS = SHARED_TOOLS + [
+    compare_microstructures_tool,  # 方案调整前后的微观结构定量对比
+    run_parameter_sweep_tool,      # 参数扫描，按描述符表筛选方案
+    get_simulation_job_tool,       # 扫描进度与汇总表
+]
 
 # Experimenter 工具
 EXPERIMENTER_TOOLS = SHARED_TOOLS + [
@@ -74,8 +87,13 @@ __all__ = [
     "normalize_composition_tool",
     # 分析数据工具
     "simulate_topphi_tool",
+    "get_simulation_job_tool",
+    "cancel_simulation_job_tool",
+    "run_parameter_sweep_tool",
     "predict_ml_performance_tool",
     "compare_historical_tool",
+    "analyze_coarsening_kinetics_tool",
+    "compare_microstructures_tool",
     # 实验工具
     "show_performance_comparison_tool",
     "request_experiment_input_tool",
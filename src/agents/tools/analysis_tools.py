@@ -6,12 +6,16 @@
 2. ML 性能预测
 3. 历史数据对比
 4. 综合根因分析
+5. 相场时间序列粗化动力学分析
+6. 相场模拟帧间微观结构对比
+7. 模拟任务查询与取消（TopPhi 模拟以后台任务运行，提交后立即返回任务句柄）
+8. 参数扫描（网格 / 拉丁超立方批量模拟，汇总微观结构描述符表）
 
 更新说明 (v2.1)：
 - 使用 ToolRuntime 从状态自动获取参数
 - 工具无需 LLM 传递复杂参数，减少错误
 """
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from langchain.tools import tool, ToolRuntime
 from pydantic import BaseModel, Field
 from loguru import logger
@@ -34,19 +38,19 @@ class TopPhiSimulationInput(BaseModel):
 @tool
 def simulate_topphi_tool(runtime: ToolRuntime) -> Dict[str, Any]:
     """
-    调用 TopPhi 第一性原理模拟引擎。
+    提交 TopPhi 相场模拟任务（后台运行，立即返回任务句柄）。
     
     自动从当前状态获取成分和工艺参数。
     如需修改参数，请先调用 update_coating_composition 或 update_process_params。
     
-    预测涂层的微观结构特性：
-    - 晶粒尺寸
-    - 择优取向
-    - 残余应力
+    模拟完成后用 get_simulation_job_tool 获取结果，包括：
+    - 富相畴尺寸、调幅波长（nm）
     - 晶格常数
+    - 调幅波长、富相体积分数等微观结构统计
     
     Returns:
-        微观结构预测结果
+        任务句柄 {"job_id", "status"}，进度会实时推送给用户；
+        同一配方已模拟过时 status 为 completed 并直接附带结果 result
     """
     # 从状态获取参数
     state = runtime.state
@@ -77,10 +81,9 @@ def simulate_topphi_tool(runtime: ToolRuntime) -> Dict[str, Any]:
             "required_params": ["deposition_temperature"]
         }
     
-    # 调用 TopPhi 服务
+    # 提交 TopPhi 模拟任务
     try:
-        from ...services.topphi_service import TopPhiService
-        service = TopPhiService()
+        from ...simulation import get_job_manager
         
         comp_data = {
             "al_content": al_content,
@@ -92,16 +95,178 @@ def simulate_topphi_tool(runtime: ToolRuntime) -> Dict[str, Any]:
             "deposition_pressure": deposition_pressure
         }
         
-        result = service.simulate_deposition(comp_data, proc_data)
-        logger.info(f"[TopPhi] 模拟完成: 晶粒尺寸={result.get('grain_size_nm', 'N/A')}nm")
+        manager = get_job_manager()
+        job = manager.submit(comp_data, proc_data, session_id=_session_id(runtime))
+        logger.info(f"[TopPhi] 模拟任务已提交: {job['id']}")
         
-        return result
+        # 同一配方已模拟过：直接返回缓存结果
+        if job["status"] == "completed":
+            return {
+                "job_id": job["id"],
+                "status": job["status"],
+                "result": manager.result(job["id"])["result"]
+            }
+        
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "message": "TopPhi 模拟已在后台运行，进度会实时推送给用户；完成后调用 get_simulation_job_tool 获取结果"
+        }
+        
+    except Exception as e:
+        logger.error(f"[TopPhi] 提交模拟任务失败: {e}")
+        return {"error": str(e)}
+
+
+@tool
+def get_simulation_job_tool(runtime: ToolRuntime, job_id: str = "") -> Dict[str, Any]:
+    """
+    查询 TopPhi 模拟任务或参数扫描任务的状态，任务完成时返回结果。
+    
+    job_id 为 simulate_topphi_tool / run_parameter_sweep_tool 返回的任务 ID，省略时查询本会话最近一次提交的任务。
+    
+    Returns:
+        {"job_id", "kind", "status", "progress"}；status 为 completed 时附结果 result：
+        - deposition：完整模拟结果（畴尺寸、调幅波长、晶格常数、微观结构统计、VTK 时间序列等）
+        - sweep：{"columns", "rows", "table"} 每个扫描点一行微观结构描述符（运行中时 progress.rows 为已完成的点）
+    """
+    try:
+        from ...simulation import get_job_manager
+        
+        manager = get_job_manager()
+        job_id = job_id or _latest_job_id(runtime)
+        job = manager.result(job_id) if job_id else None
+        if job is None:
+            return {"error": f"模拟任务不存在: {job_id or '本会话尚未提交模拟'}"}
+        
+        response = {
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "progress": job["progress"],
+        }
+        if job["status"] == "completed":
+            response["result"] = job["result"]
+        elif job["status"] == "failed":
+            response["error"] = job["error"]
+        return response
         
     except Exception as e:
-        logger.error(f"[TopPhi] 模拟失败: {e}")
+        logger.error(f"[TopPhi] 查询模拟任务失败: {e}")
         return {"error": str(e)}
 
 
+@tool
+def cancel_simulation_job_tool(runtime: ToolRuntime, job_id: str = "") -> Dict[str, Any]:
+    """
+    取消 TopPhi 模拟任务（排队中直接撤销，运行中在下一帧输出时中止）。
+    
+    job_id 省略时取消本会话最近一次提交的任务。
+    
+    Returns:
+        取消后的任务状态
+    """
+    try:
+        from ...simulation import get_job_manager
+        
+        job_id = job_id or _latest_job_id(runtime)
+        job = get_job_manager().cancel(job_id) if job_id else None
+        if job is None:
+            return {"error": f"模拟任务不存在: {job_id or '本会话尚未提交模拟'}"}
+        return {"job_id": job["id"], "status": job["status"], "cancel_requested": job["cancel_requested"]}
+        
+    except Exception as e:
+        logger.error(f"[TopPhi] 取消模拟任务失败: {e}")
+        return {"error": str(e)}
+
+
+@tool
+def run_parameter_sweep_tool(
+    runtime: ToolRuntime,
+    axes: Dict[str, Any],
+    mode: str = "grid",
+    samples: int = 0,
+    seed: int = 0,
+    balance: str = "ti_content"
+) -> Dict[str, Any]:
+    """
+    提交 TopPhi 参数扫描任务（后台并行批量模拟，立即返回任务句柄）。
+    
+    以当前状态中的成分和工艺参数为基准，只改变 axes 中列出的参数。
+    可扫描：al_content / ti_content / n_content（at.%）、deposition_temperature（°C）、deposition_pressure（Pa）等。
+    
+    Args:
+        axes: 扫描轴
+            - mode="grid"：取值列表或区间（含端点），如
+              {"al_content": {"start": 20, "stop": 40, "step": 5}, "deposition_temperature": [450, 500, 550]}
+            - mode="lhs"：取值范围，如 {"al_content": {"min": 20, "max": 40}, "deposition_temperature": {"min": 400, "max": 600}}
+        mode: "grid" 网格扫描（笛卡尔积）或 "lhs" 拉丁超立方抽样
+        samples: lhs 抽样点数
+        seed: lhs 随机种子
+        balance: 成分变化时用于补足总和的元素（默认 ti_content）
+    
+    Returns:
+        任务句柄 {"job_id", "status", "points"}；每完成一个点进度会推送给用户，
+        完成后用 get_simulation_job_tool 获取描述符汇总表（调幅波长、富相体积分数、界面面积、晶格常数等）
+    """
+    state = runtime.state
+    composition = {
+        k: v for k, v in (state.get("coating_composition") or {}).items()
+        if k in ("al_content", "ti_content", "n_content") and v
+    }
+    process_params = {
+        "deposition_temperature": (state.get("process_params") or {}).get("deposition_temperature") or 0,
+        "deposition_pressure": (state.get("process_params") or {}).get("deposition_pressure") or 0.5,
+    }
+    
+    if not composition:
+        return {
+            "error": "未提供涂层成分数据",
+            "message": "请先输入涂层成分配比（Al/Ti/N 含量），然后再进行参数扫描",
+            "required_params": ["al_content", "ti_content", "n_content"]
+        }
+    if not process_params["deposition_temperature"] and "deposition_temperature" not in axes:
+        return {
+            "error": "未提供工艺参数",
+            "message": "请先输入沉积温度，或将 deposition_temperature 作为扫描轴",
+            "required_params": ["deposition_temperature"]
+        }
+    
+    try:
+        from ...simulation import get_job_manager
+        
+        spec = {"mode": mode, "axes": axes, "samples": samples, "seed": seed, "balance": balance}
+        job = get_job_manager().submit_sweep(composition, process_params, spec, session_id=_session_id(runtime))
+        logger.info(f"[TopPhi] 参数扫描任务已提交: {job['id']}（{job['request']['points']} 个点）")
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "points": job["request"]["points"],
+            "message": "参数扫描已在后台运行，每完成一个点会推送给用户；完成后调用 get_simulation_job_tool 获取汇总表"
+        }
+        
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error(f"[TopPhi] 提交参数扫描失败: {e}")
+        return {"error": str(e)}
+
+
+def _session_id(runtime: ToolRuntime) -> Optional[str]:
+    """当前会话 ID（对话管理器以 session_id 作为 thread_id）"""
+    config = getattr(runtime, "config", None) or {}
+    return config.get("configurable", {}).get("thread_id")
+
+
+def _latest_job_id(runtime: ToolRuntime) -> Optional[str]:
+    """本会话最近一次提交的模拟任务"""
+    from ...simulation import get_job_manager
+    
+    session_id = _session_id(runtime)
+    jobs = get_job_manager().list_jobs(session_id, limit=1) if session_id else []
+    return jobs[0]["id"] if jobs else None
+
+
 @tool
 def predict_ml_performance_tool(runtime: ToolRuntime) -> Dict[str, Any]:
     """
@@ -165,7 +330,8 @@ def predict_ml_performance_tool(runtime: ToolRuntime) -> Dict[str, Any]:
             "wear_rate": result.get("wear_rate"),
             "adhesion_strength": result.get("adhesion_strength"),
             "model_confidence": result.get("model_confidence", 0.85),
-            "prediction_source": "ML_Model_v2"
+            "prediction_source": "ML_Model_v2",
+            "model_sources": result.get("model_sources", {})
         }
         
     except Exception as e:
@@ -249,6 +415,96 @@ def compare_historical_tool(runtime: ToolRuntime) -> Dict[str, Any]:
         }
 
 
+@tool
+def analyze_coarsening_kinetics_tool(runtime: ToolRuntime) -> Dict[str, Any]:
+    """
+    分析相场模拟时间序列的粗化动力学。
+    
+    自动从 TopPhi 模拟结果中获取时间序列文件夹（默认: 涂层-调幅分解），
+    在后端逐帧计算特征长度（结构因子一阶矩波长）、成分振幅与界面密度，
+    并拟合粗化律 L(t) ~ t^n（LSW 体扩散理论值 n = 1/3）。
+    
+    Returns:
+        粗化动力学汇总，包含拟合指数、粗化起点以及首末帧统计
+    """
+    state = runtime.state
+    topphi_result = state.get("topphi_simulation") or {}
+    vtk_data = topphi_result.get("vtk_data") or {}
+    folder_name = vtk_data.get("folder") or "涂层-调幅分解"
+    
+    logger.info(f"[粗化动力学] 开始分析: {folder_name}")
+    
+    try:
+        from ...vtk import get_frame_cache, get_process_pool, resolve_folder
+        from ...vtk.kinetics import analyze_series, summarize_kinetics
+        
+        try:
+            folder = resolve_folder(folder_name)
+        except (ValueError, FileNotFoundError) as e:
+            return {"error": f"时间序列文件夹无效: {e}"}
+        
+        result = summarize_kinetics(analyze_series(get_frame_cache(), folder, get_process_pool()))
+        fit = result["fits"]["wavelength"]
+        logger.info(f"[粗化动力学] 完成: n={fit['exponent'] if fit else 'N/A'}")
+        return result
+        
+    except Exception as e:
+        logger.error(f"[粗化动力学] 失败: {e}")
+        return {"error": str(e)}
+
+
+@tool
+def compare_microstructures_tool(
+    runtime: ToolRuntime,
+    frame_a: str = "",
+    frame_b: str = ""
+) -> Dict[str, Any]:
+    """
+    定量对比两个相场模拟帧的微观结构差异。
+    
+    frame_a / frame_b 为 VTK 文件路径（例如: 涂层-调幅分解/conc-500.vtk），
+    可来自同一次或不同模拟（如基准配方与 P1/P2/P3 调整后的配方）。
+    省略时对比当前 TopPhi 模拟时间序列的首帧与末帧。
+    
+    Returns:
+        差值场 b - a 的范数（L2、RMS、L∞、相对 L2），
+        以及调幅波长、结构因子峰位、富相体积分数、比界面面积等指标的变化
+    """
+    state = runtime.state
+    topphi_result = state.get("topphi_simulation") or {}
+    vtk_data = topphi_result.get("vtk_data") or {}
+    folder_name = vtk_data.get("folder") or "涂层-调幅分解"
+    
+    try:
+        from ...vtk import get_frame_cache, list_series_frames, resolve_folder, resolve_vtk_path
+        from ...vtk.compare import get_comparison, summarize_comparison
+        
+        if not (frame_a and frame_b):
+            try:
+                frames = list_series_frames(resolve_folder(folder_name))
+            except (ValueError, FileNotFoundError):
+                frames = []
+            if len(frames) < 2:
+                return {"error": f"时间序列帧不足，无法对比: {folder_name}"}
+            frame_a = frame_a or f"{folder_name}/{frames[0][1].name}"
+            frame_b = frame_b or f"{folder_name}/{frames[-1][1].name}"
+        
+        logger.info(f"[微结构对比] {frame_a} -> {frame_b}")
+        try:
+            source_a, source_b = resolve_vtk_path(frame_a), resolve_vtk_path(frame_b)
+        except (ValueError, FileNotFoundError) as e:
+            return {"error": f"VTK文件无效: {e}"}
+        
+        result = summarize_comparison(get_comparison(get_frame_cache(), source_a, source_b))
+        result.update({"a": frame_a, "b": frame_b})
+        logger.info(f"[微结构对比] 完成: 相对L2={result['field']['relative_l2']}")
+        return result
+        
+    except Exception as e:
+        logger.error(f"[微结构对比] 失败: {e}")
+        return {"error": str(e)}
+
+
 @tool
 def analyze_root_cause_tool(runtime: ToolRuntime) -> Dict[str, Any]:
     """
@@ -9,9 +9,19 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 from datetime import datetime
 
-from .routes import vtk_router, auth_router, setup_websocket_routes
+from .routes import vtk_router, auth_router, simulation_router, setup_websocket_routes
+from .websocket.chat_handlers import push_job_progress
 from ..db.session import engine, Base
 from ..models import user as user_model
+from ..ml import get_model_registry
+from ..simulation import get_job_manager
+from ..vtk import (
+    get_shared_frames,
+    get_vtk_config,
+    get_vtk_watcher,
+    shutdown_io_executor,
+    shutdown_process_pool,
+)
 
 # 创建 FastAPI 应用
 app = FastAPI(
@@ -36,6 +46,7 @@ def on_startup():
 # 注册路由
 app.include_router(vtk_router)
 app.include_router(auth_router)
+app.include_router(simulation_router)
 
 # 设置WebSocket路由
 setup_websocket_routes(app)
@@ -115,9 +126,24 @@ async def startup_event():
     """应用启动事件"""
     logger.info("CementedCarbide Agent API 启动完成")
     logger.info("对话式多 Agent 系统已就绪")
+    # 性能预测模型只在启动时加载一次
+    get_model_registry()
+    if get_vtk_config().watch_enabled:
+        await get_vtk_watcher().start()
+    shared = get_shared_frames()
+    if shared is not None:
+        # 上次运行遗留的引用（持有进程已退出）与过期数组
+        shared.cleanup()
+    job_manager = get_job_manager()
+    job_manager.add_listener(push_job_progress)
+    await job_manager.start()
 
 
 @app.on_event("shutdown")  
 async def shutdown_event():
     """应用关闭事件"""
     logger.info("CementedCarbide Agent API 正在关闭")
+    await get_vtk_watcher().stop()
+    await get_job_manager().stop()
+    shutdown_process_pool()
+    shutdown_io_executor()
@@ -0,0 +1,86 @@
+"""
+模拟任务 API 路由
+
+提交、查询、取消后台 TopPhi 相场模拟任务（单次沉积模拟与参数扫描）并获取结果。
+对话中的进度推送见 websocket/chat_handlers.push_job_progress。
+"""
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from ...simulation import get_job_manager
+
+
+class JobSubmit(BaseModel):
+    composition: Dict[str, Any] = Field(..., description="涂层成分 {al_content, ti_content, n_content}")
+    params: Dict[str, Any] = Field(default_factory=dict, description="工艺参数 {deposition_temperature, ...}")
+    session_id: Optional[str] = Field(default=None, description="所属会话（进度推送给该会话）")
+
+
+class SweepSubmit(BaseModel):
+    composition: Dict[str, Any] = Field(..., description="基准成分 {al_content, ti_content, n_content}")
+    params: Dict[str, Any] = Field(default_factory=dict, description="基准工艺参数")
+    spec: Dict[str, Any] = Field(
+        ..., description='扫描规格 {"mode": "grid" | "lhs", "axes": {...}, "samples", "seed", "balance"}'
+    )
+    max_workers: Optional[int] = Field(default=None, description="并行进程数（不超过 SIM_SWEEP_WORKERS）")
+    session_id: Optional[str] = Field(default=None, description="所属会话（进度推送给该会话）")
+
+
+router = APIRouter(prefix="/api/simulation", tags=["Simulation"])
+
+
+@router.post("/jobs")
+def submit_job(job_in: JobSubmit):
+    """提交沉积模拟任务，立即返回任务记录"""
+    try:
+        return get_job_manager().submit(job_in.composition, job_in.params, job_in.session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/sweeps")
+def submit_sweep(sweep_in: SweepSubmit):
+    """提交参数扫描任务，立即返回任务记录（结果与进度同样经 /jobs/{job_id} 查询）"""
+    try:
+        return get_job_manager().submit_sweep(
+            sweep_in.composition, sweep_in.params, sweep_in.spec, sweep_in.session_id, sweep_in.max_workers
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/jobs")
+def list_jobs(session_id: Optional[str] = None, limit: int = 20):
+    """最近的任务（可按会话过滤）"""
+    return {"jobs": get_job_manager().list_jobs(session_id, min(max(limit, 1), 200))}
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """任务状态与进度"""
+    job = get_job_manager().status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"任务不存在: {job_id}")
+    return job
+
+
+@router.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    """模拟结果（任务未完成时返回 409）"""
+    job = get_job_manager().result(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"任务不存在: {job_id}")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"任务尚未完成: {job['status']}")
+    return job["result"]
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    """取消任务（排队中直接撤销，运行中在下一帧输出时中止）"""
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"任务不存在: {job_id}")
+    return job
@@ -1,19 +1,94 @@
 """
 VTK文件服务路由 - 提供VTK文件下载和访问
 """
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+import asyncio
 import os
-import re
+import time
+from urllib.parse import quote
 from loguru import logger
 
-# 创建路由
-router = APIRouter(prefix="/api/vtk", tags=["VTK文件服务"])
+from ...vtk import (
+    get_frame_cache,
+    get_lod_frame,
+    read_header,
+    get_series_bundle,
+    DEFAULT_QUANTUM,
+    make_etag,
+    etag_matches,
+    choose_encoding,
+    parse_range,
+    read_range,
+    get_precompressed,
+    get_vtk_config,
+    get_vtk_index,
+    get_slice,
+    get_slice_stack,
+    mesh_cache_path,
+    build_isosurface,
+    get_process_pool,
+    get_frame_stats,
+    summarize_stats,
+    analyze_series,
+    summarize_kinetics,
+    get_vtk_watcher,
+    get_series_store,
+    parse_span,
+    encode_region,
+    QUANTIZE_DTYPES,
+    get_series_range,
+    resolve_range,
+    get_quantized_frame,
+    list_series_frames,
+    build_thumbnail,
+    get_comparison,
+    get_diff_frame,
+    run_io,
+    io_status,
+    get_latency_metrics,
+    get_shared_frames,
+    resolve_vtk_path,
+    resolve_folder,
+)
 
-# 项目根目录
-PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+class TimedRoute(APIRoute):
+    """
+    记录请求处理耗时的路由
+
+    按路由模板汇总到 get_latency_metrics()（/api/vtk/metrics），
+    并通过 Server-Timing 响应头返回本次耗时。
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                response.headers["Server-Timing"] = f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            finally:
+                get_latency_metrics().record(self.path, time.perf_counter() - start, status)
+
+        return timed_handler
+
+
+# 创建路由（处理函数中的阻塞文件操作一律经 run_io 提交到有界 I/O 线程池）
+router = APIRouter(prefix="/api/vtk", tags=["VTK文件服务"], route_class=TimedRoute)
+
+# VTK数据根目录（默认为项目根目录，可通过 VTK_DATA_ROOT 配置）
+PROJECT_ROOT = get_vtk_config().data_root
 
 
 @router.get("/file-info")
@@ -28,37 +103,7 @@ async def get_vtk_file_info(filepath: str):
         VTK文件元数据
     """
     try:
-        # 安全检查
-        if not filepath.endswith('.vtk'):
-            raise HTTPException(status_code=400, detail="只支持VTK文件格式")
-        
-        # 构建文件路径
-        file_path = PROJECT_ROOT / filepath
-        
-        # 检查文件是否存在
-        if not file_path.exists():
-            raise HTTPException(status_code=404, detail=f"文件不存在: {filepath}")
-        
-        # 读取文件头部信息
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = []
-            for i, line in enumerate(f):
-                lines.append(line.strip())
-                if i >= 15:  # 只读取前16行
-                    break
-        
-        # 解析头部信息
-        metadata = _parse_vtk_header(lines)
-        
-        # 基本文件信息
-        file_info = {
-            "name": filepath,
-            "size": file_path.stat().st_size,
-            "size_mb": round(file_path.stat().st_size / 1024 / 1024, 2),
-            "metadata": metadata
-        }
-        
-        return file_info
+        return await run_io(_read_file_info, filepath)
         
     except HTTPException:
         raise
@@ -67,47 +112,115 @@ async def get_vtk_file_info(filepath: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _read_file_info(filepath: str) -> dict:
+    """读取文件头部与大小（阻塞，经 run_io 调用）"""
+    # 安全检查
+    if not filepath.endswith('.vtk'):
+        raise HTTPException(status_code=400, detail="只支持VTK文件格式")
+    
+    # 构建文件路径
+    file_path = PROJECT_ROOT / filepath
+    
+    # 检查文件是否存在
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail=f"文件不存在: {filepath}")
+    
+    # 读取文件头部信息
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = []
+        for i, line in enumerate(f):
+            lines.append(line.strip())
+            if i >= 15:  # 只读取前16行
+                break
+    
+    # 解析头部信息
+    metadata = _parse_vtk_header(lines)
+    
+    # 基本文件信息
+    size = file_path.stat().st_size
+    return {
+        "name": filepath,
+        "size": size,
+        "size_mb": round(size / 1024 / 1024, 2),
+        "metadata": metadata
+    }
+
+
 @router.get("/files/{filename:path}")
-async def get_vtk_file(filename: str):
+async def get_vtk_file(
+    filename: str,
+    request: Request,
+    format: str = Query("vtk", pattern="^(vtk|binary)$", description="vtk: 原始文本; binary: float32二进制帧"),
+    quantize: Optional[int] = Query(None, description="量化位数 8/16，返回 uint8/uint16 二进制帧"),
+    range_scope: str = Query("series", alias="range", pattern="^(series|frame)$", description="量化范围: series 时间序列全局 / frame 单帧")
+):
     """
     下载VTK文件（支持子文件夹）
     
+    支持 ETag / If-None-Match（304）、单段 Range（206），
+    原始文本格式按 Accept-Encoding 返回预压缩的 gzip/br 变体。
+    
     Args:
         filename: VTK文件路径（例如: conc-0.vtk 或 涂层-调幅分解/conc-0.vtk）
+        format: 返回格式，binary 时返回缓存的 float32 二进制帧（JSON头部 + 小端float32数据）
+        quantize: 量化位数，指定时返回量化二进制帧（头部 quantize 字段给出 scale/offset），忽略 format
+        range: 量化范围，series 时各帧色标一致
     
     Returns:
         VTK文件内容
     """
     try:
-        # 安全检查：只允许访问.vtk文件
-        if not filename.endswith('.vtk'):
-            raise HTTPException(status_code=400, detail="只支持VTK文件格式")
-        
-        # 构建文件路径（从项目根目录）
-        file_path = PROJECT_ROOT / filename
-        
-        # 检查文件是否存在
-        if not file_path.exists():
-            logger.warning(f"[VTK] 文件不存在: {file_path}")
-            raise HTTPException(status_code=404, detail=f"文件不存在: {filename}")
+        file_path = await run_io(_resolve_vtk_path, filename)
         
         # 检查文件大小
-        file_size = file_path.stat().st_size
+        file_size = (await run_io(file_path.stat)).st_size
         logger.info(f"[VTK] 请求文件: {filename}, 大小: {file_size / 1024 / 1024:.2f} MB")
         
         # 获取文件名（不含路径）
         file_basename = Path(filename).name
         
+        # 量化二进制帧：按时间序列全局范围（或单帧范围）量化并缓存
+        if quantize is not None:
+            _check_quantize(quantize)
+            cache = get_frame_cache()
+            value_range = await run_io(resolve_range, cache, file_path, range_scope)
+            quantized_path = await run_io(get_quantized_frame, cache, file_path, quantize, None, value_range)
+            return await _file_response(
+                request, quantized_path, f"{Path(file_basename).stem}.q{quantize}.vtkb",
+                headers={"X-VTK-Format": "binary"}
+            )
+        
+        # 二进制格式：首次请求时转码并缓存，之后直接返回缓存文件
+        if format == "binary":
+            binary_path = await run_io(get_frame_cache().get_binary_frame, file_path)
+            return await _file_response(
+                request, binary_path, f"{Path(file_basename).stem}.vtkb",
+                headers={"X-VTK-Format": "binary"}
+            )
+        
+        # Range 请求总是针对原始字节；否则按 Accept-Encoding 选择预压缩变体
+        encoding = None
+        if not request.headers.get("range"):
+            encoding = choose_encoding(request.headers.get("accept-encoding"))
+        
+        if encoding:
+            etag = await run_io(make_etag, file_path, encoding)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=_cache_headers(etag, vary=True))
+            
+            variant_path = await run_io(get_precompressed, get_frame_cache(), file_path, encoding)
+            return FileResponse(
+                path=str(variant_path),
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Disposition": _content_disposition(file_basename),
+                    "Content-Encoding": encoding,
+                    **_cache_headers(etag, vary=True)
+                }
+            )
+        
         # 返回文件响应
-        return FileResponse(
-            path=str(file_path),
-            media_type="application/octet-stream",
-            filename=file_basename,
-            headers={
-                "Content-Disposition": f'attachment; filename="{file_basename}"',
-                "Access-Control-Expose-Headers": "Content-Disposition"
-            }
-        )
+        return await _file_response(request, file_path, file_basename, etag=await run_io(make_etag, file_path), vary=True)
         
     except HTTPException:
         raise
@@ -116,6 +229,407 @@ async def get_vtk_file(filename: str):
         raise HTTPException(status_code=500, detail=f"获取文件失败: {str(e)}")
 
 
+async def _file_response(
+    request: Request,
+    path: Path,
+    download_name: str,
+    etag: Optional[str] = None,
+    headers: Optional[dict] = None,
+    vary: bool = False,
+    media_type: str = "application/octet-stream"
+) -> Response:
+    """
+    返回支持条件请求与字节范围的文件响应
+    
+    Args:
+        request: 当前请求
+        path: 实际返回的文件
+        download_name: 下载文件名
+        etag: ETag（默认由 path 的 mtime/大小生成）
+        headers: 额外响应头
+        vary: 是否声明 Vary: Accept-Encoding（同一URL存在压缩变体时）
+        media_type: 响应类型
+    
+    Returns:
+        200 / 206 / 304 / 416 响应
+    """
+    etag = etag or await run_io(make_etag, path)
+    response_headers = {
+        "Content-Disposition": _content_disposition(download_name),
+        **_cache_headers(etag, vary=vary),
+        **(headers or {})
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=_cache_headers(etag, vary=vary))
+    
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range == etag):
+        size = (await run_io(path.stat)).st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}", **_cache_headers(etag)})
+        
+        if byte_range:
+            start, end = byte_range
+            content = await run_io(read_range, path, start, end)
+            return Response(
+                content=content,
+                status_code=206,
+                media_type=media_type,
+                headers={**response_headers, "Content-Range": f"bytes {start}-{end}/{size}"}
+            )
+    
+    return FileResponse(
+        path=str(path),
+        media_type=media_type,
+        headers=response_headers
+    )
+
+
+def _content_disposition(download_name: str) -> str:
+    """生成 Content-Disposition（非ASCII文件名按 RFC 5987 编码）"""
+    if download_name.isascii():
+        return f'attachment; filename="{download_name}"'
+    return f"attachment; filename*=utf-8''{quote(download_name)}"
+
+
+def _cache_headers(etag: str, vary: bool = False) -> dict:
+    """缓存相关响应头（no-cache: 每次使用前用 ETag 重新验证）"""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Accept-Ranges": "bytes",
+        "Access-Control-Expose-Headers": "Content-Disposition, Content-Range, ETag, X-VTK-Format"
+    }
+    if vary:
+        headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
+def _check_quantize(quantize: Optional[int]) -> None:
+    """校验量化位数"""
+    if quantize is not None and quantize not in QUANTIZE_DTYPES:
+        raise HTTPException(status_code=400, detail=f"不支持的量化位数: {quantize}，可选 8 / 16")
+
+
+@router.get("/lod/{filename:path}")
+async def get_vtk_lod(
+    filename: str,
+    request: Request,
+    level: int = Query(0, ge=0, description="LOD级别，0为原始分辨率，每级各边减半，最粗一级约8³"),
+    quantize: Optional[int] = Query(None, description="量化位数 8/16，返回 uint8/uint16 二进制帧"),
+    range_scope: str = Query("series", alias="range", pattern="^(series|frame)$", description="量化范围: series 时间序列全局 / frame 单帧")
+):
+    """
+    获取VTK帧的多分辨率（LOD）数据
+    
+    首次请求时生成整座金字塔并缓存，前端可先请求粗糙级别立即显示，再逐级细化。
+    
+    Args:
+        filename: VTK文件路径（例如: 涂层-调幅分解/conc-0.vtk）
+        level: LOD级别，超过最粗级别时返回最粗级别
+        quantize: 量化位数（同 /files）
+        range: 量化范围
+    
+    Returns:
+        二进制帧（格式同 /files?format=binary，头部额外包含 level/levels/metadata）
+    """
+    try:
+        file_path = await run_io(_resolve_vtk_path, filename)
+        
+        header_lines, _ = await run_io(read_header, file_path)
+        metadata = _parse_vtk_header(header_lines)
+        
+        if quantize is not None:
+            _check_quantize(quantize)
+            cache = get_frame_cache()
+            value_range = await run_io(resolve_range, cache, file_path, range_scope)
+            lod_path = await run_io(
+                get_quantized_frame, cache, file_path, quantize, level, value_range, metadata
+            )
+            download_name = f"{Path(filename).stem}.L{level}.q{quantize}.vtkb"
+        else:
+            lod_path = await run_io(
+                get_lod_frame, get_frame_cache(), file_path, level, metadata
+            )
+            download_name = f"{Path(filename).stem}.L{level}.vtkb"
+        return await _file_response(
+            request, lod_path, download_name,
+            headers={"X-VTK-Format": "binary"}
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[VTK] 获取LOD失败: {e}")
+        raise HTTPException(status_code=500, detail=f"获取LOD失败: {str(e)}")
+
+
+@router.get("/isosurface/{filename:path}")
+async def get_vtk_isosurface(
+    filename: str,
+    request: Request,
+    iso: float = Query(0.5, description="等值面取值"),
+    decimation: int = Query(2, ge=1, le=8, description="顶点聚类网格边长（体素），1 表示不简化")
+):
+    """
+    提取VTK帧的等值面网格
+    
+    网格在进程池中计算（Surface Nets + 顶点聚类简化），按帧 + iso + decimation 缓存，
+    格式见 src/vtk/isosurface.py（decode_mesh）。
+    
+    Args:
+        filename: VTK文件路径（例如: 涂层-调幅分解/conc-0.vtk）
+        iso: 等值面取值
+        decimation: 简化粒度
+    
+    Returns:
+        二进制网格（JSON头部 + float32 顶点 + uint32 三角形索引）
+    """
+    try:
+        file_path = await run_io(_resolve_vtk_path, filename)
+        
+        mesh_path = await run_io(mesh_cache_path, get_frame_cache(), file_path, iso, decimation)
+        if not await run_io(mesh_path.exists):
+            loop = asyncio.get_running_loop()
+            mesh_path = Path(await loop.run_in_executor(
+                get_process_pool(), build_isosurface, str(file_path), iso, decimation
+            ))
+        return await _file_response(
+            request, mesh_path, f"{Path(filename).stem}.iso{iso:g}.vtkm",
+            headers={"X-VTK-Format": "mesh"}
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[VTK] 提取等值面失败: {e}")
+        raise HTTPException(status_code=500, detail=f"提取等值面失败: {str(e)}")
+
+
+@router.get("/thumbs/{path:path}")
+async def get_vtk_thumbnails(
+    path: str,
+    request: Request,
+    axis: str = Query("z", pattern="^[xyz]$", description="投影方向"),
+    mode: str = Query("max", pattern="^(max|mean)$", description="max: 最大值投影; mean: 平均投影")
+):
+    """
+    获取投影缩略图
+    
+    path 为 VTK 文件时返回该帧的 PNG 缩略图；为文件夹时生成全部帧的缩略图并返回列表。
+    缩略图在进程池中渲染，按时间序列全局范围着色并缓存，新帧入库时由目录监视器预先生成。
+    
+    Args:
+        path: VTK文件（例如: 涂层-调幅分解/conc-0.vtk）或文件夹（例如: 涂层-调幅分解）
+        axis: 投影方向
+        mode: 投影方式
+    
+    Returns:
+        PNG 图像，或 {"folder", "axis", "mode", "frames": [{"index", "name", "time_step", "url"}]}
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        if path.endswith('.vtk'):
+            file_path = await run_io(_resolve_vtk_path, path)
+            thumb_path = Path(await loop.run_in_executor(
+                get_process_pool(), build_thumbnail, str(file_path), axis, mode
+            ))
+            return await _file_response(
+                request, thumb_path, f"{file_path.stem}.{mode}{axis}.png",
+                headers={"X-VTK-Format": "thumbnail"}, media_type="image/png"
+            )
+        
+        folder_path = await run_io(_resolve_folder, path)
+        frames = await run_io(list_series_frames, folder_path)
+        await asyncio.gather(*(
+            loop.run_in_executor(get_process_pool(), build_thumbnail, str(source), axis, mode)
+            for _, source in frames
+        ))
+        return {
+            "folder": path,
+            "axis": axis,
+            "mode": mode,
+            "frames": [
+                {
+                    "index": i,
+                    "name": f"{path}/{source.name}",
+                    "time_step": time_step,
+                    "url": f"/api/vtk/thumbs/{path}/{source.name}?axis={axis}&mode={mode}"
+                }
+                for i, (time_step, source) in enumerate(frames)
+            ]
+        }
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 生成缩略图失败: {e}")
+        raise HTTPException(status_code=500, detail=f"生成缩略图失败: {str(e)}")
+
+
+@router.get("/stats/{filename:path}")
+async def get_vtk_stats(
+    filename: str,
+    threshold: Optional[float] = Query(None, description="相界阈值，默认为场均值"),
+    spectrum: bool = Query(True, description="是否返回径向平均谱")
+):
+    """
+    获取VTK帧的微观结构统计
+    
+    包括结构因子径向谱、调幅波长、相体积分数与界面面积，计算方式见 src/vtk/analytics.py，
+    结果按帧缓存。
+    
+    Args:
+        filename: VTK文件路径（例如: 涂层-调幅分解/conc-500.vtk）
+        threshold: 相界阈值
+        spectrum: 是否返回径向平均谱（k, s 数组）
+    
+    Returns:
+        dict: 统计结果
+    """
+    try:
+        file_path = await run_io(_resolve_vtk_path, filename)
+        stats = await run_io(get_frame_stats, get_frame_cache(), file_path, threshold)
+        return {
+            "name": filename,
+            **(stats if spectrum else summarize_stats(stats))
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[VTK] 计算统计失败: {e}")
+        raise HTTPException(status_code=500, detail=f"计算统计失败: {str(e)}")
+
+
+@router.get("/compare")
+async def compare_vtk_frames(
+    request: Request,
+    a: str = Query(..., description="基准帧（例如: 涂层-调幅分解/conc-0.vtk）"),
+    b: str = Query(..., description="对比帧，可来自另一次模拟"),
+    bins: int = Query(64, ge=2, le=1024, description="差值直方图区间数"),
+    format: str = Query("json", pattern="^(json|binary)$", description="json: 统计结果; binary: 差值场二进制帧")
+):
+    """
+    对比两个VTK帧（同一次或不同模拟）
+    
+    计算差值场 b - a 的 L2/RMS/L∞ 范数与直方图，以及结构因子峰位、调幅波长、
+    富相体积分数、比界面面积的变化；结果按两帧指纹对缓存，计算方式见 src/vtk/compare.py。
+    
+    Args:
+        a: 基准帧路径
+        b: 对比帧路径
+        bins: 直方图区间数
+        format: json 返回统计结果，binary 返回差值场（格式同 /files?format=binary）
+    
+    Returns:
+        dict 或二进制帧
+    """
+    try:
+        path_a, path_b = await run_io(_resolve_vtk_path, a), await run_io(_resolve_vtk_path, b)
+        if format == "binary":
+            diff_path = await run_io(get_diff_frame, get_frame_cache(), path_a, path_b)
+            return await _file_response(
+                request, diff_path, f"{path_b.stem}-{path_a.stem}.diff.vtkb",
+                headers={"X-VTK-Format": "binary"}
+            )
+        return await run_io(get_comparison, get_frame_cache(), path_a, path_b, bins)
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 帧对比失败: {e}")
+        raise HTTPException(status_code=500, detail=f"帧对比失败: {str(e)}")
+
+
+@router.get("/kinetics/{folder_name:path}")
+async def get_coarsening_kinetics(
+    folder_name: str,
+    frames: bool = Query(True, description="是否返回逐帧统计")
+):
+    """
+    分析时间序列的粗化动力学
+    
+    逐帧统计在进程池中并行计算，拟合粗化律 L(t) ~ t^n，
+    结果按文件夹指纹（全部帧的 mtime/大小）缓存，计算方式见 src/vtk/kinetics.py。
+    
+    Args:
+        folder_name: 文件夹名称（例如: 涂层-调幅分解）
+        frames: 是否返回逐帧统计（否则只返回拟合结果与首末帧）
+    
+    Returns:
+        dict: 粗化动力学汇总
+    """
+    try:
+        folder_path = await run_io(_resolve_folder, folder_name)
+        result = await run_io(analyze_series, get_frame_cache(), folder_path, get_process_pool())
+        return result if frames else summarize_kinetics(result)
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 粗化动力学分析失败: {e}")
+        raise HTTPException(status_code=500, detail=f"粗化动力学分析失败: {str(e)}")
+
+
+@router.get("/watcher")
+async def get_watcher_status():
+    """
+    查询后台目录监视状态
+    
+    新增/变化的 VTK 文件会被自动预计算二进制帧、LOD 与统计（见 src/vtk/watcher.py）。
+    
+    Returns:
+        dict: 运行状态、队列深度、进行中的文件与累计完成/失败数
+    """
+    return get_vtk_watcher().status()
+
+
+@router.get("/metrics")
+async def get_vtk_metrics():
+    """
+    查询 VTK 接口的延迟统计
+    
+    Returns:
+        dict: routes 为各路由的请求数与耗时分位数（毫秒），io 为 I/O 线程池的占用情况，
+        shared 为共享帧的数量与占用（未启用时为 None）
+    """
+    shared = get_shared_frames()
+    return {
+        "routes": get_latency_metrics().summary(),
+        "io": io_status(),
+        "shared": await run_io(shared.stats) if shared is not None else None,
+    }
+
+
+def _resolve_vtk_path(filename: str) -> Path:
+    """
+    解析并校验VTK文件路径（阻塞，经 run_io 调用；校验见 vtk.resolve_vtk_path）
+    
+    Args:
+        filename: 相对项目根目录的VTK文件路径
+    
+    Returns:
+        VTK文件绝对路径
+    """
+    try:
+        return resolve_vtk_path(filename, PROJECT_ROOT)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 def _parse_vtk_header(lines: list) -> dict:
     """
     解析VTK文件头部信息
@@ -180,29 +694,23 @@ async def list_vtk_files():
     """
     列出所有可用的VTK文件
     
+    元数据来自持久化索引（src/vtk/index.py），索引过期时才增量扫描根目录。
+    
     Returns:
         List[dict]: VTK文件信息列表
     """
     try:
-        vtk_files = []
+        frames = await run_io(get_vtk_index().list_folder, "")
         
-        # 扫描项目根目录下的VTK文件
-        for vtk_file in PROJECT_ROOT.glob("*.vtk"):
+        vtk_files = []
+        for frame in frames:
             file_info = {
-                "name": vtk_file.name,
-                "size": vtk_file.stat().st_size,
-                "modified": vtk_file.stat().st_mtime
+                "name": frame["name"],
+                "size": frame["size"],
+                "modified": frame["modified"],
+                "value_range": frame["value_range"]
             }
-            
-            # 尝试解析VTK头部信息
-            try:
-                with open(vtk_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    header_lines = [f.readline() for _ in range(20)]
-                    metadata = _parse_vtk_header(header_lines)
-                    file_info.update(metadata)
-            except Exception as e:
-                logger.warning(f"无法解析VTK文件 {vtk_file.name}: {e}")
-            
+            file_info.update(_parse_vtk_header(frame["header"]))
             vtk_files.append(file_info)
         
         return {
@@ -220,6 +728,8 @@ async def get_timeseries_files(folder_name: str):
     """
     获取指定文件夹的时间序列VTK文件列表
     
+    元数据来自持久化索引，按时间步排序。
+    
     Args:
         folder_name: 文件夹名称（例如: 涂层-调幅分解）
         
@@ -227,33 +737,24 @@ async def get_timeseries_files(folder_name: str):
         dict: 时间序列信息
     """
     try:
-        folder_path = PROJECT_ROOT / folder_name
-        
-        if not folder_path.exists():
-            raise HTTPException(status_code=404, detail=f"文件夹不存在: {folder_name}")
-        
-        if not folder_path.is_dir():
-            raise HTTPException(status_code=400, detail=f"不是文件夹: {folder_name}")
+        folder_path = await run_io(_resolve_folder, folder_name)
+        folder_key = folder_path.relative_to(await run_io(PROJECT_ROOT.resolve)).as_posix()
         
-        files = []
+        frames = await run_io(get_vtk_index().list_folder, folder_key)
         
-        # 扫描文件夹中的VTK文件
-        for vtk_file in sorted(folder_path.glob("*.vtk")):
-            # 从文件名提取时间步 (例如: conc-100.vtk -> 100)
-            match = re.search(r'conc-(\d+)\.vtk', vtk_file.name)
-            time_step = int(match.group(1)) if match else 0
-            
-            file_info = {
-                "name": f"{folder_name}/{vtk_file.name}",  # 包含文件夹路径
-                "fileName": vtk_file.name,  # 仅文件名
-                "timeStep": time_step,
-                "size": vtk_file.stat().st_size
+        files = [
+            {
+                "name": f"{folder_name}/{frame['name']}",  # 包含文件夹路径
+                "fileName": frame["name"],  # 仅文件名
+                "timeStep": frame["time_step"],
+                "size": frame["size"],
+                "dimensions": frame["dimensions"],
+                "pointCount": frame["point_count"],
+                "scalarName": frame["scalar_name"],
+                "valueRange": frame["value_range"]
             }
-            
-            files.append(file_info)
-        
-        # 按时间步排序
-        files.sort(key=lambda x: x['timeStep'])
+            for frame in frames
+        ]
         
         # 提取时间步列表
         time_steps = [f['timeStep'] for f in files]
@@ -272,3 +773,273 @@ async def get_timeseries_files(folder_name: str):
     except Exception as e:
         logger.error(f"获取时间序列文件失败: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/bundle/{folder_name:path}")
+async def get_timeseries_bundle(
+    folder_name: str,
+    request: Request,
+    codec: str = Query("zlib", pattern="^(zlib|lzma)$", description="压缩方式"),
+    quantum: float = Query(DEFAULT_QUANTUM, gt=0, le=0.01, description="量化步长，最大误差为其一半")
+):
+    """
+    获取整个时间序列的增量编码数据包
+    
+    一次请求即可获取全部帧：首帧为关键帧，后续帧为量化后的帧间差分，
+    解码方式见 src/vtk/bundle.py（decode_series）。
+    
+    Args:
+        folder_name: 文件夹名称（例如: 涂层-调幅分解）
+        codec: 压缩方式（zlib / lzma）
+        quantum: 量化步长
+    
+    Returns:
+        时间序列数据包
+    """
+    try:
+        folder_path = await run_io(_resolve_folder, folder_name)
+        
+        bundle_path = await run_io(
+            get_series_bundle, get_frame_cache(), folder_path, quantum, codec
+        )
+        return await _file_response(
+            request, bundle_path, f"{folder_path.name}.vtks",
+            headers={"X-VTK-Format": "bundle"}
+        )
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 打包时间序列失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _resolve_folder(folder_name: str) -> Path:
+    """
+    解析并校验时间序列文件夹路径（阻塞，经 run_io 调用；校验见 vtk.resolve_folder）
+    
+    Args:
+        folder_name: 相对项目根目录的文件夹路径
+    
+    Returns:
+        文件夹绝对路径
+    """
+    try:
+        return resolve_folder(folder_name, PROJECT_ROOT)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/range/{folder_name:path}")
+async def get_vtk_series_range(folder_name: str):
+    """
+    查询时间序列的全局取值范围（量化传输与色标使用的范围）
+    
+    Args:
+        folder_name: 文件夹名称（例如: 涂层-调幅分解）
+    
+    Returns:
+        dict: {"folder", "range"}
+    """
+    try:
+        folder_path = await run_io(_resolve_folder, folder_name)
+        vmin, vmax = await run_io(get_series_range, get_frame_cache(), folder_path)
+        return {"folder": folder_name, "range": [vmin, vmax]}
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 获取取值范围失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/slice/{filename:path}")
+async def get_vtk_slice(
+    filename: str,
+    axis: str = Query("z", pattern="^[xyz]$", description="切片法向轴"),
+    index: int = Query(0, ge=0, description="沿法向轴的下标"),
+    dtype: str = Query("float32", pattern="^(float32|uint8|uint16)$", description="数据类型，uint8/uint16 按切片 range 线性量化"),
+    quantize: Optional[int] = Query(None, description="量化位数 8/16（按 range 参数的范围量化，覆盖 dtype）"),
+    range_scope: str = Query("series", alias="range", pattern="^(series|frame)$", description="量化范围: series 时间序列全局 / frame 单个切片")
+):
+    """
+    提取VTK帧的二维切片（XY/XZ/YZ）
+    
+    基于二进制帧缓存的内存映射读取，不加载整个体数据。
+    
+    Args:
+        filename: VTK文件路径（例如: 涂层-调幅分解/conc-0.vtk）
+        axis: 法向轴（z 为 XY 切片，y 为 XZ 切片，x 为 YZ 切片）
+        index: 下标
+        dtype: float32 / uint8 / uint16
+        quantize: 量化位数，指定时按 range 量化（series 时与同序列的帧、切片色标一致）
+        range: 量化范围
+    
+    Returns:
+        二进制帧（头部含 shape/range，量化时含 quantize 字段，数据为 shape 大小的二维数组）
+    """
+    try:
+        file_path = await run_io(_resolve_vtk_path, filename)
+        _check_quantize(quantize)
+        cache = get_frame_cache()
+        value_range = None
+        if quantize is not None:
+            dtype = QUANTIZE_DTYPES[quantize]
+            value_range = await run_io(resolve_range, cache, file_path, range_scope)
+        content = await run_io(get_slice, cache, file_path, axis, index, dtype, value_range)
+        return Response(content=content, media_type="application/octet-stream", headers={"X-VTK-Format": "slice"})
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 提取切片失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/slice-stack/{folder_name:path}")
+async def get_vtk_slice_stack(
+    folder_name: str,
+    axis: str = Query("z", pattern="^[xyz]$", description="切片法向轴"),
+    index: int = Query(0, ge=0, description="沿法向轴的下标"),
+    dtype: str = Query("float32", pattern="^(float32|uint8|uint16)$", description="数据类型，uint8/uint16 按整个堆栈 range 线性量化"),
+    quantize: Optional[int] = Query(None, description="量化位数 8/16（按时间序列全局范围量化，覆盖 dtype）")
+):
+    """
+    批量提取时间序列所有帧同一位置的切片
+    
+    一次请求得到 [帧数, 行, 列] 的切片堆栈，用于时间-空间（kymograph）视图。
+    
+    Args:
+        folder_name: 文件夹名称（例如: 涂层-调幅分解）
+        axis: 法向轴
+        index: 下标
+        dtype: float32 / uint8 / uint16
+        quantize: 量化位数，指定时按时间序列全局范围量化
+    
+    Returns:
+        二进制帧（头部额外包含 time_steps 与各帧 frame_ranges）
+    """
+    try:
+        folder_path = await run_io(_resolve_folder, folder_name)
+        _check_quantize(quantize)
+        cache = get_frame_cache()
+        value_range = None
+        if quantize is not None:
+            dtype = QUANTIZE_DTYPES[quantize]
+            value_range = await run_io(get_series_range, cache, folder_path)
+        content = await run_io(get_slice_stack, cache, folder_path, axis, index, dtype, value_range)
+        return Response(content=content, media_type="application/octet-stream", headers={"X-VTK-Format": "slice-stack"})
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 提取切片堆栈失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/store/{folder_name:path}")
+async def get_vtk_store_info(folder_name: str):
+    """
+    查询时间序列的分块存储概况（不存在则先转换生成）
+    
+    整个序列按 (t, z, y, x) 分块、zlib 压缩存储，格式见 src/vtk/store.py。
+    
+    Args:
+        folder_name: 文件夹名称（例如: 涂层-调幅分解）
+    
+    Returns:
+        dict: 形状、块形状、时间步、磁盘占用与压缩率
+    """
+    try:
+        folder_path = await run_io(_resolve_folder, folder_name)
+        store = await run_io(get_series_store, get_frame_cache(), folder_path)
+        return await run_io(store.info)
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 获取分块存储失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/history/{folder_name:path}")
+async def get_vtk_point_history(
+    folder_name: str,
+    x: int = Query(..., ge=0, description="体素 x 下标"),
+    y: int = Query(..., ge=0, description="体素 y 下标"),
+    z: int = Query(..., ge=0, description="体素 z 下标")
+):
+    """
+    查询单个体素在整个时间序列上的取值
+    
+    从分块存储读取，只解压包含该体素的块（每个时间块一个）。
+    
+    Args:
+        folder_name: 文件夹名称（例如: 涂层-调幅分解）
+        x, y, z: 体素下标
+    
+    Returns:
+        dict: {"point", "time_steps", "values"}
+    """
+    try:
+        folder_path = await run_io(_resolve_folder, folder_name)
+        store = await run_io(get_series_store, get_frame_cache(), folder_path)
+        values = await run_io(store.point_history, x, y, z)
+        return {"point": [x, y, z], "time_steps": store.time_steps, "values": values.tolist()}
+    
+    except HTTPException:
+        raise
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 查询体素历史失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/region/{folder_name:path}")
+async def get_vtk_region(
+    folder_name: str,
+    t: Optional[str] = Query(None, description="帧下标 i 或区间 a:b（省略为全部）"),
+    z: Optional[str] = Query(None, description="z 下标 i 或区间 a:b"),
+    y: Optional[str] = Query(None, description="y 下标 i 或区间 a:b"),
+    x: Optional[str] = Query(None, description="x 下标 i 或区间 a:b")
+):
+    """
+    读取时间序列的四维子区域（时间范围内的子体积、切片或体素历史）
+    
+    从分块存储读取，只解压与区域相交的块。单个下标的维度在结果中被去掉，
+    例如 t=0:10&z=32 得到 [10, ny, nx] 的 XY 切片序列。
+    
+    Args:
+        folder_name: 文件夹名称（例如: 涂层-调幅分解）
+        t, z, y, x: 各维下标或半开区间
+    
+    Returns:
+        二进制帧（头部含 shape、region 与 time_steps）
+    """
+    try:
+        folder_path = await run_io(_resolve_folder, folder_name)
+        store = await run_io(get_series_store, get_frame_cache(), folder_path)
+        key = tuple(parse_span(spec, size) for spec, size in zip((t, z, y, x), store.shape))
+        content = await run_io(encode_region, store, key)
+        return Response(content=content, media_type="application/octet-stream", headers={"X-VTK-Format": "region"})
+    
+    except HTTPException:
+        raise
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[VTK] 读取区域失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -5,6 +5,7 @@
 - 用户消息驱动，而非任务驱动
 - 每条消息独立处理，支持多轮对话
 - 实时流式输出
+- 后台模拟任务的进度以 tool_progress 消息推送给提交任务的会话
 """
 import uuid
 import asyncio
@@ -14,6 +15,9 @@ from loguru import logger
 
 from .manager import manager
 
+# 会话 -> 当前连接的客户端（模拟任务按会话推送进度）
+_session_clients: Dict[str, str] = {}
+
 
 async def handle_chat_message(data: Dict[str, Any], client_id: str, session_id: Optional[str] = None):
     """
@@ -70,6 +74,7 @@ async def handle_user_message(data: Dict[str, Any], client_id: str, session_id:
     context_data = data.get("context", {})
     
     logger.info(f"[Chat] 收到消息: session={session_id}, content={user_content[:50]}...")
+    _session_clients[session_id] = client_id
     
     # 通知前端开始处理
     await manager.send_json({
@@ -280,6 +285,49 @@ async def handle_clear_session(data: Dict[str, Any], client_id: str, session_id:
     logger.info(f"[Chat] 会话已清除: {session_id}")
 
 
+def unregister_client(client_id: str):
+    """连接断开时移除该客户端的会话映射"""
+    for session_id in [s for s, c in _session_clients.items() if c == client_id]:
+        del _session_clients[session_id]
+
+
+# 任务类型 -> 提交该任务的工具
+JOB_TOOLS = {
+    "deposition": "simulate_topphi_tool",
+    "sweep": "run_parameter_sweep_tool",
+}
+
+
+async def push_job_progress(job: Dict[str, Any]):
+    """
+    模拟任务进度监听者：推送 tool_progress 给提交任务的会话
+    
+    消息格式：
+    {
+        "type": "tool_progress",
+        "tool": "simulate_topphi_tool | run_parameter_sweep_tool",
+        "job_id": "...",
+        "status": "queued | running | completed | failed | cancelled",
+        "progress": 沉积模拟 {"step", "steps", "energy", "elapsed", "eta"}
+                    参数扫描 {"completed", "total", "point", "rows", "elapsed", "eta"},
+        "error": "失败原因（可选）"
+    }
+    """
+    client_id = _session_clients.get(job.get("session_id"))
+    if not client_id:
+        return
+    tool = JOB_TOOLS.get(job.get("kind"), "simulate_topphi_tool")
+    await manager.send_json({
+        "type": "tool_progress",
+        "tool": tool,
+        "display_name": _get_tool_display_name(tool),
+        "job_id": job["id"],
+        "status": job["status"],
+        "progress": job.get("progress"),
+        "error": job.get("error"),
+    }, client_id)
+
+
 def _get_agent_display_name(agent: str) -> str:
     """获取Agent显示名称"""
     names = {
@@ -304,8 +352,13 @@ def _get_tool_display_name(tool: str) -> str:
         "normalize_composition_tool": "归一化成分",
         # 分析工具
         "simulate_topphi_tool": "TopPhi 相场模拟",
+        "get_simulation_job_tool": "模拟任务查询",
+        "cancel_simulation_job_tool": "取消模拟任务",
+        "run_parameter_sweep_tool": "参数扫描",
         "predict_ml_performance_tool": "ML 性能预测",
         "compare_historical_tool": "历史案例检索",
+        "analyze_coarsening_kinetics_tool": "粗化动力学分析",
+        "compare_microstructures_tool": "微观结构对比",
         # 实验工具
         "show_performance_comparison_tool": "性能对比",
         "request_experiment_input_tool": "实验数据录入",
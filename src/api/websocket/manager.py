@@ -114,6 +114,15 @@ class ConnectionManager:
                 logger.error(f"发送消息失败: client={client_id}, error={str(e)}")
                 self.disconnect(client_id)
     
+    async def send_bytes(self, data: bytes, client_id: str):
+        """发送二进制消息给客户端"""
+        if client_id in self.active_connections:
+            try:
+                await self.active_connections[client_id].send_bytes(data)
+            except Exception as e:
+                logger.error(f"发送二进制消息失败: client={client_id}, error={str(e)}")
+                self.disconnect(client_id)
+    
     async def broadcast(self, message: dict):
         """广播消息给所有客户端"""
         for client_id in list(self.active_connections.keys()):
@@ -8,7 +8,8 @@ import asyncio
 from fastapi import WebSocket, WebSocketDisconnect
 from loguru import logger
 from .manager import manager
-from .chat_handlers import handle_chat_message
+from .chat_handlers import handle_chat_message, unregister_client
+from .vtk_stream import FrameStreamSession
 from ..security import decode_token
 
 # 存储每个客户端的后台任务
@@ -152,6 +153,7 @@ def setup_websocket_routes(app):
                 if not task.done():
                     task.cancel()
             _client_tasks.pop(client_id, None)
+            unregister_client(client_id)
             manager.disconnect(client_id)
             logger.info(f"[Chat] 连接断开: {client_id}")
         except Exception as e:
@@ -165,4 +167,37 @@ def setup_websocket_routes(app):
                 "type": "error",
                 "message": f"发生错误: {str(e)}"
             }, client_id)
+            unregister_client(client_id)
+            manager.disconnect(client_id)
+    
+    @app.websocket("/ws/vtk/stream")
+    async def websocket_vtk_stream_endpoint(websocket: WebSocket):
+        """
+        VTK 时间序列帧推流端点
+        
+        按播放顺序推送二进制帧，保持领先播放头 window 帧，
+        拖动进度条（seek）时取消在途推送。协议见 vtk_stream.py。
+        """
+        token = websocket.query_params.get("token")
+        payload = decode_token(token) if token else None
+        if not payload or "sub" not in payload:
+            logger.warning("[VTK推流] 未授权的连接请求")
+            await websocket.close(code=1008)
+            return
+        
+        client_id = f"VTK_{uuid.uuid4().hex[:8]}_U{payload['sub']}"
+        await manager.connect(websocket, client_id)
+        session = FrameStreamSession(client_id)
+        
+        try:
+            while True:
+                data = await websocket.receive_json()
+                await session.handle(data)
+        
+        except WebSocketDisconnect:
+            logger.info(f"[VTK推流] 连接断开: {client_id}")
+        except Exception as e:
+            logger.error(f"[VTK推流] 错误: {str(e)}", exc_info=True)
+        finally:
+            session.cancel()
             manager.disconnect(client_id)
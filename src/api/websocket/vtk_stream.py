@@ -0,0 +1,185 @@
+"""
+VTK 时间序列帧推流
+
+客户端订阅一个时间序列文件夹后，服务端按播放顺序主动推送二进制帧，
+始终保持在播放头之前 window 帧（流控），拖动进度条时取消在途推送并从新位置开始。
+
+客户端消息（JSON）：
+- subscribe: {"folder", "window"?, "lod"?, "loop"?, "start"?} 订阅并从 start 开始推送
+- seek: {"index"} 播放头跳转（取消当前推送，从 index 重新开始）
+- position: {"index"} 播放头前进（释放流控窗口）
+- window: {"size"} 调整预取深度
+- stop: 停止推送
+- ping
+
+服务端消息：
+- JSON: stream_info（帧列表）/ stream_end / stream_error / pong
+- 二进制: b"VTKF" | uint32 元信息长度 | JSON 元信息 {index, name, time_step, level, generation}
+  | 帧数据（与 /api/vtk/files?format=binary、/api/vtk/lod 的响应体相同）
+"""
+import asyncio
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .manager import manager
+from ...vtk import get_frame_cache, get_lod_frame, get_vtk_config, list_series_frames, run_io
+
+
+STREAM_MAGIC = b"VTKF"
+
+# 预取窗口默认值与上限（帧数）
+DEFAULT_WINDOW = 4
+MAX_WINDOW = 32
+
+
+def encode_stream_frame(meta: Dict[str, Any], payload: bytes) -> bytes:
+    """打包一条二进制帧消息"""
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    return STREAM_MAGIC + struct.pack("<I", len(meta_bytes)) + meta_bytes + payload
+
+
+def _read_frame(source: Path, level: Optional[int]) -> bytes:
+    """读取帧的二进制缓存（level 为 None 时为全分辨率）"""
+    cache = get_frame_cache()
+    path = cache.get_binary_frame(source) if level is None else get_lod_frame(cache, source, level)
+    return path.read_bytes()
+
+
+def _resolve_folder(folder: str) -> Optional[Path]:
+    """解析数据根目录下的文件夹（不存在或越界时返回 None）"""
+    data_root = get_vtk_config().data_root.resolve()
+    folder_path = (data_root / folder).resolve()
+    if data_root not in folder_path.parents or not folder_path.is_dir():
+        return None
+    return folder_path
+
+
+class FrameStreamSession:
+    """单个客户端的推流会话"""
+
+    def __init__(self, client_id: str):
+        self.client_id = client_id
+        self.folder = ""
+        self.frames: List[Tuple[int, Path]] = []
+        self.window = DEFAULT_WINDOW
+        self.lod: Optional[int] = None
+        self.loop = False
+        self.play_head = 0
+        self.generation = 0
+        self.task: Optional[asyncio.Task] = None
+        self._advanced = asyncio.Event()
+
+    async def handle(self, data: Dict[str, Any]) -> None:
+        """处理一条客户端消息"""
+        msg_type = data.get("type")
+        if msg_type == "subscribe":
+            await self.subscribe(data)
+        elif msg_type == "seek":
+            self.seek(int(data.get("index", 0)))
+        elif msg_type == "position":
+            self.play_head = int(data.get("index", self.play_head))
+            self._advanced.set()
+        elif msg_type == "window":
+            self.window = max(1, min(MAX_WINDOW, int(data.get("size", DEFAULT_WINDOW))))
+            self._advanced.set()
+        elif msg_type == "stop":
+            self.cancel()
+        elif msg_type == "ping":
+            await manager.send_json({"type": "pong"}, self.client_id)
+        else:
+            await manager.send_json({"type": "stream_error", "message": f"未知消息类型: {msg_type}"}, self.client_id)
+
+    async def subscribe(self, data: Dict[str, Any]) -> None:
+        """订阅时间序列文件夹"""
+        folder = str(data.get("folder", ""))
+        lod = data.get("lod")
+        if lod is not None and (isinstance(lod, bool) or not isinstance(lod, int) or lod < 0):
+            await manager.send_json({"type": "stream_error", "message": f"无效的 LOD 级别: {lod}"}, self.client_id)
+            return
+        folder_path = await run_io(_resolve_folder, folder)
+        if folder_path is None:
+            await manager.send_json({"type": "stream_error", "message": f"文件夹不存在: {folder}"}, self.client_id)
+            return
+
+        self.folder = folder
+        self.frames = await run_io(list_series_frames, folder_path)
+        self.window = max(1, min(MAX_WINDOW, int(data.get("window", DEFAULT_WINDOW))))
+        self.lod = lod
+        self.loop = bool(data.get("loop", False))
+
+        await manager.send_json({
+            "type": "stream_info",
+            "folder": folder,
+            "window": self.window,
+            "frames": [
+                {"index": i, "name": f"{folder}/{source.name}", "time_step": time_step}
+                for i, (time_step, source) in enumerate(self.frames)
+            ]
+        }, self.client_id)
+        logger.info(f"[VTK推流] {self.client_id} 订阅 {folder}: {len(self.frames)} 帧, 窗口 {self.window}")
+
+        if self.frames:
+            self.seek(int(data.get("start", 0)))
+
+    def seek(self, index: int) -> None:
+        """从 index 重新开始推送（取消在途推送）"""
+        if not self.frames:
+            return
+        self.cancel()
+        self.generation += 1
+        self.play_head = max(0, min(index, len(self.frames) - 1))
+        self.task = asyncio.create_task(self._push(self.play_head, self.generation))
+
+    def cancel(self) -> None:
+        """取消在途推送"""
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.task = None
+
+    def _distance(self, index: int) -> int:
+        """index 在播放顺序上领先播放头的帧数"""
+        distance = index - self.play_head
+        if self.loop and distance < 0:
+            distance += len(self.frames)
+        return distance
+
+    async def _push(self, start: int, generation: int) -> None:
+        """按播放顺序推送帧，领先播放头超过 window 时等待"""
+        count = len(self.frames)
+        order = list(range(start, count))
+        if self.loop:
+            order += list(range(0, start))
+
+        try:
+            for index in order:
+                while self._distance(index) >= self.window:
+                    self._advanced.clear()
+                    await self._advanced.wait()
+                if self._distance(index) < 0:
+                    # 播放头已越过该帧（客户端从 HTTP 自行加载了），跳过
+                    continue
+
+                time_step, source = self.frames[index]
+                levels = ([self.lod] if self.lod is not None else []) + [None]
+                for level in levels:
+                    payload = await run_io(_read_frame, source, level)
+                    meta = {
+                        "index": index,
+                        "name": f"{self.folder}/{source.name}",
+                        "time_step": time_step,
+                        "level": level,
+                        "generation": generation,
+                    }
+                    await manager.send_bytes(encode_stream_frame(meta, payload), self.client_id)
+
+            await manager.send_json({"type": "stream_end", "generation": generation}, self.client_id)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[VTK推流] 推送失败: {e}")
+            await manager.send_json({"type": "stream_error", "message": str(e)}, self.client_id)
@@ -0,0 +1,53 @@
+"""
+ML 推理模块
+
+替代远程 ONNX 推理服务，在进程内完成性能预测：
+- 配置：模型目录、ONNX 后端开关
+- 特征：按名称把成分 / 工艺参数 / 结构设计映射为模型输入，缺少时取清单默认值
+- 模型：清单 + npz 参数，MLP 与梯度提升树为纯 NumPy 前向计算，ONNX 模型经可选的 onnxruntime 推理
+- 注册表：启动时一次性加载模型目录，按性能指标索引，单点与批量预测
+- 导出：由原始数组或 sklearn 模型写出清单与参数文件
+"""
+
+from .config import MLConfig, get_ml_config
+from .features import FEATURES, build_features
+from .models import (
+    MODEL_KINDS,
+    ONNX_AVAILABLE,
+    MLPModel,
+    GBDTModel,
+    OnnxModel,
+    LoadedModel,
+    load_model,
+)
+from .registry import ModelRegistry, get_model_registry
+from .export import save_mlp, save_gbdt, sklearn_mlp, sklearn_gbdt
+
+__all__ = [
+    # 配置
+    "MLConfig",
+    "get_ml_config",
+
+    # 特征
+    "FEATURES",
+    "build_features",
+
+    # 模型
+    "MODEL_KINDS",
+    "ONNX_AVAILABLE",
+    "MLPModel",
+    "GBDTModel",
+    "OnnxModel",
+    "LoadedModel",
+    "load_model",
+
+    # 注册表
+    "ModelRegistry",
+    "get_model_registry",
+
+    # 导出
+    "save_mlp",
+    "save_gbdt",
+    "sklearn_mlp",
+    "sklearn_gbdt",
+]
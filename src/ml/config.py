@@ -0,0 +1,45 @@
+"""
+ML 模块配置
+
+从环境变量加载本地模型目录与推理后端选项
+"""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from functools import lru_cache
+
+
+# 项目根目录
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+@dataclass
+class MLConfig:
+    """
+    ML 配置类
+
+    属性:
+        models_dir: 模型目录（每个模型一个清单 {name}.json 及其参数文件，见 models.py）
+        onnx_enabled: 是否用 onnxruntime 加载 ONNX 模型（未安装 onnxruntime 时自动跳过）
+        onnx_threads: onnxruntime 单次推理的线程数（小模型单线程延迟最低）
+    """
+    models_dir: Path = field(
+        default_factory=lambda: Path(os.getenv("ML_MODELS_DIR", str(PROJECT_ROOT / "ml_models")))
+    )
+    onnx_enabled: bool = field(
+        default_factory=lambda: os.getenv("ML_ONNX", "true").lower() in ("1", "true", "yes")
+    )
+    onnx_threads: int = field(
+        default_factory=lambda: int(os.getenv("ML_ONNX_THREADS", "1"))
+    )
+
+
+@lru_cache()
+def get_ml_config() -> MLConfig:
+    """
+    获取 ML 配置单例
+
+    返回:
+        MLConfig: ML 配置实例
+    """
+    return MLConfig()
@@ -0,0 +1,125 @@
+"""
+模型导出
+
+把训练好的模型写成 models.py 描述的清单 + npz 参数文件，放入模型目录即可被注册表加载：
+- save_mlp / save_gbdt：由原始数组写出
+- sklearn_mlp / sklearn_gbdt：从 sklearn 的 MLPRegressor / GradientBoostingRegressor 取出参数
+  （只读取拟合后的属性，本模块不依赖 sklearn）
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+def _write_manifest(models_dir: Path, name: str, manifest: Dict[str, Any]) -> Path:
+    path = Path(models_dir) / f"{name}.json"
+    path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def save_mlp(
+    models_dir: Path,
+    name: str,
+    prop: str,
+    features: Sequence[str],
+    weights: Sequence[np.ndarray],
+    biases: Sequence[np.ndarray],
+    activation: str = "relu",
+    **manifest: Any,
+) -> Path:
+    """
+    写出 MLP 模型
+
+    Args:
+        models_dir: 模型目录
+        name: 模型名（文件名）
+        prop: 预测的性能指标
+        features: 输入特征名
+        weights: 各层权重，形状为 (输入, 输出)
+        biases: 各层偏置
+        activation: 隐藏层激活函数
+        manifest: 其余清单字段（defaults / x_mean / x_scale / y_mean / y_scale / clip / version / unit ...）
+
+    Returns:
+        清单路径
+    """
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    arrays = {f"W{i}": np.asarray(w, dtype=np.float64) for i, w in enumerate(weights)}
+    arrays.update({f"b{i}": np.asarray(b, dtype=np.float64) for i, b in enumerate(biases)})
+    np.savez(models_dir / f"{name}.npz", **arrays)
+    return _write_manifest(models_dir, name, {
+        "name": name, "property": prop, "kind": "mlp", "file": f"{name}.npz",
+        "features": list(features), "activation": activation, **manifest,
+    })
+
+
+def save_gbdt(
+    models_dir: Path,
+    name: str,
+    prop: str,
+    features: Sequence[str],
+    trees: Sequence[Dict[str, np.ndarray]],
+    learning_rate: float = 1.0,
+    base_score: float = 0.0,
+    split: str = "le",
+    **manifest: Any,
+) -> Path:
+    """
+    写出梯度提升树模型
+
+    Args:
+        trees: 每棵树 {"feature", "threshold", "left", "right", "value"}，节点数可不同，
+            叶节点 feature 为负数；写出时补齐到最大节点数
+        learning_rate: 学习率（各树叶节点值之和的系数）
+        base_score: 初始预测值
+        split: "le"（x <= 阈值走左子树，sklearn）或 "lt"（x < 阈值，XGBoost/LightGBM）
+        其余参数同 save_mlp
+
+    Returns:
+        清单路径
+    """
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    n_nodes = max(len(tree["feature"]) for tree in trees)
+    padded: Dict[str, List[np.ndarray]] = {key: [] for key in ("feature", "threshold", "left", "right", "value")}
+    for tree in trees:
+        pad = n_nodes - len(tree["feature"])
+        feature = np.asarray(tree["feature"], dtype=np.int32)
+        padded["feature"].append(np.pad(np.where(feature < 0, -1, feature), (0, pad), constant_values=-1))
+        for key, dtype in (("threshold", np.float64), ("left", np.int32), ("right", np.int32), ("value", np.float64)):
+            padded[key].append(np.pad(np.asarray(tree[key], dtype=dtype).reshape(-1), (0, pad)))
+    np.savez(models_dir / f"{name}.npz", **{key: np.stack(rows) for key, rows in padded.items()})
+    return _write_manifest(models_dir, name, {
+        "name": name, "property": prop, "kind": "gbdt", "file": f"{name}.npz", "features": list(features),
+        "learning_rate": float(learning_rate), "base_score": float(base_score), "split": split, **manifest,
+    })
+
+
+def sklearn_mlp(estimator: Any) -> Dict[str, Any]:
+    """MLPRegressor -> save_mlp 的 weights / biases / activation 参数"""
+    return {
+        "weights": list(estimator.coefs_),
+        "biases": list(estimator.intercepts_),
+        "activation": estimator.activation,
+    }
+
+
+def sklearn_gbdt(estimator: Any) -> Dict[str, Any]:
+    """GradientBoostingRegressor（平方误差损失）-> save_gbdt 的 trees / learning_rate / base_score 参数"""
+    trees = []
+    for regressor in np.ravel(estimator.estimators_):
+        tree = regressor.tree_
+        leaf = tree.children_left < 0
+        trees.append({
+            "feature": np.where(leaf, -1, tree.feature),
+            "threshold": tree.threshold,
+            "left": np.where(leaf, 0, tree.children_left),
+            "right": np.where(leaf, 0, tree.children_right),
+            "value": tree.value.reshape(tree.node_count, -1)[:, 0],
+        })
+    init = estimator.init_
+    base_score = 0.0 if init == "zero" else float(np.ravel(init.constant_)[0])
+    return {"trees": trees, "learning_rate": estimator.learning_rate, "base_score": base_score}
@@ -0,0 +1,98 @@
+"""
+特征提取
+
+模型清单的 features 按名称列出输入特征，这里把配方（成分、工艺参数、结构设计）映射为特征值。
+配方缺少某特征时取清单 defaults 中的值，仍缺少则报错（不静默填 0）。
+"""
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+
+def _percent(key: str) -> Callable[[Dict, Dict, Dict], Optional[float]]:
+    return lambda composition, params, structure: composition.get(key)
+
+
+def _fraction(key: str) -> Callable[[Dict, Dict, Dict], Optional[float]]:
+    def getter(composition: Dict, params: Dict, structure: Dict) -> Optional[float]:
+        value = composition.get(key)
+        return None if value is None else value / 100.0
+    return getter
+
+
+def _al_ratio(composition: Dict, params: Dict, structure: Dict) -> Optional[float]:
+    al, ti = composition.get("al_content"), composition.get("ti_content")
+    if al is None or ti is None or al + ti <= 0:
+        return None
+    return al / (al + ti)
+
+
+def _param(key: str) -> Callable[[Dict, Dict, Dict], Optional[float]]:
+    return lambda composition, params, structure: params.get(key)
+
+
+def _structure(key: str) -> Callable[[Dict, Dict, Dict], Optional[float]]:
+    return lambda composition, params, structure: structure.get(key)
+
+
+# 特征名 -> 取值函数 (成分, 工艺参数, 结构设计)
+FEATURES: Dict[str, Callable[[Dict, Dict, Dict], Optional[float]]] = {
+    # 成分（原子百分比）
+    "al_content": _percent("al_content"),
+    "ti_content": _percent("ti_content"),
+    "n_content": _percent("n_content"),
+    # 成分（分数，与原远程硬度模型的 al / ti / N 输入一致）
+    "al": _fraction("al_content"),
+    "ti": _fraction("ti_content"),
+    "N": _fraction("n_content"),
+    # 金属亚晶格上的 Al 分数 Al / (Al + Ti)
+    "al_ratio": _al_ratio,
+    # 工艺参数
+    "deposition_temperature": _param("deposition_temperature"),
+    "temperature": _param("deposition_temperature"),
+    "deposition_time": _param("deposition_time"),
+    "time": _param("deposition_time"),
+    "deposition_pressure": _param("deposition_pressure"),
+    "bias_voltage": _param("bias_voltage"),
+    # 结构设计
+    "total_thickness": _structure("total_thickness"),
+}
+
+
+def build_features(
+    names: Sequence[str],
+    composition: Dict[str, Any],
+    params: Dict[str, Any],
+    structure: Optional[Dict[str, Any]] = None,
+    defaults: Optional[Dict[str, float]] = None,
+) -> np.ndarray:
+    """
+    按特征名构造输入向量
+
+    Args:
+        names: 特征名（顺序即模型输入顺序）
+        composition: 涂层成分
+        params: 工艺参数
+        structure: 结构设计
+        defaults: 配方缺少特征时的取值
+
+    Returns:
+        形状为 (特征数,) 的 float64 数组
+
+    Raises:
+        ValueError: 未知特征，或配方与 defaults 都没有该特征的取值
+    """
+    structure = structure or {}
+    defaults = defaults or {}
+    values = []
+    for name in names:
+        getter = FEATURES.get(name)
+        if getter is None:
+            raise ValueError(f"未知特征: {name}，可选 {', '.join(FEATURES)}")
+        value = getter(composition, params, structure)
+        if value is None:
+            value = defaults.get(name)
+        if value is None:
+            raise ValueError(f"配方缺少特征 {name}")
+        values.append(float(value))
+    return np.array(values, dtype=np.float64)
@@ -0,0 +1,303 @@
+"""
+模型格式与前向计算
+
+模型目录中每个模型一个清单 {name}.json，参数文件与清单放在同一目录：
+
+    {
+      "name": "hardness_mlp",            # 模型名（缺省为文件名）
+      "property": "hardness",            # 预测的性能指标（hardness / elastic_modulus / adhesion_strength / wear_rate ...）
+      "kind": "mlp",                     # mlp / gbdt / onnx
+      "file": "hardness_mlp.npz",        # 参数文件
+      "features": ["al", "ti", "N", "time", "temperature"],   # 输入特征（见 features.FEATURES）
+      "defaults": {"time": 150.0},       # 配方缺少特征时的取值（可选）
+      "x_mean": [...], "x_scale": [...], # 输入标准化 (x - mean) / scale（可选）
+      "y_mean": 0.0, "y_scale": 1.0,     # 输出反标准化 y * scale + mean（可选）
+      "target_transform": "log10",       # 模型输出为 log10(y) 时（可选）
+      "clip": [min, max],                # 输出截断（可选）
+      "version": "1", "unit": "GPa"      # 元数据（可选）
+    }
+
+各类模型的参数：
+- mlp：npz 中 W0, b0, W1, b1, ...（W 形状为 (输入, 输出)，同 sklearn MLPRegressor 的 coefs_），
+  清单 activation 为隐藏层激活（relu / tanh / logistic / identity），输出层为线性
+- gbdt：npz 中 feature, threshold, left, right, value 均为 (树数, 最大节点数) 的数组，叶节点 feature 为 -1；
+  x[feature] <= threshold 走左子树（清单 split 为 "lt" 时为 <，对应 XGBoost/LightGBM 导出），
+  预测 = base_score + learning_rate × Σ 各树叶节点值（清单字段）
+- onnx：.onnx 文件经 onnxruntime 推理（可选依赖）；模型只有一个输入时输入 (n, 特征数) 的 float32 矩阵，
+  有多个输入时按特征名逐个输入 (n, 1)，取第一个输出
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import onnxruntime
+    ONNX_AVAILABLE = True
+except ImportError:
+    onnxruntime = None
+    ONNX_AVAILABLE = False
+
+
+# 模型类型
+MODEL_KINDS = ("mlp", "gbdt", "onnx")
+
+# 隐藏层激活函数
+ACTIVATIONS = {
+    "relu": lambda h: np.maximum(h, 0.0),
+    "tanh": np.tanh,
+    "logistic": lambda h: 1.0 / (1.0 + np.exp(-h)),
+    "identity": lambda h: h,
+}
+
+
+class MLPModel:
+    """全连接网络（隐藏层激活 + 线性输出）"""
+
+    def __init__(self, weights: List[np.ndarray], biases: List[np.ndarray], activation: str = "relu"):
+        if not weights or len(weights) != len(biases):
+            raise ValueError("MLP 权重与偏置层数不一致")
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"不支持的激活函数: {activation}，可选 {' / '.join(ACTIVATIONS)}")
+        for i in range(1, len(weights)):
+            if weights[i].shape[0] != weights[i - 1].shape[1]:
+                raise ValueError(f"MLP 第 {i} 层输入维度 {weights[i].shape[0]} 与上一层输出 {weights[i - 1].shape[1]} 不一致")
+        self.weights = [np.ascontiguousarray(w, dtype=np.float64) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float64).reshape(-1) for b in biases]
+        self.activation = ACTIVATIONS[activation]
+        self.n_features = self.weights[0].shape[0]
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """x 形状为 (n, 特征数)，返回 (n,)"""
+        h = x
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            h = h @ w + b
+            if i < last:
+                h = self.activation(h)
+        return h[:, 0]
+
+
+class GBDTModel:
+    """梯度提升树（所有树按层同时下降，向量化求值）"""
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        learning_rate: float = 1.0,
+        base_score: float = 0.0,
+        split: str = "le",
+    ):
+        if split not in ("le", "lt"):
+            raise ValueError(f"不支持的分裂方式: {split}，可选 le / lt")
+        self.feature = np.asarray(feature, dtype=np.int64)
+        shape = self.feature.shape
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        self.value = np.asarray(value, dtype=np.float64)
+        if any(a.shape != shape for a in (self.threshold, self.left, self.right, self.value)) or len(shape) != 2:
+            raise ValueError("GBDT 数组形状需一致，均为 (树数, 最大节点数)")
+        self.learning_rate = float(learning_rate)
+        self.base_score = float(base_score)
+        self.split = split
+        self.n_features = int(self.feature.max()) + 1 if (self.feature >= 0).any() else 0
+        self.depth = self._max_depth()
+
+    def _max_depth(self) -> int:
+        """最大树深（求值时的下降次数）；子节点越界或成环时报错"""
+        n_nodes = self.feature.shape[1]
+        deepest = 0
+        for t in range(self.feature.shape[0]):
+            stack = [(0, 0)]
+            while stack:
+                node, depth = stack.pop()
+                if depth > n_nodes:
+                    raise ValueError("GBDT 树结构成环")
+                if self.feature[t, node] < 0:
+                    deepest = max(deepest, depth)
+                    continue
+                for child in (int(self.left[t, node]), int(self.right[t, node])):
+                    if not 0 <= child < n_nodes:
+                        raise ValueError("GBDT 子节点序号越界")
+                    stack.append((child, depth + 1))
+        return deepest
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """x 形状为 (n, 特征数)，返回 (n,)"""
+        n = len(x)
+        n_trees = self.feature.shape[0]
+        trees = np.broadcast_to(np.arange(n_trees), (n, n_trees))
+        node = np.zeros((n, n_trees), dtype=np.int64)
+        for _ in range(self.depth):
+            feature = self.feature[trees, node]
+            leaf = feature < 0
+            values = np.take_along_axis(x, np.where(leaf, 0, feature), axis=1)
+            threshold = self.threshold[trees, node]
+            go_left = values < threshold if self.split == "lt" else values <= threshold
+            child = np.where(go_left, self.left[trees, node], self.right[trees, node])
+            node = np.where(leaf, node, child)
+        return self.base_score + self.learning_rate * self.value[trees, node].sum(axis=1)
+
+
+class OnnxModel:
+    """onnxruntime 推理会话"""
+
+    def __init__(self, path: Path, features: List[str], threads: int = 1):
+        if not ONNX_AVAILABLE:
+            raise ValueError("未安装 onnxruntime，无法加载 ONNX 模型")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.inputs = [i.name for i in self.session.get_inputs()]
+        self.output = self.session.get_outputs()[0].name
+        self.features = list(features)
+        if len(self.inputs) > 1 and set(self.inputs) != set(self.features):
+            raise ValueError(f"ONNX 模型输入 {self.inputs} 与清单特征 {self.features} 不一致")
+        self.n_features = len(self.features)
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """x 形状为 (n, 特征数)，返回 (n,)"""
+        x = x.astype(np.float32)
+        if len(self.inputs) == 1:
+            feed = {self.inputs[0]: x}
+        else:
+            feed = {name: x[:, [self.features.index(name)]] for name in self.inputs}
+        output = self.session.run([self.output], feed)[0]
+        return np.asarray(output, dtype=np.float64).reshape(len(x), -1)[:, 0]
+
+
+@dataclass
+class LoadedModel:
+    """已加载的模型：清单元数据 + 前向计算对象"""
+    name: str
+    property: str
+    kind: str
+    features: List[str]
+    model: Any
+    defaults: Dict[str, float] = field(default_factory=dict)
+    x_mean: Optional[np.ndarray] = None
+    x_scale: Optional[np.ndarray] = None
+    y_mean: float = 0.0
+    y_scale: float = 1.0
+    target_transform: Optional[str] = None
+    clip: Optional[Tuple[float, float]] = None
+    version: Optional[str] = None
+    unit: Optional[str] = None
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """
+        批量预测
+
+        Args:
+            x: 形状为 (n, 特征数) 的原始特征（未标准化）
+
+        Returns:
+            形状为 (n,) 的预测值（已反标准化、变换与截断）
+        """
+        if self.x_mean is not None:
+            x = (x - self.x_mean) / self.x_scale
+        y = self.model.predict(x) * self.y_scale + self.y_mean
+        if self.target_transform == "log10":
+            y = np.power(10.0, y)
+        if self.clip is not None:
+            y = np.clip(y, *self.clip)
+        return y
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "property": self.property,
+            "kind": self.kind,
+            "features": self.features,
+            "version": self.version,
+            "unit": self.unit,
+        }
+
+
+def _load_arrays(path: Path) -> Dict[str, np.ndarray]:
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+def load_model(manifest_path: Path, onnx_enabled: bool = True, onnx_threads: int = 1) -> LoadedModel:
+    """
+    按清单加载模型
+
+    Args:
+        manifest_path: 清单文件 {name}.json
+        onnx_enabled: 是否加载 ONNX 模型
+        onnx_threads: onnxruntime 线程数
+
+    Raises:
+        ValueError: 清单字段缺失或不一致、参数文件格式错误、ONNX 未启用或不可用
+        OSError: 参数文件读取失败
+    """
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    kind = manifest.get("kind")
+    if kind not in MODEL_KINDS:
+        raise ValueError(f"不支持的模型类型: {kind}，可选 {' / '.join(MODEL_KINDS)}")
+    for key in ("property", "file", "features"):
+        if not manifest.get(key):
+            raise ValueError(f"模型清单缺少 {key}")
+    features = list(manifest["features"])
+    path = manifest_path.parent / manifest["file"]
+
+    if kind == "mlp":
+        arrays = _load_arrays(path)
+        layers = sum(1 for key in arrays if key.startswith("W"))
+        model = MLPModel(
+            [arrays[f"W{i}"] for i in range(layers)],
+            [arrays[f"b{i}"] for i in range(layers)],
+            manifest.get("activation", "relu"),
+        )
+    elif kind == "gbdt":
+        arrays = _load_arrays(path)
+        model = GBDTModel(
+            arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"], arrays["value"],
+            manifest.get("learning_rate", 1.0), manifest.get("base_score", 0.0), manifest.get("split", "le"),
+        )
+    else:
+        if not onnx_enabled:
+            raise ValueError("ONNX 模型已禁用（ML_ONNX=false）")
+        model = OnnxModel(path, features, onnx_threads)
+
+    # MLP / ONNX 的输入维度固定，需与清单一致；树模型可能用不到末尾的特征
+    if isinstance(model, GBDTModel):
+        if model.n_features > len(features):
+            raise ValueError(f"模型需要 {model.n_features} 个特征，清单只列出 {len(features)} 个")
+    elif model.n_features != len(features):
+        raise ValueError(f"模型输入为 {model.n_features} 个特征，清单列出 {len(features)} 个")
+    x_mean = manifest.get("x_mean")
+    x_scale = manifest.get("x_scale")
+    if (x_mean is None) != (x_scale is None):
+        raise ValueError("x_mean 与 x_scale 需同时给出")
+    if x_mean is not None and not len(x_mean) == len(x_scale) == len(features):
+        raise ValueError("x_mean / x_scale 长度需与特征数一致")
+    transform = manifest.get("target_transform")
+    if transform not in (None, "log10"):
+        raise ValueError(f"不支持的输出变换: {transform}")
+    clip = manifest.get("clip")
+    return LoadedModel(
+        name=manifest.get("name") or manifest_path.stem,
+        property=manifest["property"],
+        kind=kind,
+        features=features,
+        model=model,
+        defaults={k: float(v) for k, v in (manifest.get("defaults") or {}).items()},
+        x_mean=np.asarray(x_mean, dtype=np.float64) if x_mean is not None else None,
+        x_scale=np.asarray(x_scale, dtype=np.float64) if x_scale is not None else None,
+        y_mean=float(manifest.get("y_mean", 0.0)),
+        y_scale=float(manifest.get("y_scale", 1.0)),
+        target_transform=transform,
+        clip=(float(clip[0]), float(clip[1])) if clip else None,
+        version=str(manifest["version"]) if manifest.get("version") is not None else None,
+        unit=manifest.get("unit"),
+    )
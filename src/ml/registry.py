@@ -0,0 +1,129 @@
+"""
+本地模型注册表
+
+启动时扫描模型目录中的清单，一次性加载全部模型，按性能指标索引；
+预测在进程内完成（NumPy 前向计算或 onnxruntime），不依赖网络。
+同一指标有多个模型时保留按文件名排序的第一个，其余记录为冲突。
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .config import get_ml_config
+from .features import build_features
+from .models import ONNX_AVAILABLE, LoadedModel, load_model
+
+
+class ModelRegistry:
+    """性能指标 -> 已加载模型"""
+
+    def __init__(self, models_dir: Path, onnx_enabled: bool = True, onnx_threads: int = 1):
+        self.models_dir = Path(models_dir)
+        self.onnx_enabled = onnx_enabled
+        self.onnx_threads = onnx_threads
+        self.models: Dict[str, LoadedModel] = {}
+        self.errors: Dict[str, str] = {}
+        self.load()
+
+    def load(self) -> int:
+        """
+        （重新）加载模型目录中的全部清单
+
+        Returns:
+            加载成功的模型数
+        """
+        models: Dict[str, LoadedModel] = {}
+        errors: Dict[str, str] = {}
+        if not self.models_dir.is_dir():
+            logger.warning(f"[ML模型] 模型目录不存在: {self.models_dir}，全部指标使用经验公式")
+        else:
+            for manifest in sorted(self.models_dir.glob("*.json")):
+                try:
+                    model = load_model(manifest, self.onnx_enabled, self.onnx_threads)
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    errors[manifest.name] = str(e)
+                    logger.warning(f"[ML模型] 加载 {manifest.name} 失败: {e}")
+                    continue
+                if model.property in models:
+                    errors[manifest.name] = f"指标 {model.property} 已由 {models[model.property].name} 提供"
+                    logger.warning(f"[ML模型] {manifest.name} 与 {models[model.property].name} 预测同一指标，已忽略")
+                    continue
+                models[model.property] = model
+        self.models, self.errors = models, errors
+        if models:
+            logger.info(
+                "[ML模型] 已加载 " + ", ".join(f"{p}={m.name}({m.kind})" for p, m in sorted(models.items()))
+            )
+        return len(models)
+
+    def get(self, prop: str) -> Optional[LoadedModel]:
+        """某指标的模型（未加载时为 None）"""
+        return self.models.get(prop)
+
+    def predict(
+        self,
+        prop: str,
+        composition: Dict[str, Any],
+        params: Dict[str, Any],
+        structure: Optional[Dict[str, Any]] = None,
+    ) -> Optional[float]:
+        """
+        单个配方的预测
+
+        Returns:
+            预测值；该指标没有模型时为 None
+
+        Raises:
+            ValueError: 配方缺少模型需要的特征
+        """
+        model = self.models.get(prop)
+        if model is None:
+            return None
+        x = build_features(model.features, composition, params, structure, model.defaults)
+        return float(model.predict(x[None, :])[0])
+
+    def predict_many(
+        self, prop: str, recipes: Sequence[Tuple[Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]]
+    ) -> Optional[np.ndarray]:
+        """
+        一批配方的预测（一次前向计算）
+
+        Args:
+            prop: 性能指标
+            recipes: [(成分, 工艺参数, 结构设计), ...]
+
+        Returns:
+            形状为 (配方数,) 的预测值；该指标没有模型时为 None
+        """
+        model = self.models.get(prop)
+        if model is None:
+            return None
+        x = np.stack([build_features(model.features, c, p, s, model.defaults) for c, p, s in recipes])
+        return model.predict(x)
+
+    def status(self) -> Dict[str, Any]:
+        """模型目录、各指标模型与加载失败的清单"""
+        return {
+            "models_dir": str(self.models_dir),
+            "onnx": self.onnx_enabled and ONNX_AVAILABLE,
+            "models": [model.describe() for _, model in sorted(self.models.items())],
+            "errors": self.errors,
+        }
+
+    def properties(self) -> List[str]:
+        return sorted(self.models)
+
+
+@lru_cache()
+def get_model_registry() -> ModelRegistry:
+    """
+    获取模型注册表单例（首次调用时加载模型目录）
+
+    返回:
+        ModelRegistry: 注册表实例
+    """
+    config = get_ml_config()
+    return ModelRegistry(config.models_dir, config.onnx_enabled, config.onnx_threads)
@@ -276,6 +276,18 @@ class CoatingService:
         else:
             structure_str += f" - 总厚度: {structure.get('total_thickness', 0)} μm"
         
+        # 构建模拟场微观结构统计显示（来自 src/vtk/analytics.py）
+        microstructure = topphi.get('microstructure') or {}
+        microstructure_str = '- 模拟场统计: 无'
+        if microstructure.get('mean_wavelength'):
+            microstructure_str = (
+                f"- 调幅波长（谱一阶矩/谱峰）: {microstructure['mean_wavelength']:.2f} / "
+                f"{microstructure['peak_wavelength']:.2f} (VTK长度单位)\n"
+                f"- 富相体积分数: {microstructure['volume_fraction']['rich']:.3f}\n"
+                f"- 比界面面积: {microstructure['specific_interface_area']:.4f} (1/VTK长度单位)\n"
+                f"- 统计帧: {microstructure.get('frame', 'N/A')}"
+            )
+        
         # 构建完整的分析提示词
         prompt = f"""
 作为涂层材料专家，请基于以下完整数据进行深入的根因分析：
@@ -298,10 +310,10 @@ class CoatingService:
 {structure_str}
 
 ## 4. TopPhi微观结构预测
-- 晶粒尺寸: {topphi.get('grain_size_nm', 0)} nm
-- 择优取向: {topphi.get('preferred_orientation', 'N/A')}
-- 残余应力: {topphi.get('residual_stress_gpa', 0)} GPa
+- 富相畴尺寸: {topphi.get('domain_size_nm', 'N/A')} nm
+- 调幅波长: {topphi.get('modulation_wavelength_nm', 'N/A')} nm
 - 晶格常数: {topphi.get('lattice_constant', 'N/A')} Å
+{microstructure_str}
 
 ## 5. ML性能预测
 - 预测纳米硬度: {ml_pred.get('hardness', 0)} GPa
@@ -1,18 +1,24 @@
 """
 ML模型预测服务 - 基于机器学习模型的性能预测
+
+各指标优先使用本地模型注册表（src/ml）中的模型在进程内推理，
+没有对应模型或配方缺少模型需要的特征时回退到经验公式；结果中 model_sources 注明每个指标的来源。
 """
-from typing import Dict, Any
-import time
+from typing import Dict, Any, Optional
 from loguru import logger
-import httpx
 
+from ..ml import get_model_registry
+
+
+# 由模型注册表预测的核心指标（与实验数据字段一致）
+MODEL_PROPERTIES = ("hardness", "elastic_modulus", "adhesion_strength", "wear_rate")
 
 
 class MLPredictionService:
     """ML模型预测服务 - 性能预测"""
     
     def __init__(self):
-        self.model_cache = {}  # TODO: 加载预训练模型
+        self.registry = get_model_registry()
     
     def predict_performance(
         self, 
@@ -34,47 +40,70 @@ class MLPredictionService:
         logger.info(f"[ML预测] 开始 - Al={composition.get('al_content')}%, Ti={composition.get('ti_content')}%")
         logger.info(f"[ML预测] 温度={params.get('deposition_temperature')}°C")
         
-        # 模拟预测计算时间
-        time.sleep(3)
-        
-        # TODO: 接入MCP工具 - ML预测服务
-        # mcp_result = await call_mcp_tool("ml_predict", {
-        #     "composition": composition,
-        #     "params": params,
-        #     "structure": structure
-        # })
-        
-        # 当前使用示例数据模拟
         # 注意：核心性能指标与实验数据录入保持一致，便于前端统一展示
-        predicted_hardness = None
-        try:
-            predicted_hardness = self._predict_hardness_via_onnx(composition, params)
-        except Exception as e:
-            logger.error(f"[ML预测] 硬度ONNX接口调用异常: {str(e)}")
+        predicted = {}
+        sources = {}
+        for prop in MODEL_PROPERTIES:
+            value = self._predict_with_model(prop, composition, params, structure)
+            if value is not None:
+                predicted[prop] = value
+                sources[prop] = self.registry.get(prop).name
+            else:
+                sources[prop] = "formula"
+        
+        predicted_hardness = predicted.get("hardness")
         if predicted_hardness is None:
             predicted_hardness = self._predict_hardness(composition, params)
-        predicted_elastic_modulus = self._predict_elastic_modulus(predicted_hardness)
+        predicted_elastic_modulus = predicted.get("elastic_modulus")
+        if predicted_elastic_modulus is None:
+            predicted_elastic_modulus = self._predict_elastic_modulus(predicted_hardness)
+        wear_rate = predicted.get("wear_rate")
+        if wear_rate is None:
+            wear_rate = self._predict_wear_rate(composition)
+        adhesion_strength = predicted.get("adhesion_strength")
+        if adhesion_strength is None:
+            adhesion_strength = self._predict_adhesion_strength(composition, structure)
         predicted_oxidation = self._predict_oxidation_temp(composition)
         
         ml_prediction = {
             # 4 个核心性能指标
             "hardness": predicted_hardness,
             "elastic_modulus": predicted_elastic_modulus,
-            "wear_rate": self._predict_wear_rate(composition),
-            "adhesion_strength": self._predict_adhesion_strength(composition, structure),
+            "wear_rate": wear_rate,
+            "adhesion_strength": adhesion_strength,
             
             # 可选附加指标（不纳入统一对比结构）
             "oxidation_temperature": predicted_oxidation,
             "surface_roughness": self._predict_surface_roughness(params),
             
             # 模型元数据
-            "model_confidence": 0.8500
+            "model_confidence": 0.8500,
+            "model_sources": sources
         }
         
-        logger.info(f"[ML预测] 完成 - 硬度: {predicted_hardness:.4f} GPa, 弹性模量: {predicted_elastic_modulus:.4f} GPa")
+        logger.info(
+            f"[ML预测] 完成 - 硬度: {predicted_hardness:.4f} GPa, 弹性模量: {predicted_elastic_modulus:.4f} GPa, "
+            f"来源: {sources}"
+        )
         
         return ml_prediction
     
+    def _predict_with_model(self, prop: str, composition: Dict, params: Dict, structure: Dict) -> Optional[float]:
+        """用注册表中的模型预测某指标（没有模型、输入不完整或推理出错时为 None）"""
+        try:
+            value = self.registry.predict(prop, composition, params, structure)
+        except ValueError as e:
+            logger.warning(f"[ML预测] {prop} 模型输入不完整，改用经验公式: {e}")
+            return None
+        except Exception as e:
+            # 推理后端错误（onnxruntime 异常、参数形状不匹配等）不影响整体预测
+            logger.error(f"[ML预测] {prop} 模型推理失败，改用经验公式: {type(e).__name__}: {e}")
+            return None
+        if value is None:
+            return None
+        # 保留 6 位有效数字（磨损率量级为 1e-6，不能按小数位取整）
+        return float(f"{value:.6g}")
+
     def _predict_hardness(self, composition: Dict, params: Dict) -> float:
         """预测硬度（简化模型）"""
         # 基础硬度
@@ -90,66 +119,6 @@ class MLPredictionService:
         
         return round(base_hardness * al_factor * temp_factor, 4)
 
-    def _predict_hardness_via_onnx(self, composition: Dict, params: Dict) -> float | None:
-        """通过ONNX推理服务预测硬度"""
-        al_content = (composition.get('al_content', 0) or 0) / 100.0
-        ti_content = (composition.get('ti_content', 0) or 0) / 100.0
-        n_content = (composition.get('n_content', 0) or 0) / 100.0
-
-        # time_value = float(params.get('deposition_time', 100.0) or 100.0)
-        # temperature = float(params.get('deposition_temperature', 500.0) or 500.0)
-        time_value = 150.0
-        temperature = 900.0
-
-        # time_value = max(0.0, min(time_value, 500.0))
-        # temperature = max(0.0, min(temperature, 1200.0))
-        logger.info(f"[ML预测参数]  Al: {al_content} , Ti: {ti_content} , N: {n_content}, 处理时间: {time_value} , 温度: {temperature} ")
-        url = "http://111.22.21.99:10002/models/70470382-7108-4f92-ad86-69b971f820cb/inference"
-        payload = {
-            "inputs": {
-                "ti": ti_content,
-                "al": al_content,
-                "N": n_content,
-                "time": time_value,
-                "temperature": temperature,
-            }
-        }
-
-        logger.info(f"[ML预测] 调用ONNX硬度预测服务: url={url}, payload={payload}")
-
-        try:
-            response = httpx.post(url, json=payload, timeout=5.0)
-        except Exception as e:
-            logger.error(f"[ML预测] ONNX服务请求失败: {str(e)}")
-            return None
-
-        if response.status_code != 200:
-            logger.error(f"[ML预测] ONNX服务返回错误状态码: {response.status_code}")
-            return None
-
-        try:
-            data = response.json()
-            outputs = data.get("outputs", {})
-            hardness_obj = outputs.get("hardness", {})
-            hardness_value = hardness_obj.get("value")
-        except Exception as e:
-            logger.error(f"[ML预测] 解析ONNX服务响应失败: {str(e)}")
-            return None
-
-        if hardness_value is None:
-            logger.error("[ML预测] ONNX服务响应中缺少硬度值")
-            return None
-
-        try:
-            hardness = float(hardness_value)
-        except (TypeError, ValueError) as e:
-            logger.error(f"[ML预测] 硬度值转换失败: {str(e)}")
-            return None
-
-        hardness = round(hardness, 4)
-        logger.info(f"[ML预测] ONNX硬度预测结果: {hardness:.4f}")
-        return hardness
-
     def _predict_elastic_modulus(self, hardness: float) -> float:
         """预测弹性模量（GPa） - 简化模型，与硬度相关联"""
         # 经验比值：弹性模量通常是硬度的若干倍
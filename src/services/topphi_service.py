@@ -1,237 +1,236 @@
 """
 TopPhi模拟服务 - 第一性原理沉积过程结构预测
+
+沉积后的调幅分解由本地 Cahn–Hilliard 求解器（src.simulation）计算，
+每次模拟输出一个 simulations/<key> 时间序列文件夹，布局与 TopPhi 相同。
+结果按归一化配方内容寻址缓存（src.simulation.cache），同一配方只计算一次。
+参数扫描（run_sweep）在进程池中批量模拟并汇总微观结构描述符（src.simulation.sweep）。
+参数空间中已有相近的模拟时，从其末帧热启动（src.simulation.warmstart），只演化剩余的步数。
+结果中的尺寸均由模拟场计算（调幅波长、富相畴尺寸），晶格常数按 Vegard 定律由成分给出；
+求解器不涉及的量（择优取向、残余应力、形成能）不再给出经验估计。
 """
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional
+import shutil
 import time
 from loguru import logger
-import os
 from pathlib import Path
-import base64
 
+from ..simulation import (
+    get_simulation_cache,
+    get_simulation_config,
+    convergence_criteria,
+    get_warm_start_index,
+    in_spinodal,
+    parameter_point,
+    resolve_recipe,
+    run_simulation,
+    run_sweep,
+)
+from ..simulation.phasefield import DEFAULT_TEMPERATURE
+from ..vtk import get_frame_cache, get_frame_stats, get_vtk_config, list_series_frames, summarize_stats
+
+
+# Vegard 定律端元晶格常数（Å）：岩盐结构 TiN 与立方 AlN
+TIN_LATTICE = 4.24
+CUBIC_ALN_LATTICE = 4.07
+
+# 模拟网格间距对应的物理长度（nm），把 VTK 长度单位换算为 nm
+GRID_SPACING_NM = 0.5
 
 
 class TopPhiService:
     """TopPhi模拟服务 - 沉积过程结构预测"""
     
     def __init__(self):
-        self.simulation_cache = {}  # TODO: 实现缓存机制
-        # VTK文件路径配置
-        self.project_root = Path(__file__).parent.parent.parent
-        self.mock_vtk_file = self.project_root / "conc-0.vtk"
+        self.simulation_cache = get_simulation_cache()
     
-    def simulate_deposition(self, composition: Dict, params: Dict) -> Dict[str, Any]:
+    def simulate_deposition(
+        self,
+        composition: Dict,
+        params: Dict,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         TopPhi模拟 - 预测沉积结构
         
         Args:
             composition: 涂层成分 {"al_content": float, "ti_content": float, "n_content": float}
             params: 工艺参数 {"deposition_temperature": float, "bias_voltage": float, ...}
+            progress: 进度回调（每输出一帧调用一次，抛出异常即中止模拟并删除本次输出）
         
         Returns:
             TopPhi模拟结果
         """
         logger.info(f"[TopPhi模拟] 开始 - Al={composition.get('al_content')}%, Ti={composition.get('ti_content')}%")
         
-        # 模拟计算时间
-        time.sleep(3)
-        
-        # 检查是否有时间序列数据
-        timeseries_folder = self.project_root / "涂层-调幅分解"
-        has_timeseries = timeseries_folder.exists() and timeseries_folder.is_dir()
+        # 同一配方（归一化 + 按仪器精度取整）直接返回缓存结果
+        start = time.perf_counter()
+        recipe, phase_params, key = resolve_recipe(composition, params)
+        cached = self.simulation_cache.get(key)
+        if cached is not None:
+            logger.info(f"[TopPhi模拟] 命中缓存 {key}（{(time.perf_counter() - start) * 1000:.1f} ms）")
+            return cached
+        
+        # 模拟与结果均基于归一化配方，保证与缓存键一致
+        composition, params = recipe["composition"], recipe["params"]
+        temperature = params.get("deposition_temperature") or DEFAULT_TEMPERATURE
+        # 参数空间中容差内有已完成的模拟时，从其末帧热启动
+        warm_start = get_warm_start_index().prepare(phase_params, temperature)
+        initial = warm_start.pop("initial") if warm_start else None
+        staging = self.simulation_cache.staging_dir(key)
+        try:
+            record = run_simulation(
+                staging, phase_params, progress, initial,
+                warm_start["start_step"] if warm_start else 0,
+                convergence_criteria()
+            )
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        run_dir = self.simulation_cache.commit(key, staging)
+        
+        vtk_data = {
+            "type": "timeseries",
+            "folder": self._relative_folder(run_dir),
+            "description": "相场模拟时间序列数据（Cahn–Hilliard）"
+        }
+        microstructure = self._analyze_microstructure(run_dir)
         
-        if has_timeseries:
-            # 返回时间序列标记
-            vtk_data = {
-                "type": "timeseries",
-                "folder": "涂层-调幅分解",
-                "description": "相场模拟时间序列数据"
-            }
-        else:
-            # 读取单个VTK文件
-            vtk_data = self._read_vtk_file(self.mock_vtk_file)
-            vtk_data["type"] = "single"
+        # 调幅区外的场只剩噪声，其"界面"与"波长"没有物理意义
+        decomposed = in_spinodal(phase_params.c0, phase_params.barrier)
         
         topphi_result = {
-            "grain_size_nm": self._predict_grain_size(composition, params),
-            "preferred_orientation": self._predict_orientation(composition),
-            "residual_stress_gpa": self._predict_stress(params),
-            "lattice_constant": 4.15,
-            "formation_energy": -0.85,
-            "confidence": 0.82,
-            "simulation_time": 120,
+            # 富相畴尺寸与调幅波长（nm，由模拟场计算；未分解时为 None）
+            "domain_size_nm": self._domain_size(microstructure) if decomposed else None,
+            "modulation_wavelength_nm": self._to_nm(microstructure.get("mean_wavelength")) if decomposed else None,
+            "lattice_constant": self._predict_lattice_constant(phase_params.c0),
+            "simulation_time": record["elapsed"],
+            # 相场模拟参数与收敛信息
+            "simulation": {
+                "run_id": key,
+                "al_fraction": phase_params.c0,
+                "mobility": phase_params.mobility,
+                "grid": phase_params.grid,
+                "steps": phase_params.steps,
+                "steps_run": record["stop"]["step"] - record["start_step"],
+                # 停止原因：converged（收敛指标进入平台）/ homogeneous（未分解）/ max_steps
+                "stop": record["stop"],
+                "warm_start": warm_start,
+                "frames": len(record["frames"]),
+                "final_energy": record["energy"][-1][1],
+            },
+            # 由模拟场计算的微观结构统计（调幅波长、体积分数、界面面积）
+            "microstructure": microstructure,
             # VTK可视化数据
-            "vtk_data": vtk_data
+            "vtk_data": vtk_data,
+            # 归一化配方（缓存键的来源）
+            "recipe": recipe
         }
+        self.simulation_cache.put(
+            key, recipe, topphi_result, parameter_point(phase_params, temperature, record["stop"]["step"])
+        )
+        topphi_result["cache"] = {"key": key, "hit": False}
         
-        logger.info(f"[TopPhi模拟] 完成 - 晶粒尺寸: {topphi_result['grain_size_nm']} nm")
-        logger.info(f"[TopPhi模拟] VTK数据已加载 - {vtk_data.get('dimensions')}")
+        logger.info(
+            f"[TopPhi模拟] 完成 - 畴尺寸: {topphi_result['domain_size_nm']} nm, "
+            f"调幅波长: {topphi_result['modulation_wavelength_nm']} nm"
+        )
+        logger.info(f"[TopPhi模拟] VTK数据已生成 - {vtk_data['folder']}")
         
         return topphi_result
     
-    def _predict_grain_size(self, composition: Dict, params: Dict) -> float:
-        """预测晶粒尺寸（简化模型）"""
-        # 基础晶粒尺寸
-        base_size = 10.0
-        
-        # Al含量影响（Al含量越高，晶粒越细）
-        al_content = composition.get('al_content') or 0
-        al_factor = 1.0 - (al_content / 100) * 0.3
-        
-        # 温度影响（温度越高，晶粒越大）
-        temp = params.get('deposition_temperature') or 450
-        temp_factor = 1.0 + (temp - 500) / 1000
-        
-        return round(base_size * al_factor * temp_factor, 1)
-    
-    def _predict_orientation(self, composition: Dict) -> str:
-        """预测择优取向"""
-        al_content = composition.get('al_content') or 0
-        
-        if al_content > 50:
-            return "(111)"
-        elif al_content > 30:
-            return "(200)"
-        else:
-            return "(220)"
-    
-    def _predict_stress(self, params: Dict) -> float:
-        """预测残余应力"""
-        # 基础应力
-        base_stress = -2.0
-        
-        # 偏压影响
-        bias = params.get('bias_voltage') or 0
-        bias_factor = 1.0 + (bias - 100) / 200
-        
-        return round(base_stress * bias_factor, 2)
-    
-    def _read_vtk_file(self, vtk_file_path: Path) -> Dict[str, Any]:
+    def run_sweep(
+        self,
+        composition: Dict,
+        params: Dict,
+        spec: Dict[str, Any],
+        max_workers: Optional[int] = None,
+        on_point: Optional[Callable[[Dict[str, Any], int, int], None]] = None
+    ) -> Dict[str, Any]:
         """
-        读取VTK文件并解析为结构化数据
+        参数扫描 - 网格或拉丁超立方批量模拟
         
         Args:
-            vtk_file_path: VTK文件路径
+            composition: 基准成分
+            params: 基准工艺参数
+            spec: 扫描规格 {"mode": "grid" | "lhs", "axes": {...}, "samples", "seed", "balance"}
+            max_workers: 并行进程数（不超过 SIM_SWEEP_WORKERS）
+            on_point: 每完成一个点回调 (行, 已完成数, 总数)
         
         Returns:
-            包含VTK数据的字典
+            {"axes", "columns", "rows", "failed", "table"}：每个扫描点一行微观结构描述符
         """
+        cap = get_simulation_config().sweep_workers
+        workers = min(max_workers or cap, cap)
+        logger.info(f"[TopPhi模拟] 参数扫描开始 - {spec.get('mode', 'grid')}，{workers} 个进程")
+        start = time.perf_counter()
+        sweep = run_sweep(composition, params, spec, workers, on_point)
+        sweep["elapsed"] = round(time.perf_counter() - start, 3)
+        hits = sum(1 for row in sweep["rows"] if row.get("cached"))
+        logger.info(
+            f"[TopPhi模拟] 参数扫描完成 - {len(sweep['rows'])} 个点（缓存命中 {hits}，失败 {len(sweep['failed'])}），"
+            f"耗时 {sweep['elapsed']:.1f} s"
+        )
+        return sweep
+    
+    def _relative_folder(self, run_dir: Path) -> str:
+        """运行文件夹相对 VTK 数据根目录（VTK_DATA_ROOT）的路径（VTK 接口与推流按此访问）"""
+        data_root = get_vtk_config().data_root
         try:
-            if not vtk_file_path.exists():
-                logger.warning(f"[VTK] 文件不存在: {vtk_file_path}")
-                return self._get_empty_vtk_data()
-            
-            logger.info(f"[VTK] 读取文件: {vtk_file_path}")
-            
-            # 读取VTK文件头部信息
-            with open(vtk_file_path, 'r', encoding='utf-8') as f:
-                lines = []
-                for i, line in enumerate(f):
-                    lines.append(line.strip())
-                    if i >= 15:  # 读取前16行获取元数据
-                        break
-            
-            # 解析VTK头部
-            vtk_metadata = self._parse_vtk_header(lines)
-            
-            # 读取文件大小
-            file_size = vtk_file_path.stat().st_size
-            
-            # 对于大文件，只读取部分数据用于预览
-            # 完整数据可以通过文件路径由前端按需加载
-            vtk_result = {
-                "file_path": str(vtk_file_path),
-                "file_name": vtk_file_path.name,
-                "file_size": file_size,
-                "file_size_mb": round(file_size / 1024 / 1024, 2),
-                "metadata": vtk_metadata,
-                "dimensions": vtk_metadata.get("dimensions"),
-                "point_count": vtk_metadata.get("point_count"),
-                "data_type": vtk_metadata.get("data_type"),
-                "scalar_name": vtk_metadata.get("scalar_name"),
-                # 提供相对路径供前端访问
-                "relative_path": vtk_file_path.name,
-                # 前端VTK组件需要的file字段（API路径）
-                "file": f"/api/vtk/files/{vtk_file_path.name}"
-            }
-            
-            logger.info(f"[VTK] 解析完成 - 维度: {vtk_metadata.get('dimensions')}, 点数: {vtk_metadata.get('point_count')}")
-            
-            return vtk_result
-            
-        except Exception as e:
-            logger.error(f"[VTK] 读取失败: {e}")
-            return self._get_empty_vtk_data()
+            return run_dir.resolve().relative_to(data_root.resolve()).as_posix()
+        except ValueError:
+            logger.warning(f"[TopPhi模拟] 输出目录不在 VTK 数据根目录 {data_root} 内，VTK 接口无法访问: {run_dir}")
+            return str(run_dir)
     
-    def _parse_vtk_header(self, lines: list) -> Dict[str, Any]:
+    def _analyze_microstructure(self, source: Path) -> Dict[str, Any]:
         """
-        解析VTK文件头部信息
+        计算模拟场的微观结构统计（时间序列取最后一帧）
         
         Args:
-            lines: VTK文件的前几行
+            source: 时间序列文件夹或单个VTK文件
         
         Returns:
-            解析后的元数据字典
+            统计结果（不含径向谱数组），失败时返回空字典
         """
-        metadata = {}
-        
         try:
-            # 第1行: 版本信息
-            if len(lines) > 0:
-                metadata["version"] = lines[0].replace("# vtk DataFile Version ", "").strip()
-            
-            # 第2行: 描述信息
-            if len(lines) > 1:
-                metadata["description"] = lines[1].strip()
-            
-            # 第3行: 数据格式
-            if len(lines) > 2:
-                metadata["format"] = lines[2].strip()
-            
-            # 第4行: 数据集类型
-            if len(lines) > 3:
-                metadata["dataset_type"] = lines[3].replace("DATASET ", "").strip()
-            
-            # 第5行: 维度信息
-            if len(lines) > 4 and "DIMENSIONS" in lines[4]:
-                dims = lines[4].replace("DIMENSIONS ", "").strip().split()
-                metadata["dimensions"] = [int(d) for d in dims]
-                metadata["dimensions_str"] = f"{dims[0]}×{dims[1]}×{dims[2]}"
-            
-            # 第6行: 纵横比
-            if len(lines) > 5 and "ASPECT_RATIO" in lines[5]:
-                metadata["aspect_ratio"] = lines[5].replace("ASPECT_RATIO ", "").strip()
-            
-            # 第7行: 原点
-            if len(lines) > 6 and "ORIGIN" in lines[6]:
-                metadata["origin"] = lines[6].replace("ORIGIN ", "").strip()
-            
-            # 第9行: 点数据数量
-            if len(lines) > 8 and "POINT_DATA" in lines[8]:
-                metadata["point_count"] = int(lines[8].replace("POINT_DATA ", "").strip())
-            
-            # 第10行: 标量类型
-            if len(lines) > 9 and "SCALARS" in lines[9]:
-                parts = lines[9].replace("SCALARS ", "").strip().split()
-                metadata["scalar_name"] = parts[0] if len(parts) > 0 else "unknown"
-                metadata["data_type"] = parts[1] if len(parts) > 1 else "unknown"
-            
+            if source.is_dir():
+                frames = list_series_frames(source)
+                if not frames:
+                    return {}
+                time_step, vtk_file = frames[-1]
+            else:
+                time_step, vtk_file = None, source
+            
+            stats = summarize_stats(get_frame_stats(get_frame_cache(), vtk_file))
+            stats["frame"] = vtk_file.name
+            stats["time_step"] = time_step
+            logger.info(
+                f"[TopPhi模拟] 微观结构统计 - 调幅波长: {stats.get('mean_wavelength')}, "
+                f"富相体积分数: {stats['volume_fraction']['rich']:.3f}"
+            )
+            return stats
+        
         except Exception as e:
-            logger.warning(f"[VTK] 解析头部信息出错: {e}")
+            logger.warning(f"[TopPhi模拟] 微观结构统计失败: {e}")
+            return {}
+    
+    @staticmethod
+    def _to_nm(length: Optional[float]) -> Optional[float]:
+        """VTK 长度单位 -> nm"""
+        return round(length * GRID_SPACING_NM, 3) if length else None
+    
+    def _domain_size(self, microstructure: Dict[str, Any]) -> Optional[float]:
+        """
+        富相畴尺寸（nm）：体视学平均截距长度 4·V_V / S_V
         
-        return metadata
+        V_V 为富相体积分数，S_V 为比界面面积；场未分解（无界面）时为 None。
+        """
+        s_v = microstructure.get("specific_interface_area")
+        v_v = (microstructure.get("volume_fraction") or {}).get("rich")
+        if not s_v or v_v is None or not 0 < v_v < 1:
+            return None
+        return self._to_nm(4 * v_v / s_v)
     
-    def _get_empty_vtk_data(self) -> Dict[str, Any]:
-        """返回空的VTK数据结构"""
-        return {
-            "file_path": None,
-            "file_name": None,
-            "file_size": 0,
-            "file_size_mb": 0,
-            "metadata": {},
-            "dimensions": None,
-            "point_count": 0,
-            "data_type": None,
-            "scalar_name": None,
-            "relative_path": None,
-            "file": None  # 前端VTK组件需要的file字段
-        }
+    def _predict_lattice_constant(self, al_fraction: float) -> float:
+        """立方 (Ti,Al)N 晶格常数（Vegard 定律，按金属亚晶格 Al 分数线性插值）"""
+        return round(TIN_LATTICE + (CUBIC_ALN_LATTICE - TIN_LATTICE) * al_fraction, 3)
@@ -0,0 +1,123 @@
+"""
+相场模拟模块
+
+TopPhi 的本地替代，可在仅有 CPU 的环境中运行：
+- 配置：输出目录、网格与步数等默认参数
+- 求解器：半隐式谱方法 Cahn–Hilliard（NumPy FFT），成分/温度映射为初始浓度与迁移率
+- 提前停止：自由能、主波长与场变化率进入平台后停止，平台期的帧按变化量抽稀，记录停止原因
+- 输出：每次运行一个文件夹，conc-{step}.vtk 与 TopPhi 布局相同，可直接用 VTK 接口浏览
+- 缓存：按归一化配方内容寻址的结果缓存，SQLite 索引 + 按磁盘预算 LRU 淘汰
+- 热启动：已完成模拟的参数点 KD 树，新配方从容差内最近邻的末帧继续演化
+- 扫描：网格 / 拉丁超立方参数扫描，进程池并行，逐点回调并汇总微观结构描述符表
+- 任务：SQLite 任务表 + 独立进程池，提交后立即返回句柄，支持查询、取消与进度推送
+"""
+
+from .config import SimulationConfig, get_simulation_config
+from .phasefield import (
+    PhaseFieldParams,
+    ConvergenceCriteria,
+    ConvergenceMonitor,
+    CahnHilliardSolver,
+    convergence_criteria,
+    in_spinodal,
+    dominant_wavelength,
+    al_fraction,
+    arrhenius_mobility,
+    material_parameters,
+    write_vtk,
+    run_simulation,
+)
+from .cache import (
+    CACHE_VERSION,
+    RECIPE_PRECISION,
+    SimulationCache,
+    normalize_recipe,
+    recipe_key,
+    resolve_recipe,
+    get_simulation_cache,
+)
+from .warmstart import (
+    PARAMETER_SCALES,
+    KDTree,
+    WarmStartIndex,
+    solver_signature,
+    parameter_point,
+    warm_start_state,
+    get_warm_start_index,
+)
+from .sweep import (
+    MAX_SWEEP_POINTS,
+    SWEEP_MODES,
+    build_points,
+    expand_grid,
+    latin_hypercube,
+    apply_point,
+    format_table,
+    run_sweep,
+)
+from .jobs import (
+    FINAL_STATUSES,
+    JobCancelled,
+    JobStore,
+    SimulationJobManager,
+    run_simulation_job,
+    run_sweep_job,
+    get_job_manager,
+)
+
+__all__ = [
+    # 配置
+    "SimulationConfig",
+    "get_simulation_config",
+
+    # 求解器
+    "PhaseFieldParams",
+    "ConvergenceCriteria",
+    "ConvergenceMonitor",
+    "CahnHilliardSolver",
+    "convergence_criteria",
+    "in_spinodal",
+    "dominant_wavelength",
+    "al_fraction",
+    "arrhenius_mobility",
+    "material_parameters",
+    "write_vtk",
+    "run_simulation",
+
+    # 缓存
+    "CACHE_VERSION",
+    "RECIPE_PRECISION",
+    "SimulationCache",
+    "normalize_recipe",
+    "recipe_key",
+    "resolve_recipe",
+    "get_simulation_cache",
+
+    # 热启动
+    "PARAMETER_SCALES",
+    "KDTree",
+    "WarmStartIndex",
+    "solver_signature",
+    "parameter_point",
+    "warm_start_state",
+    "get_warm_start_index",
+
+    # 扫描
+    "MAX_SWEEP_POINTS",
+    "SWEEP_MODES",
+    "build_points",
+    "expand_grid",
+    "latin_hypercube",
+    "apply_point",
+    "format_table",
+    "run_sweep",
+
+    # 任务
+    "FINAL_STATUSES",
+    "JobCancelled",
+    "JobStore",
+    "SimulationJobManager",
+    "run_simulation_job",
+    "run_sweep_job",
+    "get_job_manager",
+]
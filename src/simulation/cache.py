@@ -0,0 +1,343 @@
+"""
+模拟结果缓存（按配方内容寻址）
+
+同一配方（不同会话、不同写法）只计算一次：
+- 配方归一化：成分按比例缩放到总和 100 at.%，成分与工艺参数按仪器精度（RECIPE_PRECISION）取整，
+  键名排序后序列化；模拟本身也使用归一化后的配方，结果与缓存键一一对应
+- 缓存键：归一化配方 + 求解器参数（网格、步数、时间步长等）+ 提前停止判据 + CACHE_VERSION 的 SHA-256
+- 存储：output_dir/<key>/ 下为 conc-{step}.vtk、run.json 与 result.json；
+  计算时写入隐藏的暂存文件夹（目录监视跳过），完成后整体改名，不会出现写了一半的条目
+- 淘汰：SQLite 记录每个条目的大小与最近访问时间，总大小超过预算时按最近最少使用删除，
+  同时删除条目各帧在 VTK 缓存目录中的派生数据（二进制、LOD、统计、缩略图、分块存储等）
+- 参数点：每个条目在参数空间中的坐标（Al 分数、温度、迁移率），供热启动检索最近邻（warmstart）
+"""
+import hashlib
+import json
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from .config import SimulationConfig, get_simulation_config
+from .phasefield import ConvergenceCriteria, PhaseFieldParams, convergence_criteria, material_parameters
+
+
+# 结果格式或求解器变化时递增，旧条目自然失效
+CACHE_VERSION = 3
+
+# 成分（at.%）与工艺参数的仪器精度
+RECIPE_PRECISION = {
+    "al_content": 0.1,
+    "ti_content": 0.1,
+    "n_content": 0.1,
+    "content": 0.1,
+    "deposition_temperature": 1.0,
+    "deposition_pressure": 0.01,
+    "bias_voltage": 1.0,
+    "n2_flow": 1.0,
+}
+
+# 未列出的数值参数
+DEFAULT_PRECISION = 0.01
+
+# 主成分
+COMPOSITION_KEYS = ("al_content", "ti_content", "n_content")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    recipe TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS points (
+    key TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    c0 REAL NOT NULL,
+    temperature REAL NOT NULL,
+    mobility REAL NOT NULL,
+    steps INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_points_signature ON points (signature);
+"""
+
+
+def _round(value: float, step: float) -> float:
+    return round(round(value / step) * step, 6)
+
+
+def _canonical(value: Any, key: str = "") -> Any:
+    """按精度取整数值，丢弃空值，嵌套结构递归处理（列表按内容排序）"""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return _round(float(value), RECIPE_PRECISION.get(key, DEFAULT_PRECISION))
+    if isinstance(value, dict):
+        return {k: _canonical(v, k) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        items = [_canonical(v, key) for v in value]
+        return sorted(items, key=lambda v: json.dumps(v, sort_keys=True, ensure_ascii=False))
+    return str(value)
+
+
+def normalize_recipe(composition: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    归一化配方
+
+    Args:
+        composition: 涂层成分 {"al_content", "ti_content", "n_content", "other_elements": [{"name", "content"}]}
+        params: 工艺参数
+
+    Returns:
+        {"composition": {...}, "params": {...}}（成分总和 100 at.%，数值按仪器精度取整）
+
+    Raises:
+        ValueError: 成分含非数值，或总和不为正
+    """
+    for key in COMPOSITION_KEYS:
+        value = composition.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"成分 {key} 不是数值: {value!r}")
+    for element in composition.get("other_elements") or []:
+        content = element.get("content")
+        if content is not None and (isinstance(content, bool) or not isinstance(content, (int, float))):
+            raise ValueError(f"成分 {element.get('name', '')} 不是数值: {content!r}")
+    others = [e for e in composition.get("other_elements") or [] if e.get("content")]
+    total = sum(composition.get(k) or 0 for k in COMPOSITION_KEYS) + sum(e["content"] for e in others)
+    if total <= 0:
+        raise ValueError("未提供成分数据")
+    factor = 100.0 / total
+    normalized = {k: (composition.get(k) or 0) * factor for k in COMPOSITION_KEYS}
+    if others:
+        normalized["other_elements"] = [
+            {"name": e.get("name", ""), "content": e["content"] * factor} for e in others
+        ]
+    return {"composition": _canonical(normalized), "params": _canonical(dict(params))}
+
+
+def recipe_key(
+    recipe: Dict[str, Any], phase_params: PhaseFieldParams, criteria: Optional[ConvergenceCriteria] = None
+) -> str:
+    """缓存键：归一化配方 + 求解器参数 + 提前停止判据的 SHA-256（前 24 位十六进制）"""
+    payload = {
+        "version": CACHE_VERSION,
+        "recipe": recipe,
+        "solver": phase_params.to_dict(),
+        "convergence": criteria.to_dict() if criteria else None,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def resolve_recipe(
+    composition: Dict[str, Any], params: Dict[str, Any], config: Optional[SimulationConfig] = None
+) -> Tuple[Dict[str, Any], PhaseFieldParams, str]:
+    """
+    归一化配方并计算模型参数与缓存键
+
+    Returns:
+        (归一化配方, 模型参数, 缓存键)
+    """
+    recipe = normalize_recipe(composition, params)
+    phase_params = material_parameters(recipe["composition"], recipe["params"], config)
+    return recipe, phase_params, recipe_key(recipe, phase_params, convergence_criteria(config))
+
+
+def _folder_size(folder: Path) -> int:
+    return sum(p.stat().st_size for p in folder.rglob("*") if p.is_file())
+
+
+class SimulationCache:
+    """按配方内容寻址的模拟结果缓存（多进程共享同一个 SQLite 索引）"""
+
+    def __init__(self, root: Path, budget_bytes: int):
+        self.root = Path(root)
+        self.budget_bytes = budget_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "cache.sqlite3"
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开连接，正常退出时提交，结束后关闭"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def entry_dir(self, key: str) -> Path:
+        """条目文件夹（VTK 时间序列与 result.json）"""
+        return self.root / key
+
+    def staging_dir(self, key: str) -> Path:
+        """本次计算的暂存文件夹（以 . 开头，目录监视与列表接口跳过）"""
+        return self.root / f".{key}.{uuid.uuid4().hex[:8]}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        命中时返回模拟结果（附 cache: {"key", "hit": True}）并更新最近访问时间，未命中返回 None
+
+        索引中有记录但文件夹已被手动删除时，移除该记录。
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT key FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            try:
+                result = json.loads((self.entry_dir(key) / "result.json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._forget(conn, key)
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+        result["cache"] = {"key": key, "hit": True}
+        return result
+
+    def lookup(self, composition: Dict[str, Any], params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """按原始配方查询（归一化后取键）"""
+        _, _, key = resolve_recipe(composition, params)
+        return self.get(key)
+
+    def commit(self, key: str, staging: Path) -> Path:
+        """
+        暂存文件夹改名为条目文件夹（并发计算同一配方时保留先完成的一份）
+
+        Returns:
+            条目文件夹
+        """
+        target = self.entry_dir(key)
+        try:
+            staging.rename(target)
+        except OSError:
+            if not target.is_dir():
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+        return target
+
+    def put(
+        self, key: str, recipe: Dict[str, Any], result: Dict[str, Any], point: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        写入结果并登记条目，随后按预算淘汰
+
+        Args:
+            key: 缓存键
+            recipe: 归一化配方
+            result: 模拟结果
+            point: 参数点 {"signature", "c0", "temperature", "mobility", "steps"}（供热启动检索）
+        """
+        target = self.entry_dir(key)
+        tmp = target / f"result.json.{uuid.uuid4().hex[:8]}.tmp"
+        tmp.write_text(json.dumps(result, ensure_ascii=False, default=float), encoding="utf-8")
+        tmp.replace(target / "result.json")
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO entries (key, recipe, size, created_at, last_access) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET size = excluded.size, last_access = excluded.last_access",
+                (key, json.dumps(recipe, ensure_ascii=False), _folder_size(target), now, now),
+            )
+            if point is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO points (key, signature, c0, temperature, mobility, steps) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, point["signature"], point["c0"], point["temperature"], point["mobility"], point["steps"]),
+                )
+        self.evict(keep=key)
+
+    def points(self, signature: str) -> List[Dict[str, Any]]:
+        """同一求解器设置下已完成条目的参数点（按缓存键排序）"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT p.* FROM points p JOIN entries e ON e.key = p.key WHERE p.signature = ? ORDER BY p.key",
+                (signature,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _forget(conn: sqlite3.Connection, key: str) -> None:
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        conn.execute("DELETE FROM points WHERE key = ?", (key,))
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """
+        总大小超过预算时按最近最少使用删除条目
+
+        Args:
+            keep: 不淘汰的条目（刚写入的结果）
+
+        Returns:
+            被删除的缓存键
+        """
+        removed = []
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.budget_bytes:
+                return removed
+            for row in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+                if total <= self.budget_bytes:
+                    break
+                if row["key"] == keep:
+                    continue
+                self._purge_derived(self.entry_dir(row["key"]))
+                shutil.rmtree(self.entry_dir(row["key"]), ignore_errors=True)
+                self._forget(conn, row["key"])
+                total -= row["size"]
+                removed.append(row["key"])
+        if removed:
+            logger.info(f"[模拟缓存] 淘汰 {len(removed)} 个条目，剩余 {total / 1024 / 1024:.1f} MB")
+        return removed
+
+    @staticmethod
+    def _purge_derived(folder: Path) -> None:
+        """删除条目各帧的 VTK 派生缓存（失败只记录日志，不影响淘汰）"""
+        from ..vtk import get_frame_cache, list_series_frames
+
+        try:
+            removed = get_frame_cache().purge([source for _, source in list_series_frames(folder)])
+        except OSError as e:
+            logger.warning(f"[模拟缓存] 清理派生缓存失败 {folder.name}: {e}")
+            return
+        if removed:
+            logger.debug(f"[模拟缓存] {folder.name} 的派生缓存已删除: {removed} 项")
+
+    def stats(self) -> Dict[str, Any]:
+        """条目数、占用与命中次数"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS entries, COALESCE(SUM(size), 0) AS size, COALESCE(SUM(hits), 0) AS hits "
+                "FROM entries"
+            ).fetchone()
+        return {
+            "entries": row["entries"],
+            "total_bytes": row["size"],
+            "budget_bytes": self.budget_bytes,
+            "hits": row["hits"],
+        }
+
+
+@lru_cache()
+def get_simulation_cache() -> SimulationCache:
+    """
+    获取模拟结果缓存单例
+
+    返回:
+        SimulationCache: 缓存实例
+    """
+    config = get_simulation_config()
+    return SimulationCache(config.output_dir, int(config.cache_budget_mb * 1024 * 1024))
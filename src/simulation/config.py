@@ -0,0 +1,105 @@
+"""
+模拟模块配置
+
+从环境变量加载相场模拟的输出目录与求解器默认参数
+"""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from functools import lru_cache
+
+
+# 项目根目录（VTK 路由以此为根解析文件夹路径）
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+@dataclass
+class SimulationConfig:
+    """
+    模拟配置类
+
+    属性:
+        output_dir: 模拟结果根目录（每次运行一个子文件夹，需位于项目根目录内才能被 VTK 接口访问）
+        grid: 模拟网格边长（grid³ 个格点）
+        steps: 时间步数
+        save_every: 每隔多少步输出一帧 conc-{step}.vtk
+        dt: 时间步长（无量纲）
+        workers: 模拟任务进程池的最大进程数
+        progress_interval: 任务进度轮询与推送间隔（秒）
+        cache_budget_mb: 模拟结果缓存的磁盘预算（MB），超出时按最近最少使用淘汰
+        sweep_workers: 参数扫描进程池的最大进程数（单次扫描的并行点数上限）
+        warm_start_tolerance: 热启动的最大邻居距离（归一化参数空间，见 warmstart.PARAMETER_SCALES），0 为关闭
+        warm_start_min_steps: 热启动后至少演化的步数（让邻居的场适应新的成分与迁移率）
+        early_stop: 收敛后提前停止（False 时固定演化 steps 步）
+        energy_tol: 自由能每步相对下降率低于该值视为平台
+        wavelength_tol: 主波长每步相对漂移率低于该值视为平台
+        change_tol: 场的每步均方根变化（相对场的标准差）低于该值视为平台
+        patience: 连续多少次检查均处于平台才停止
+        min_steps: 至少演化的步数（调幅分解孕育期不判收敛）
+        frame_min_change: 与上一输出帧的均方根差低于该值时不写出该帧（0 为按固定间隔全部输出）
+    """
+    output_dir: Path = field(
+        default_factory=lambda: Path(os.getenv("SIM_OUTPUT_DIR", str(PROJECT_ROOT / "simulations")))
+    )
+    grid: int = field(
+        default_factory=lambda: int(os.getenv("SIM_GRID", "64"))
+    )
+    steps: int = field(
+        default_factory=lambda: int(os.getenv("SIM_STEPS", "500"))
+    )
+    save_every: int = field(
+        default_factory=lambda: int(os.getenv("SIM_SAVE_EVERY", "20"))
+    )
+    dt: float = field(
+        default_factory=lambda: float(os.getenv("SIM_DT", "0.5"))
+    )
+    workers: int = field(
+        default_factory=lambda: int(os.getenv("SIM_WORKERS", "1"))
+    )
+    progress_interval: float = field(
+        default_factory=lambda: float(os.getenv("SIM_PROGRESS_INTERVAL", "0.5"))
+    )
+    cache_budget_mb: float = field(
+        default_factory=lambda: float(os.getenv("SIM_CACHE_BUDGET_MB", "2048"))
+    )
+    sweep_workers: int = field(
+        default_factory=lambda: int(os.getenv("SIM_SWEEP_WORKERS", "2"))
+    )
+    warm_start_tolerance: float = field(
+        default_factory=lambda: float(os.getenv("SIM_WARM_START_TOLERANCE", "0.5"))
+    )
+    warm_start_min_steps: int = field(
+        default_factory=lambda: int(os.getenv("SIM_WARM_START_MIN_STEPS", "40"))
+    )
+    early_stop: bool = field(
+        default_factory=lambda: os.getenv("SIM_EARLY_STOP", "true").lower() in ("1", "true", "yes")
+    )
+    energy_tol: float = field(
+        default_factory=lambda: float(os.getenv("SIM_ENERGY_TOL", "1e-3"))
+    )
+    wavelength_tol: float = field(
+        default_factory=lambda: float(os.getenv("SIM_WAVELENGTH_TOL", "1e-3"))
+    )
+    change_tol: float = field(
+        default_factory=lambda: float(os.getenv("SIM_CHANGE_TOL", "5e-3"))
+    )
+    patience: int = field(
+        default_factory=lambda: int(os.getenv("SIM_PATIENCE", "2"))
+    )
+    min_steps: int = field(
+        default_factory=lambda: int(os.getenv("SIM_MIN_STEPS", "100"))
+    )
+    frame_min_change: float = field(
+        default_factory=lambda: float(os.getenv("SIM_FRAME_MIN_CHANGE", "0.002"))
+    )
+
+
+@lru_cache()
+def get_simulation_config() -> SimulationConfig:
+    """
+    获取模拟配置单例
+
+    返回:
+        SimulationConfig: 模拟配置实例
+    """
+    return SimulationConfig()
@@ -0,0 +1,469 @@
+"""
+模拟任务队列
+
+相场模拟耗时数秒到数分钟，不在对话轮次中同步执行：
+- 提交后立即返回任务句柄，模拟在独立的进程池中运行（与 VTK 派生数据计算互不占用）
+- 任务类型：deposition（单次沉积模拟）与 sweep（参数扫描，每完成一个点更新一次进度）
+- 配方命中结果缓存时不进入进程池，任务直接以 completed 状态返回
+- 任务状态、进度与结果记录在 SQLite 任务表中，工作进程直接写表，主进程与工作进程之间不传递大对象
+- 取消：排队中的任务直接撤销；运行中的任务置取消标记，工作进程在下一次输出帧时检查并中止
+- 主进程按固定间隔轮询活动任务，进度变化时通知监听者（对话 WebSocket 据此推送 tool_progress）
+- 任务记录提交它的进程 PID；新建管理器时只把所属进程已退出的未结束任务标记为中断（多个 worker 进程共用任务表）
+
+任务状态：queued -> running -> completed / failed / cancelled
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from ..vtk.workers import pool_context
+from .cache import get_simulation_cache, resolve_recipe
+from .config import get_simulation_config
+from .sweep import build_points
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    session_id TEXT,
+    request TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner_pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs (session_id, created_at);
+"""
+
+# 终态
+FINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _pid_alive(pid: int) -> bool:
+    """进程是否仍在运行"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobCancelled(Exception):
+    """运行中的任务被请求取消"""
+
+
+class JobStore:
+    """SQLite 任务表（主进程与工作进程各自打开连接）"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner_pid" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner_pid INTEGER")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开连接，正常退出时提交，结束后关闭"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create(self, kind: str, request: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """新建排队任务"""
+        job_id = f"JOB_{uuid.uuid4().hex[:12]}"
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, session_id, request, owner_pid, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, kind, session_id, json.dumps(request, ensure_ascii=False), os.getpid(), now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """查询任务（不存在返回 None）"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list(self, session_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """最近的任务（按创建时间倒序，可按会话过滤）"""
+        with self._connect() as conn:
+            if session_id:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE session_id = ? ORDER BY created_at DESC LIMIT ?",
+                    (session_id, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """更新字段（progress/result 自动序列化为 JSON）"""
+        self._write(job_id, fields, active_only=False)
+
+    def finish(self, job_id: str, status: str, **fields: Any) -> None:
+        """标记终态（已结束的任务不再改写）"""
+        fields.update(status=status, finished_at=time.time())
+        self._write(job_id, fields, active_only=True)
+
+    def _write(self, job_id: str, fields: Dict[str, Any], active_only: bool) -> None:
+        for key in ("progress", "result"):
+            if fields.get(key) is not None:
+                fields[key] = json.dumps(fields[key], ensure_ascii=False, default=float)
+        fields["updated_at"] = time.time()
+        sql = f"UPDATE jobs SET {', '.join(f'{key} = ?' for key in fields)} WHERE id = ?"
+        args = [*fields.values(), job_id]
+        if active_only:
+            sql += f" AND status NOT IN ({', '.join('?' for _ in FINAL_STATUSES)})"
+            args += FINAL_STATUSES
+        with self._connect() as conn:
+            conn.execute(sql, args)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def interrupt_unfinished(self) -> int:
+        """
+        所属进程已退出的未结束任务已无工作进程，标记为失败
+
+        仍在运行的其他进程（多个 uvicorn worker、脚本）提交的任务保持不变；
+        PID 与当前进程相同的任务来自先前复用了该 PID 的进程（容器重启），同样视为中断。
+        未记录 PID 的旧任务视为中断。
+        """
+        now = time.time()
+        placeholders = ", ".join("?" for _ in FINAL_STATUSES)
+        current = os.getpid()
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id, owner_pid FROM jobs WHERE status NOT IN ({placeholders})", FINAL_STATUSES
+            ).fetchall()
+            stale = [
+                row["id"] for row in rows
+                if row["owner_pid"] is None or row["owner_pid"] == current or not _pid_alive(row["owner_pid"])
+            ]
+            for job_id in stale:
+                conn.execute(
+                    f"UPDATE jobs SET status = 'failed', error = '服务重启，任务中断', finished_at = ?, updated_at = ? "
+                    f"WHERE id = ? AND status NOT IN ({placeholders})",
+                    (now, now, job_id, *FINAL_STATUSES),
+                )
+        return len(stale)
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        for key in ("progress", "result"):
+            job[key] = json.loads(job[key]) if job[key] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+
+def run_simulation_job(job_id: str, db_path: str, composition: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """
+    在工作进程中执行一次沉积模拟（进程池任务入口，结果写入任务表，只返回终态）
+
+    Args:
+        job_id: 任务 ID
+        db_path: 任务表路径
+        composition: 涂层成分
+        params: 工艺参数
+
+    Returns:
+        任务终态
+    """
+    from ..services.topphi_service import TopPhiService
+
+    store = JobStore(Path(db_path))
+    if store.cancel_requested(job_id):
+        store.finish(job_id, "cancelled")
+        return "cancelled"
+    store.update(job_id, status="running", started_at=time.time())
+
+    def progress(event: Dict[str, Any]) -> None:
+        if store.cancel_requested(job_id):
+            raise JobCancelled(job_id)
+        store.update(job_id, progress=event)
+
+    try:
+        result = TopPhiService().simulate_deposition(composition, params, progress=progress)
+        store.finish(job_id, "completed", result=result)
+        return "completed"
+    except JobCancelled:
+        store.finish(job_id, "cancelled")
+        logger.info(f"[模拟任务] 已取消: {job_id}")
+        return "cancelled"
+    except Exception as e:
+        store.finish(job_id, "failed", error=str(e))
+        logger.error(f"[模拟任务] 失败 {job_id}: {e}")
+        return "failed"
+
+
+def run_sweep_job(
+    job_id: str,
+    db_path: str,
+    composition: Dict[str, Any],
+    params: Dict[str, Any],
+    spec: Dict[str, Any],
+    max_workers: Optional[int] = None,
+) -> str:
+    """
+    在工作进程中执行参数扫描（进程池任务入口）
+
+    每完成一个点把该行追加到进度中；取消标记在点与点之间检查，
+    已开始的点算完为止（结果仍写入缓存），未开始的点撤销。
+
+    Args:
+        job_id: 任务 ID
+        db_path: 任务表路径
+        composition: 基准成分
+        params: 基准工艺参数
+        spec: 扫描规格
+        max_workers: 并行进程数
+
+    Returns:
+        任务终态
+    """
+    from ..services.topphi_service import TopPhiService
+
+    store = JobStore(Path(db_path))
+    if store.cancel_requested(job_id):
+        store.finish(job_id, "cancelled")
+        return "cancelled"
+    start = time.time()
+    store.update(job_id, status="running", started_at=start)
+    rows: List[Dict[str, Any]] = []
+
+    def on_point(row: Dict[str, Any], completed: int, total: int) -> None:
+        rows.append(row)
+        elapsed = time.time() - start
+        store.update(job_id, progress={
+            "completed": completed,
+            "total": total,
+            "point": row,
+            "rows": rows,
+            "elapsed": round(elapsed, 3),
+            "eta": round(elapsed / completed * (total - completed), 3),
+        })
+        if store.cancel_requested(job_id):
+            raise JobCancelled(job_id)
+
+    try:
+        result = TopPhiService().run_sweep(composition, params, spec, max_workers, on_point)
+        store.finish(job_id, "completed", result=result)
+        return "completed"
+    except JobCancelled:
+        store.finish(job_id, "cancelled")
+        logger.info(f"[模拟任务] 扫描已取消: {job_id}（完成 {len(rows)} 个点）")
+        return "cancelled"
+    except Exception as e:
+        store.finish(job_id, "failed", error=str(e))
+        logger.error(f"[模拟任务] 扫描失败 {job_id}: {e}")
+        return "failed"
+
+
+class SimulationJobManager:
+    """模拟任务管理：提交、查询、取消、结果，以及向监听者推送进度"""
+
+    def __init__(self, db_path: Path, max_workers: int = 1, poll_interval: float = 0.5):
+        self.store = JobStore(db_path)
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._watched: Dict[str, float] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], Awaitable[None]]] = []
+        self._task: Optional[asyncio.Task] = None
+        interrupted = self.store.interrupt_unfinished()
+        if interrupted:
+            logger.warning(f"[模拟任务] {interrupted} 个所属进程已退出的未结束任务已标记为中断")
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=pool_context())
+            logger.info(f"[模拟任务] 进程池已创建: {self.max_workers} 个进程")
+        return self._pool
+
+    def submit(
+        self, composition: Dict[str, Any], params: Dict[str, Any], session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        提交沉积模拟任务，立即返回任务记录（成分无效时抛出 ValueError）
+
+        Args:
+            composition: 涂层成分
+            params: 工艺参数
+            session_id: 所属会话（进度推送给该会话的客户端）
+        """
+        # 先归一化配方（成分无效时抛出 ValueError，不留下排队中的任务记录）
+        _, _, key = resolve_recipe(composition, params)
+        job = self.store.create("deposition", {"composition": composition, "params": params}, session_id)
+        self._watched[job["id"]] = job["updated_at"]
+        cached = get_simulation_cache().get(key)
+        if cached is not None:
+            self.store.finish(job["id"], "completed", result=cached)
+            logger.info(f"[模拟任务] {job['id']} 命中缓存 {cached['cache']['key']}")
+            return self.status(job["id"])
+
+        self._dispatch(job["id"], run_simulation_job, composition, params)
+        logger.info(f"[模拟任务] 已提交 {job['id']}: session={session_id}")
+        return job
+
+    def submit_sweep(
+        self,
+        composition: Dict[str, Any],
+        params: Dict[str, Any],
+        spec: Dict[str, Any],
+        session_id: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        提交参数扫描任务，立即返回任务记录（扫描规格无效时抛出 ValueError）
+
+        Args:
+            composition: 基准成分
+            params: 基准工艺参数
+            spec: 扫描规格（见 sweep.build_points）
+            session_id: 所属会话
+            max_workers: 并行进程数（不超过 SIM_SWEEP_WORKERS）
+        """
+        points = build_points(spec)
+        request = {"composition": composition, "params": params, "spec": spec, "points": len(points)}
+        job = self.store.create("sweep", request, session_id)
+        self._watched[job["id"]] = job["updated_at"]
+        self._dispatch(job["id"], run_sweep_job, composition, params, spec, max_workers)
+        logger.info(f"[模拟任务] 已提交扫描 {job['id']}: {len(points)} 个点, session={session_id}")
+        return job
+
+    def _dispatch(self, job_id: str, fn: Callable[..., str], *args: Any) -> None:
+        """提交到进程池并登记完成回调"""
+        future = self.pool.submit(fn, job_id, str(self.store.db_path), *args)
+        self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        """工作进程异常退出（或排队时被撤销）时补记终态"""
+        self._futures.pop(job_id, None)
+        if future.cancelled():
+            self.store.finish(job_id, "cancelled")
+        elif future.exception() is not None:
+            self.store.finish(job_id, "failed", error=str(future.exception()))
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """任务状态与进度（不含结果）"""
+        job = self.store.get(job_id)
+        if job:
+            job.pop("result")
+        return job
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """完整任务记录（完成后含模拟结果）"""
+        return self.store.get(job_id)
+
+    def list_jobs(self, session_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        jobs = self.store.list(session_id, limit)
+        for job in jobs:
+            job.pop("result")
+        return jobs
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        取消任务：排队中直接撤销，运行中置取消标记（沉积模拟在下一帧输出时中止，扫描在下一个点完成时中止）
+
+        Returns:
+            取消后的任务状态（不存在返回 None）
+        """
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINAL_STATUSES:
+            return self.status(job_id)
+        self.store.update(job_id, cancel_requested=1)
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self.store.finish(job_id, "cancelled")
+        logger.info(f"[模拟任务] 请求取消 {job_id}")
+        return self.status(job_id)
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        """注册进度监听者（任务状态或进度变化时以任务状态调用）"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    async def start(self) -> None:
+        """启动进度轮询协程"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        """停止轮询并关闭进程池（运行中的任务置取消标记）"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for job_id in list(self._futures):
+            self.store.update(job_id, cancel_requested=1)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _poll_loop(self) -> None:
+        from ..vtk import run_io
+
+        while True:
+            for job_id, seen in list(self._watched.items()):
+                try:
+                    job = await run_io(self.status, job_id)
+                    if job is None or job["updated_at"] == seen:
+                        continue
+                    self._watched[job_id] = job["updated_at"]
+                    if job["status"] in FINAL_STATUSES:
+                        del self._watched[job_id]
+                    for listener in self._listeners:
+                        await listener(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"[模拟任务] 进度推送失败 {job_id}: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+
+@lru_cache()
+def get_job_manager() -> SimulationJobManager:
+    """
+    获取模拟任务管理器单例
+
+    返回:
+        SimulationJobManager: 任务管理器实例
+    """
+    config = get_simulation_config()
+    return SimulationJobManager(config.output_dir / "jobs.sqlite3", config.workers, config.progress_interval)
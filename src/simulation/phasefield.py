@@ -0,0 +1,435 @@
+"""
+Cahn–Hilliard 相场求解器
+
+以 (Ti,Al)N 金属亚晶格上的 Al 分数 c = Al / (Al + Ti) 为序参量，模拟调幅分解：
+    ∂c/∂t = ∇·(M ∇μ)，μ = f'(c) - κ∇²c，f(c) = W c²(1 - c)²
+周期边界，半隐式谱方法（NumPy FFT）：非线性项显式、四阶项隐式，
+并加线性稳定项 A(ĉⁿ⁺¹ - ĉⁿ) 以允许较大的时间步长：
+    ĉⁿ⁺¹ = [ĉⁿ (1 + Δt M k² A) - Δt M k² f̂'(cⁿ)] / [1 + Δt M k² (A + κ k²)]
+
+成分与工艺到模型参数的映射（无量纲，作为 TopPhi 的本地替代）：
+- 初始浓度 c0 = Al / (Al + Ti)，叠加均匀噪声；c0 落在调幅区（约 0.21 ~ 0.79）时才会分解
+- 迁移率 M 按 Arrhenius 关系随沉积温度变化，以 REFERENCE_TEMPERATURE 为 1
+
+输出与 TopPhi 相同：每次运行一个文件夹，conc-{step}.vtk（ASCII STRUCTURED_POINTS，标量 c），
+另附 run.json 记录参数、帧列表、自由能历史、收敛指标与停止原因。
+
+提前停止（ConvergenceCriteria）：每个输出间隔计算自由能相对下降率、主波长（结构因子一阶矩波长）漂移率
+与场的均方根变化率（相对场的标准差，孕育期振幅很小时该值很大，不会误判收敛），
+三者连续 patience 次低于阈值即停止（converged）；成分在调幅区外且场已趋于均匀时直接停止（homogeneous）。
+与上一输出帧差别很小的帧不写出，平台期的帧自然变稀。
+热启动（warmstart）时以邻居的末帧为初始场，从等效步数继续，帧编号仍与冷启动的时间轴一致。
+写出的帧同时发布为共享数组（vtk/shared.py），API 进程读取时直接映射，运行期间持有最近几帧的引用，结束时释放。
+"""
+import json
+import sqlite3
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ..vtk.analytics import characteristic_wavelengths, radial_spectrum, structure_factor
+from ..vtk.reader import parse_header, read_header
+from ..vtk.shared import get_shared_frames
+from .config import SimulationConfig, get_simulation_config
+
+
+# 玻尔兹曼常数（eV/K）
+BOLTZMANN_EV = 8.617333e-5
+
+# 迁移率的表观激活能（eV）与参考温度（°C，该温度下 M = 1）
+ACTIVATION_ENERGY = 0.5
+REFERENCE_TEMPERATURE = 500.0
+
+# 未给出沉积温度时的默认值（°C）
+DEFAULT_TEMPERATURE = 450.0
+
+# 调幅区外的场标准差低于该值视为已均匀
+HOMOGENEOUS_AMPLITUDE = 1e-3
+
+
+@dataclass
+class PhaseFieldParams:
+    """
+    Cahn–Hilliard 模型参数（无量纲）
+
+    属性:
+        c0: 平均初始浓度（Al 分数）
+        mobility: 迁移率 M
+        kappa: 梯度能系数 κ
+        barrier: 双阱势垒高度 W
+        noise: 初始噪声幅度（均匀分布 ±noise/2）
+        grid: 网格边长
+        dt: 时间步长
+        steps: 时间步数
+        save_every: 输出间隔（步）
+        seed: 初始噪声随机种子
+        stabilizer: 线性稳定项系数 A
+    """
+    c0: float
+    mobility: float = 1.0
+    kappa: float = 1.0
+    barrier: float = 1.0
+    noise: float = 0.05
+    grid: int = 64
+    dt: float = 0.5
+    steps: int = 500
+    save_every: int = 20
+    seed: int = 0
+    stabilizer: float = 1.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ConvergenceCriteria:
+    """
+    提前停止判据（变化率均为每步的相对变化，每个输出间隔检查一次）
+
+    属性:
+        energy_tol: 自由能相对下降率阈值
+        wavelength_tol: 主波长相对漂移率阈值
+        change_tol: 场均方根变化率（相对场的标准差）阈值
+        patience: 连续多少次检查均低于阈值才停止
+        min_steps: 本次运行至少演化的步数
+        frame_min_change: 与上一输出帧的均方根差低于该值时不写出（0 为全部输出）
+    """
+    energy_tol: float = 1e-3
+    wavelength_tol: float = 1e-3
+    change_tol: float = 5e-3
+    patience: int = 2
+    min_steps: int = 100
+    frame_min_change: float = 0.002
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def convergence_criteria(config: Optional[SimulationConfig] = None) -> Optional[ConvergenceCriteria]:
+    """由配置构造提前停止判据（SIM_EARLY_STOP 关闭时为 None，按固定步数与间隔输出）"""
+    config = config or get_simulation_config()
+    if not config.early_stop:
+        return None
+    return ConvergenceCriteria(
+        energy_tol=config.energy_tol,
+        wavelength_tol=config.wavelength_tol,
+        change_tol=config.change_tol,
+        patience=config.patience,
+        min_steps=config.min_steps,
+        frame_min_change=config.frame_min_change,
+    )
+
+
+def in_spinodal(c0: float, barrier: float = 1.0) -> bool:
+    """c0 是否在调幅区内（f''(c0) = 2W(1 - 6c + 6c²) < 0，小扰动会增长）"""
+    return 2 * barrier * (1 - 6 * c0 + 6 * c0 ** 2) < 0
+
+
+def dominant_wavelength(field: np.ndarray) -> Optional[float]:
+    """结构因子一阶矩波长（格点单位），场均匀时为 None"""
+    k, spectrum = radial_spectrum(structure_factor(field), field.shape, [1.0, 1.0, 1.0])
+    return characteristic_wavelengths(k, spectrum)["mean_wavelength"]
+
+
+def al_fraction(composition: Dict[str, Any]) -> float:
+    """金属亚晶格上的 Al 分数 Al / (Al + Ti)"""
+    al = composition.get("al_content") or 0
+    ti = composition.get("ti_content") or 0
+    if al < 0 or ti < 0 or al + ti <= 0:
+        raise ValueError(f"无效的成分: Al={al}, Ti={ti}")
+    return al / (al + ti)
+
+
+def arrhenius_mobility(temperature: float) -> float:
+    """沉积温度（°C）下的相对迁移率"""
+    inverse = 1.0 / (temperature + 273.15) - 1.0 / (REFERENCE_TEMPERATURE + 273.15)
+    return float(np.exp(-ACTIVATION_ENERGY / BOLTZMANN_EV * inverse))
+
+
+def material_parameters(
+    composition: Dict[str, Any], params: Dict[str, Any], config: Optional[SimulationConfig] = None
+) -> PhaseFieldParams:
+    """
+    成分与工艺参数 -> 模型参数
+
+    Args:
+        composition: 涂层成分 {"al_content", "ti_content", ...}
+        params: 工艺参数 {"deposition_temperature", ...}
+        config: 模拟配置（网格、步数等，默认读取环境变量）
+
+    Returns:
+        PhaseFieldParams（随机种子由 c0 与温度确定，同一配方结果可复现）
+
+    Raises:
+        ValueError: 沉积温度不是数值
+    """
+    config = config or get_simulation_config()
+    c0 = al_fraction(composition)
+    temperature = params.get("deposition_temperature") or DEFAULT_TEMPERATURE
+    if isinstance(temperature, bool) or not isinstance(temperature, (int, float)):
+        raise ValueError(f"沉积温度不是数值: {temperature!r}")
+    return PhaseFieldParams(
+        c0=round(c0, 6),
+        mobility=round(arrhenius_mobility(temperature), 6),
+        grid=config.grid,
+        dt=config.dt,
+        steps=config.steps,
+        save_every=config.save_every,
+        seed=zlib.crc32(f"{c0:.6f}|{temperature:.3f}".encode("utf-8")),
+    )
+
+
+class CahnHilliardSolver:
+    """半隐式谱方法 Cahn–Hilliard 求解器（周期边界，形状 (grid, grid, grid) 即 z, y, x）"""
+
+    def __init__(self, params: PhaseFieldParams, initial: Optional[np.ndarray] = None):
+        """
+        Args:
+            params: 模型参数
+            initial: 初始场（None 为 c0 + 均匀噪声）
+        """
+        if not 0 < params.c0 < 1:
+            raise ValueError(f"初始浓度需在 (0, 1) 内: {params.c0}")
+        self.params = params
+        n = params.grid
+        if initial is None:
+            rng = np.random.default_rng(params.seed)
+            initial = params.c0 + params.noise * (rng.random((n, n, n)) - 0.5)
+        elif initial.shape != (n, n, n):
+            raise ValueError(f"初始场形状 {initial.shape} 与网格 {n}³ 不一致")
+        self.field = np.asarray(initial, dtype=np.float64)
+        self.step_count = 0
+
+        k = 2 * np.pi * np.fft.fftfreq(n)
+        kz, ky, kx = np.meshgrid(k, k, 2 * np.pi * np.fft.rfftfreq(n), indexing="ij")
+        self._k2 = kz ** 2 + ky ** 2 + kx ** 2
+        mk2dt = params.dt * params.mobility * self._k2
+        self._explicit = 1 + mk2dt * params.stabilizer
+        self._nonlinear = mk2dt
+        self._denominator = 1 + mk2dt * (params.stabilizer + params.kappa * self._k2)
+        # rfft 只存一半频谱：除 kx = 0 与 Nyquist 外的分量在 Parseval 求和时计两次
+        self._weights = np.full(self._k2.shape, 2.0)
+        self._weights[..., 0] = 1.0
+        if n % 2 == 0:
+            self._weights[..., -1] = 1.0
+
+    def _derivative(self, c: np.ndarray) -> np.ndarray:
+        """体自由能导数 f'(c) = 2W c (1 - c)(1 - 2c)"""
+        return 2 * self.params.barrier * c * (1 - c) * (1 - 2 * c)
+
+    def step(self, count: int = 1) -> np.ndarray:
+        """推进 count 步，返回当前场"""
+        axes = (0, 1, 2)
+        c = self.field
+        for _ in range(count):
+            c_hat = np.fft.rfftn(c)
+            f_hat = np.fft.rfftn(self._derivative(c))
+            c_hat = (c_hat * self._explicit - self._nonlinear * f_hat) / self._denominator
+            c = np.fft.irfftn(c_hat, s=c.shape, axes=axes)
+        self.field = c
+        self.step_count += count
+        return c
+
+    def free_energy(self) -> float:
+        """平均自由能密度 <W c²(1 - c)² + κ/2 |∇c|²>"""
+        c = self.field
+        bulk = self.params.barrier * np.mean(np.square(c * (1 - c)))
+        c_hat = np.fft.rfftn(c)
+        gradient = np.sum(self._weights * self._k2 * np.abs(c_hat) ** 2) / c.size ** 2
+        return float(bulk + 0.5 * self.params.kappa * gradient)
+
+
+class ConvergenceMonitor:
+    """跟踪收敛指标并判断是否停止"""
+
+    def __init__(self, params: PhaseFieldParams, criteria: ConvergenceCriteria, start_step: int = 0):
+        self.criteria = criteria
+        self.start_step = start_step
+        self.spinodal = in_spinodal(params.c0, params.barrier)
+        self.history = []
+        self._previous = None
+        self._plateau = 0
+
+    def update(self, step: int, field: np.ndarray, energy: float) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        记录当前步的指标
+
+        Returns:
+            (停止原因 "converged" / "homogeneous"，继续时为 None；本次指标)
+        """
+        amplitude = float(field.std())
+        wavelength = dominant_wavelength(field)
+        metrics = {"step": step, "energy": energy, "wavelength": wavelength, "amplitude": amplitude}
+        if self._previous is not None:
+            last_step, last_field, last_energy, last_wavelength = self._previous
+            n = step - last_step
+            metrics["energy_rate"] = abs(last_energy - energy) / max(abs(energy), 1e-12) / n
+            metrics["wavelength_drift"] = (
+                abs(wavelength - last_wavelength) / last_wavelength / n if wavelength and last_wavelength else 0.0
+            )
+            metrics["change"] = float(np.sqrt(np.mean(np.square(field - last_field)))) / max(amplitude, 1e-12) / n
+        self._previous = (step, field.copy(), energy, wavelength)
+        self.history.append(metrics)
+
+        if not self.spinodal and amplitude < HOMOGENEOUS_AMPLITUDE:
+            return "homogeneous", metrics
+        if "change" not in metrics or step - self.start_step < self.criteria.min_steps:
+            return None, metrics
+        plateau = (
+            metrics["energy_rate"] < self.criteria.energy_tol
+            and metrics["wavelength_drift"] < self.criteria.wavelength_tol
+            and metrics["change"] < self.criteria.change_tol
+        )
+        self._plateau = self._plateau + 1 if plateau else 0
+        return ("converged" if self._plateau >= self.criteria.patience else None), metrics
+
+
+def write_vtk(path: Path, field: np.ndarray, scalar_name: str = "c", description: str = "PhaseField") -> Path:
+    """
+    写入 ASCII STRUCTURED_POINTS 文件（与 TopPhi 输出格式相同：数据段单行，x 变化最快）
+
+    先写临时文件再替换，目录监视与 VTK 接口不会读到写了一半的帧。
+
+    Args:
+        path: 目标文件
+        field: 形状为 (nz, ny, nx) 的标量场
+        scalar_name: 标量名称
+        description: 第二行描述
+
+    Returns:
+        写入的路径
+    """
+    nz, ny, nx = field.shape
+    header = (
+        "# vtk DataFile Version 3.0 \n"
+        f"{description} \n"
+        "ASCII \n"
+        "DATASET STRUCTURED_POINTS \n"
+        f"DIMENSIONS {nx} {ny} {nz}\n"
+        "ASPECT_RATIO 1.0 1.0 1.0 \n"
+        "ORIGIN 0.0 0.0 0.0 \n"
+        "\n"
+        f"POINT_DATA {field.size}\n"
+        f"SCALARS {scalar_name} double\n"
+        "LOOKUP_TABLE default\n"
+    )
+    values = " ".join(map("{:g}".format, field.ravel().tolist()))
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(header + values + " \n", encoding="utf-8")
+    tmp.replace(path)
+    return path
+
+
+def run_simulation(
+    output_dir: Path,
+    params: PhaseFieldParams,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    initial: Optional[np.ndarray] = None,
+    start_step: int = 0,
+    criteria: Optional[ConvergenceCriteria] = None,
+) -> Dict[str, Any]:
+    """
+    运行一次相场模拟，每 save_every 步检查一次，输出 conc-{step}.vtk（含初始帧 conc-{start_step}.vtk 与末帧）
+
+    Args:
+        output_dir: 本次运行的输出文件夹
+        params: 模型参数
+        progress: 每次检查回调一次 {"step", "steps", "energy", "elapsed", "eta", "metrics"}
+        initial: 初始场（热启动时为邻居的末帧，None 为 c0 + 噪声）
+        start_step: 初始场对应的步数（热启动时从该步继续，帧编号与冷启动的时间轴一致）
+        criteria: 提前停止判据（None 为固定演化 steps 步并输出全部帧）
+
+    Returns:
+        运行记录（同 run.json）：{"params", "criteria", "start_step", "frames", "energy",
+        "convergence"（每次检查的指标）, "stop": {"reason", "step"}, "elapsed"}；
+        停止原因为 converged（指标进入平台）、homogeneous（调幅区外，场已均匀）或 max_steps
+    """
+    if params.steps <= 0 or params.save_every <= 0:
+        raise ValueError(f"步数与输出间隔需为正整数: steps={params.steps}, save_every={params.save_every}")
+    if not 0 <= start_step < params.steps:
+        raise ValueError(f"起始步数需在 [0, {params.steps}) 内: {start_step}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    solver = CahnHilliardSolver(params, initial)
+    solver.step_count = start_step
+    monitor = ConvergenceMonitor(params, criteria, start_step) if criteria else None
+    start = time.perf_counter()
+    frames, energy = [], []
+    last_frame = None
+    shared = get_shared_frames()
+    published = []
+
+    def publish(path: Path, field: np.ndarray) -> None:
+        if shared is None:
+            return
+        try:
+            name = shared.publish(path, field, parse_header(read_header(path)[0]))
+            if name is not None:
+                published.append(name)
+            # 只持有最近几帧，更早的帧交给 TTL / 预算清理
+            while len(published) > shared.pin_frames:
+                shared.release(published.pop(0))
+        except (OSError, sqlite3.Error) as e:
+            # 共享目录不可用时读取方回退到解析 VTK 文件
+            logger.warning(f"[相场模拟] 发布共享帧失败 {path.name}: {e}")
+
+    def check() -> Optional[str]:
+        nonlocal last_frame
+        step, field = solver.step_count, solver.field
+        energy.append([step, solver.free_energy()])
+        reason, metrics = monitor.update(step, field, energy[-1][1]) if monitor else (None, {})
+        # 首末帧总是写出；中间帧与上一输出帧差别太小时跳过
+        final = reason is not None or step >= params.steps
+        if (
+            final or last_frame is None or criteria is None
+            or float(np.sqrt(np.mean(np.square(field - last_frame)))) >= criteria.frame_min_change
+        ):
+            path = write_vtk(output_dir / f"conc-{step}.vtk", field)
+            frames.append(path.name)
+            publish(path, field)
+            last_frame = field.copy()
+        if progress:
+            elapsed = time.perf_counter() - start
+            progress({
+                "step": step,
+                "steps": params.steps,
+                "energy": energy[-1][1],
+                "elapsed": elapsed,
+                "eta": elapsed / (step - start_step) * (params.steps - step) if step > start_step else None,
+                "metrics": metrics,
+            })
+        return reason
+
+    try:
+        reason = check()
+        while reason is None and solver.step_count < params.steps:
+            solver.step(min(params.save_every, params.steps - solver.step_count))
+            reason = check()
+    finally:
+        # 结束或取消时释放本次运行仍持有的共享帧，之后按 TTL / 预算清理
+        for name in published:
+            try:
+                shared.release(name)
+            except sqlite3.Error as e:
+                logger.warning(f"[相场模拟] 释放共享帧失败 {name}: {e}")
+
+    record = {
+        "params": params.to_dict(),
+        "criteria": criteria.to_dict() if criteria else None,
+        "start_step": start_step,
+        "frames": frames,
+        "energy": energy,
+        "convergence": monitor.history if monitor else [],
+        "stop": {"reason": reason or "max_steps", "step": solver.step_count},
+        "elapsed": round(time.perf_counter() - start, 3),
+    }
+    (output_dir / "run.json").write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info(
+        f"[相场模拟] 完成 - c0={params.c0}, M={params.mobility}, {solver.step_count - start_step} 步"
+        f"（{record['stop']['reason']}）, {len(frames)} 帧, 耗时 {record['elapsed']:.1f} s"
+    )
+    return record
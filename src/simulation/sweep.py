@@ -0,0 +1,231 @@
+"""
+参数扫描
+
+把"Al 20% ~ 40% 每 5%、三个温度"这类问题展开为一批配方，在进程池中并行模拟，
+逐点回调完成情况，并把各点的微观结构描述符汇总为一张表：
+- 网格扫描（grid）：各轴取值的笛卡尔积；取值为列表，或 {"start", "stop", "step"}（含端点）
+- 拉丁超立方（lhs）：各轴 {"min", "max"} 区间内分层抽样 samples 个点
+- 成分轴改变时由平衡元素（默认 Ti）补足，保持成分总和不变
+- 每个点经 TopPhiService.simulate_deposition 计算，已模拟过的配方直接命中结果缓存
+"""
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..vtk.workers import pool_context
+from .cache import COMPOSITION_KEYS
+
+
+# 扫描方式
+SWEEP_MODES = ("grid", "lhs")
+
+# 单次扫描的点数上限
+MAX_SWEEP_POINTS = 64
+
+# 汇总表的描述符列：(列名, 取值函数)
+DESCRIPTORS = (
+    ("mean_wavelength", lambda r: r["microstructure"].get("mean_wavelength")),
+    ("peak_wavelength", lambda r: r["microstructure"].get("peak_wavelength")),
+    ("rich_fraction", lambda r: (r["microstructure"].get("volume_fraction") or {}).get("rich")),
+    ("specific_interface_area", lambda r: r["microstructure"].get("specific_interface_area")),
+    ("final_energy", lambda r: r["simulation"]["final_energy"]),
+    ("lattice_constant", lambda r: r["lattice_constant"]),
+    ("domain_size_nm", lambda r: r["domain_size_nm"]),
+    ("steps_run", lambda r: r["simulation"].get("steps_run")),
+)
+
+
+def _axis_values(name: str, spec: Any) -> List[float]:
+    """网格轴取值：列表或 {"start", "stop", "step"}（含端点）"""
+    if isinstance(spec, dict):
+        start, stop, step = float(spec["start"]), float(spec["stop"]), float(spec["step"])
+        if step <= 0 or stop < start:
+            raise ValueError(f"无效的扫描区间 {name}: {spec}")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 6) for i in range(count)]
+    values = [float(v) for v in spec]
+    if not values:
+        raise ValueError(f"扫描轴 {name} 没有取值")
+    return values
+
+
+def expand_grid(axes: Dict[str, Any]) -> List[Dict[str, float]]:
+    """网格扫描：各轴取值的笛卡尔积（按轴名顺序，最后一个轴变化最快）"""
+    names = list(axes)
+    values = [_axis_values(name, axes[name]) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def latin_hypercube(axes: Dict[str, Any], samples: int, seed: int = 0) -> List[Dict[str, float]]:
+    """
+    拉丁超立方抽样：每个轴的区间等分为 samples 层，每层恰好取一个点，各轴层序独立打乱
+
+    Args:
+        axes: {轴名: {"min", "max"} 或 [min, max]}
+        samples: 点数
+        seed: 随机种子
+    """
+    if samples <= 0:
+        raise ValueError("拉丁超立方抽样需要 samples > 0")
+    rng = np.random.default_rng(seed)
+    points = [{} for _ in range(samples)]
+    for name, spec in axes.items():
+        low, high = (spec["min"], spec["max"]) if isinstance(spec, dict) else spec
+        if high < low:
+            raise ValueError(f"无效的抽样区间 {name}: {spec}")
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        for point, u in zip(points, strata):
+            point[name] = round(float(low + u * (high - low)), 6)
+    return points
+
+
+def build_points(spec: Dict[str, Any]) -> List[Dict[str, float]]:
+    """
+    按扫描规格展开各点的参数覆盖值
+
+    Args:
+        spec: {"mode": "grid" | "lhs", "axes": {...}, "samples": int, "seed": int}
+    """
+    mode = spec.get("mode", "grid")
+    axes = spec.get("axes") or {}
+    if mode not in SWEEP_MODES:
+        raise ValueError(f"不支持的扫描方式: {mode}，可选 {' / '.join(SWEEP_MODES)}")
+    if not axes:
+        raise ValueError("扫描规格缺少 axes")
+    if mode == "grid":
+        points = expand_grid(axes)
+    else:
+        points = latin_hypercube(axes, int(spec.get("samples") or 0), int(spec.get("seed") or 0))
+    if len(points) > MAX_SWEEP_POINTS:
+        raise ValueError(f"扫描点数 {len(points)} 超过上限 {MAX_SWEEP_POINTS}")
+    return points
+
+
+def apply_point(
+    composition: Dict[str, Any], params: Dict[str, Any], point: Dict[str, float], balance: str = "ti_content"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    把一个扫描点叠加到基准配方上
+
+    成分轴改变时由 balance 元素补足，保持成分总和不变（平衡元素本身也在扫描轴中时不调整）。
+
+    Returns:
+        {"composition", "params"}
+    """
+    composition, params = dict(composition), dict(params)
+    changed = 0.0
+    for name, value in point.items():
+        if name in COMPOSITION_KEYS:
+            changed += value - (composition.get(name) or 0)
+            composition[name] = value
+        else:
+            params[name] = value
+    if changed and balance not in point:
+        remainder = (composition.get(balance) or 0) - changed
+        if remainder < 0:
+            raise ValueError(f"扫描点 {point} 使平衡元素 {balance} 为负")
+        composition[balance] = round(remainder, 6)
+    return {"composition": composition, "params": params}
+
+
+def simulate_point(composition: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """单点模拟（进程池任务入口）"""
+    from ..services.topphi_service import TopPhiService
+
+    return TopPhiService().simulate_deposition(composition, params)
+
+
+def summarize_point(point: Dict[str, float], result: Dict[str, Any]) -> Dict[str, Any]:
+    """汇总表的一行：扫描轴取值 + 微观结构描述符 + 时间序列文件夹"""
+    row = dict(point)
+    for name, getter in DESCRIPTORS:
+        try:
+            value = getter(result)
+        except (KeyError, TypeError):
+            value = None
+        row[name] = round(value, 6) if isinstance(value, float) else value
+    row["folder"] = result["vtk_data"]["folder"]
+    row["cached"] = result.get("cache", {}).get("hit", False)
+    return row
+
+
+def format_table(columns: List[str], rows: List[Dict[str, Any]]) -> str:
+    """Markdown 表格（供 Agent 阅读）"""
+    def cell(value: Any) -> str:
+        if value is None:
+            return "-"
+        return f"{value:.4g}" if isinstance(value, float) else str(value)
+
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join("---" for _ in columns) + "|",
+    ]
+    lines += ["| " + " | ".join(cell(row.get(c)) for c in columns) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def run_sweep(
+    composition: Dict[str, Any],
+    params: Dict[str, Any],
+    spec: Dict[str, Any],
+    max_workers: int = 1,
+    on_point: Optional[Callable[[Dict[str, Any], int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    运行参数扫描
+
+    Args:
+        composition: 基准成分
+        params: 基准工艺参数
+        spec: 扫描规格（见 build_points），可含 "balance" 指定平衡元素
+        max_workers: 并行进程数
+        on_point: 每完成一个点回调 (行, 已完成数, 总数)；抛出异常即停止扫描（未开始的点撤销）
+
+    Returns:
+        {"spec", "axes", "columns", "rows"（按扫描点顺序）, "failed", "table"}
+    """
+    points = build_points(spec)
+    balance = spec.get("balance", "ti_content")
+    recipes = [apply_point(composition, params, point, balance) for point in points]
+    axes = list(points[0])
+    columns = axes + [name for name, _ in DESCRIPTORS]
+    rows: List[Optional[Dict[str, Any]]] = [None] * len(points)
+    failed = []
+
+    workers = max(1, min(max_workers, len(points)))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as pool:
+        pending = {
+            pool.submit(simulate_point, recipe["composition"], recipe["params"]): i
+            for i, recipe in enumerate(recipes)
+        }
+        done_count = 0
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    done_count += 1
+                    try:
+                        row = summarize_point(points[i], future.result())
+                    except Exception as e:
+                        row = {**points[i], "error": str(e)}
+                        failed.append(i)
+                    row["index"] = i
+                    rows[i] = row
+                    if on_point:
+                        on_point(row, done_count, len(points))
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return {
+        "spec": spec,
+        "axes": axes,
+        "columns": columns,
+        "rows": rows,
+        "failed": failed,
+        "table": format_table(columns, [row for row in rows if "error" not in row]),
+    }
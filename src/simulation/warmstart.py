@@ -0,0 +1,208 @@
+"""
+热启动
+
+用户微调一个参数（Al 30% -> 31%）时，不必再从噪声开始演化：
+- 参数空间索引：结果缓存中每个已完成的模拟登记一个参数点（Al 分数 c0、沉积温度），
+  按 PARAMETER_SCALES 归一化后建 KD 树，只在求解器设置（网格、时间步长等）相同的条目间检索
+- 最近邻在容差（SIM_WARM_START_TOLERANCE）内时，以其末帧为初始场：
+  整体平移到新的平均浓度（Cahn–Hilliard 守恒 <c>），并按无量纲时间 M·t 换算等效步数，
+  从该步继续演化到目标步数（至少 SIM_WARM_START_MIN_STEPS 步，让场适应新的成分与迁移率）
+- 邻居与新配方需同在调幅区内（或同在区外）：区外的末帧已均匀，无法再分解
+- 热启动的结果同样按配方写入缓存，模拟记录中注明来源条目与等效起始步
+
+节省的步数与结构偏差见 scripts/benchmark_warm_start.py。
+"""
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ..vtk.reader import load_scalars
+from .cache import SimulationCache, get_simulation_cache
+from .config import get_simulation_config
+from .phasefield import PhaseFieldParams, in_spinodal
+
+
+# 参数空间的归一化尺度：Al 分数 0.05、温度 50 °C 各记为距离 1
+PARAMETER_SCALES = (0.05, 50.0)
+
+
+class KDTree:
+    """静态 KD 树（按各轴中位数交替切分），用于最近邻查询"""
+
+    def __init__(self, points: np.ndarray):
+        self.points = np.asarray(points, dtype=np.float64)
+        self._nodes: List[List[int]] = []
+        self._root = self._build(np.arange(len(self.points)), 0)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _build(self, indices: np.ndarray, depth: int) -> int:
+        """递归建树，节点为 [点序号, 切分轴, 左子树, 右子树]，返回节点序号（空子树为 -1）"""
+        if len(indices) == 0:
+            return -1
+        axis = depth % self.points.shape[1]
+        indices = indices[np.argsort(self.points[indices, axis], kind="stable")]
+        mid = len(indices) // 2
+        node = len(self._nodes)
+        self._nodes.append([int(indices[mid]), axis, -1, -1])
+        self._nodes[node][2] = self._build(indices[:mid], depth + 1)
+        self._nodes[node][3] = self._build(indices[mid + 1:], depth + 1)
+        return node
+
+    def query(self, x: Sequence[float]) -> Tuple[float, int]:
+        """
+        最近邻
+
+        Returns:
+            (欧氏距离, 点序号)；树为空时为 (inf, -1)
+        """
+        x = np.asarray(x, dtype=np.float64)
+        best = [np.inf, -1]
+
+        def visit(node: int) -> None:
+            if node < 0:
+                return
+            index, axis, left, right = self._nodes[node]
+            distance = float(np.linalg.norm(self.points[index] - x))
+            if distance < best[0]:
+                best[:] = [distance, index]
+            diff = x[axis] - self.points[index, axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            # 切分面比当前最优更近时，另一侧才可能有更近的点
+            if abs(diff) < best[0]:
+                visit(far)
+
+        visit(self._root)
+        return best[0], best[1]
+
+
+def solver_signature(params: PhaseFieldParams) -> str:
+    """求解器设置（除成分、迁移率、步数、随机种子外的参数），只有设置相同的场才能互相热启动"""
+    return f"{params.grid}|{params.dt}|{params.kappa}|{params.barrier}|{params.stabilizer}"
+
+
+def parameter_point(params: PhaseFieldParams, temperature: float, steps: Optional[int] = None) -> Dict[str, Any]:
+    """
+    模拟在参数空间中的坐标（写入缓存的 points 表）
+
+    Args:
+        params: 模型参数
+        temperature: 沉积温度（°C）
+        steps: 末帧的步数（提前停止时小于 params.steps）
+    """
+    return {
+        "signature": solver_signature(params),
+        "c0": params.c0,
+        "temperature": float(temperature),
+        "mobility": params.mobility,
+        "steps": params.steps if steps is None else steps,
+    }
+
+
+def _scaled(point: Dict[str, Any]) -> List[float]:
+    return [point["c0"] / PARAMETER_SCALES[0], point["temperature"] / PARAMETER_SCALES[1]]
+
+
+def warm_start_state(
+    field: np.ndarray, neighbour: Dict[str, Any], params: PhaseFieldParams, min_steps: int
+) -> Tuple[np.ndarray, int]:
+    """
+    由邻居的末帧构造初始场与等效起始步
+
+    Args:
+        field: 邻居的末帧
+        neighbour: 邻居的参数点 {"mobility", "steps"（末帧步数）, ...}
+        params: 本次模拟的参数
+        min_steps: 至少演化的步数
+
+    Returns:
+        (初始场, 起始步)：初始场平均浓度为 params.c0；起始步为邻居的无量纲时间 M·t 在本次迁移率下
+        对应的步数，取整到输出间隔，且不超过 steps - min_steps
+    """
+    initial = field + (params.c0 - float(field.mean()))
+    equivalent = neighbour["mobility"] * neighbour["steps"] / params.mobility
+    start_step = int(equivalent) // params.save_every * params.save_every
+    return initial, max(0, min(start_step, params.steps - min_steps))
+
+
+class WarmStartIndex:
+    """参数空间最近邻索引（按求解器设置分组建 KD 树，缓存条目变化时重建）"""
+
+    def __init__(self, cache: SimulationCache, tolerance: float, min_steps: int):
+        self.cache = cache
+        self.tolerance = tolerance
+        self.min_steps = min_steps
+        self._trees: Dict[str, Tuple[Tuple[str, ...], KDTree, List[Dict[str, Any]]]] = {}
+
+    def nearest(self, point: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        最近的已完成模拟
+
+        Returns:
+            邻居参数点（附 distance，归一化距离），没有可用条目时为 None
+        """
+        rows = self.cache.points(point["signature"])
+        if not rows:
+            return None
+        keys = tuple(row["key"] for row in rows)
+        built = self._trees.get(point["signature"])
+        if built is None or built[0] != keys:
+            built = (keys, KDTree(np.array([_scaled(row) for row in rows])), rows)
+            self._trees[point["signature"]] = built
+        _, tree, rows = built
+        distance, index = tree.query(_scaled(point))
+        return {**rows[index], "distance": distance}
+
+    def prepare(self, params: PhaseFieldParams, temperature: float) -> Optional[Dict[str, Any]]:
+        """
+        查找容差内的邻居并读取其末帧
+
+        Returns:
+            {"from", "distance", "start_step", "initial"}；关闭、无邻居或超出容差时为 None
+        """
+        if self.tolerance <= 0:
+            return None
+        neighbour = self.nearest(parameter_point(params, temperature))
+        if neighbour is None or neighbour["distance"] > self.tolerance:
+            return None
+        # 调幅区外的邻居末帧已趋于均匀，均匀场不会再分解，不能作为调幅区内配方的初始场（反之亦然）
+        if in_spinodal(neighbour["c0"], params.barrier) != in_spinodal(params.c0, params.barrier):
+            return None
+        entry = self.cache.entry_dir(neighbour["key"])
+        try:
+            record = json.loads((entry / "run.json").read_text(encoding="utf-8"))
+            field, _ = load_scalars(entry / record["frames"][-1])
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            # 邻居可能刚被淘汰
+            logger.warning(f"[热启动] 读取邻居 {neighbour['key']} 失败，改为冷启动: {e}")
+            return None
+        if field.shape != (params.grid,) * 3:
+            return None
+        initial, start_step = warm_start_state(field.astype(np.float64), neighbour, params, self.min_steps)
+        logger.info(
+            f"[热启动] 邻居 {neighbour['key']}（距离 {neighbour['distance']:.3f}），"
+            f"从第 {start_step} 步继续，节省 {start_step}/{params.steps} 步"
+        )
+        return {
+            "from": neighbour["key"],
+            "distance": round(neighbour["distance"], 4),
+            "start_step": start_step,
+            "initial": initial,
+        }
+
+
+@lru_cache()
+def get_warm_start_index() -> WarmStartIndex:
+    """
+    获取热启动索引单例
+
+    返回:
+        WarmStartIndex: 索引实例
+    """
+    config = get_simulation_config()
+    return WarmStartIndex(get_simulation_cache(), config.warm_start_tolerance, config.warm_start_min_steps)
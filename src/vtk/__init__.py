@@ -0,0 +1,259 @@
+"""
+VTK 数据处理模块
+
+为 TopPhi 相场模拟输出的 Legacy VTK 文件提供：
+- 读取：按关键字解析头部，NumPy 批量转换数据段
+- 路径：相对数据根目录的文件 / 文件夹路径解析与越界校验
+- 流式解析：多 SCALARS/VECTORS 数据块定位、ASCII 分块转换、逐 z 平面生成器
+- 缓存：按帧（路径 + mtime）缓存的派生数据，含二进制 float32 转码
+- 共享帧：模拟工作进程发布到 /dev/shm 的内存映射数组，读取与切片直接映射，引用计数 + TTL/预算清理
+- LOD：2×2×2 块平均的多分辨率金字塔
+- 打包：整个时间序列量化 + 帧间整数差分 + zlib/lzma 压缩为单个数据流
+- 量化：按时间序列全局范围量化为 uint8/uint16，头部给出 scale/offset
+- 传输：强 ETag、Range 解析与 gzip/br 预压缩变体
+- 索引：SQLite 持久化的帧元数据，按 mtime 增量刷新
+- 存储：按时间与空间分块、zlib 压缩的四维数组，体素历史与子区域只读取相关块
+- 切片：基于 memmap 的二维切片与时间序列切片堆栈
+- 等值面：Surface Nets 网格提取 + 顶点聚类简化，在进程池中计算并缓存
+- 缩略图：MIP/平均投影 + 固定色标，纯 zlib 编码的 PNG，按帧缓存
+- 统计：结构因子径向谱、调幅波长、相体积分数与界面面积，按帧缓存
+- 对比：两帧差值场的范数、直方图与微结构指标变化，按帧指纹对缓存
+- 执行器：CPU 任务进程池 + 有界 I/O 线程池（run_io），路由按模板统计请求延迟
+- 动力学：进程池逐帧统计 + 粗化律 L(t) ~ t^n 拟合，按序列指纹缓存
+- 监视：轮询 data_root 中新增/变化的帧，有界队列 + 进程池预计算派生数据
+"""
+
+from .config import VTKConfig, get_vtk_config
+from .reader import read_header, parse_header, load_scalars
+from .parser import VTKField, scan_fields, iter_planes, read_field
+from .paths import resolve_vtk_path, resolve_folder
+from .cache import (
+    FrameCache,
+    get_frame_cache,
+    binary_header,
+    encode_binary_frame,
+    decode_binary_frame,
+    read_binary_header,
+)
+from .shared import SharedFrameStore, get_shared_frames, lookup_shared
+from .lod import MIN_LOD_SIZE, downsample, build_pyramid, get_lod_frame
+from .series import parse_time_step, list_series_frames
+from .bundle import (
+    DEFAULT_QUANTUM,
+    CODECS,
+    encode_series,
+    decode_series,
+    get_series_bundle,
+)
+from .quantize import (
+    QUANTIZE_DTYPES,
+    quantize,
+    quantize_params,
+    get_series_range,
+    resolve_range,
+    get_quantized_frame,
+)
+from .serving import (
+    make_etag,
+    etag_matches,
+    choose_encoding,
+    parse_range,
+    read_range,
+    get_precompressed,
+)
+from .index import VTKIndex, get_vtk_index
+from .slicing import open_volume, extract_slice, get_slice, get_slice_stack
+from .store import (
+    DEFAULT_CHUNKS,
+    ChunkedStore,
+    convert_series,
+    get_series_store,
+    parse_span,
+    encode_region,
+)
+from .isosurface import (
+    surface_nets,
+    decimate,
+    encode_mesh,
+    decode_mesh,
+    mesh_cache_path,
+    build_isosurface,
+)
+from .workers import (
+    POOL_START_METHOD,
+    pool_context,
+    get_process_pool,
+    shutdown_process_pool,
+    get_io_executor,
+    run_io,
+    io_status,
+    shutdown_io_executor,
+)
+from .metrics import LatencyMetrics, get_latency_metrics
+from .thumbnails import (
+    PROJECTIONS,
+    MAX_THUMBNAIL_SIZE,
+    encode_png,
+    project,
+    downsample_plane,
+    render_thumbnail,
+    thumbnail_path,
+    build_thumbnail,
+)
+from .analytics import (
+    structure_factor,
+    radial_spectrum,
+    characteristic_wavelengths,
+    interface_area,
+    compute_frame_stats,
+    get_frame_stats,
+    summarize_stats,
+)
+from .compare import (
+    compare_fields,
+    compare_stats,
+    get_comparison,
+    get_diff_frame,
+    summarize_comparison,
+)
+from .kinetics import fit_power_law, analyze_series, summarize_kinetics
+from .watcher import VTKWatcher, precompute_frame, get_vtk_watcher
+
+__all__ = [
+    # 配置
+    "VTKConfig",
+    "get_vtk_config",
+
+    # 读取
+    "read_header",
+    "parse_header",
+    "load_scalars",
+    "VTKField",
+    "scan_fields",
+    "iter_planes",
+    "read_field",
+
+    # 路径
+    "resolve_vtk_path",
+    "resolve_folder",
+
+    # 缓存
+    "FrameCache",
+    "get_frame_cache",
+    "binary_header",
+    "encode_binary_frame",
+    "decode_binary_frame",
+    "read_binary_header",
+
+    # 共享帧
+    "SharedFrameStore",
+    "get_shared_frames",
+    "lookup_shared",
+
+    # LOD
+    "MIN_LOD_SIZE",
+    "downsample",
+    "build_pyramid",
+    "get_lod_frame",
+
+    # 时间序列
+    "parse_time_step",
+    "list_series_frames",
+
+    # 打包
+    "DEFAULT_QUANTUM",
+    "CODECS",
+    "encode_series",
+    "decode_series",
+    "get_series_bundle",
+
+    # 量化
+    "QUANTIZE_DTYPES",
+    "quantize",
+    "quantize_params",
+    "get_series_range",
+    "resolve_range",
+    "get_quantized_frame",
+
+    # 传输
+    "make_etag",
+    "etag_matches",
+    "choose_encoding",
+    "parse_range",
+    "read_range",
+    "get_precompressed",
+
+    # 索引
+    "VTKIndex",
+    "get_vtk_index",
+
+    # 切片
+    "open_volume",
+    "extract_slice",
+    "get_slice",
+    "get_slice_stack",
+
+    # 分块存储
+    "DEFAULT_CHUNKS",
+    "ChunkedStore",
+    "convert_series",
+    "get_series_store",
+    "parse_span",
+    "encode_region",
+
+    # 等值面
+    "surface_nets",
+    "decimate",
+    "encode_mesh",
+    "decode_mesh",
+    "mesh_cache_path",
+    "build_isosurface",
+    "POOL_START_METHOD",
+    "pool_context",
+    "get_process_pool",
+    "shutdown_process_pool",
+
+    # 执行器与指标
+    "get_io_executor",
+    "run_io",
+    "io_status",
+    "shutdown_io_executor",
+    "LatencyMetrics",
+    "get_latency_metrics",
+
+    # 缩略图
+    "PROJECTIONS",
+    "MAX_THUMBNAIL_SIZE",
+    "encode_png",
+    "project",
+    "downsample_plane",
+    "render_thumbnail",
+    "thumbnail_path",
+    "build_thumbnail",
+
+    # 统计
+    "structure_factor",
+    "radial_spectrum",
+    "characteristic_wavelengths",
+    "interface_area",
+    "compute_frame_stats",
+    "get_frame_stats",
+    "summarize_stats",
+
+    # 对比
+    "compare_fields",
+    "compare_stats",
+    "get_comparison",
+    "get_diff_frame",
+    "summarize_comparison",
+
+    # 动力学
+    "fit_power_law",
+    "analyze_series",
+    "summarize_kinetics",
+
+    # 监视
+    "VTKWatcher",
+    "precompute_frame",
+    "get_vtk_watcher",
+]
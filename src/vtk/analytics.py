@@ -0,0 +1,196 @@
+"""
+单帧微观结构统计
+
+对相场浓度场做向量化分析：
+- 结构因子 S(k) = |FFT(c - <c>)|² / N（三维 rfftn）
+- 径向平均谱：按 |k| 分壳平均，k 以 1/长度 为单位（spacing 换算为物理长度）
+- 调幅波长：谱峰波长 1/k_peak 与一阶矩波长 1/<k>（后者对噪声更稳健）
+- 相体积分数：以阈值（默认为场均值）划分富/贫两相
+- 界面面积：阈值等值面（Surface Nets，周期性边界）三角形面积之和，及比表面积 S_v
+
+结果按帧缓存为 JSON（与二进制帧同一缓存目录，kind="stats"）。
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import FrameCache
+from .isosurface import surface_nets
+from .reader import load_scalars
+
+
+STATS_VERSION = 1
+
+
+def structure_factor(field: np.ndarray) -> np.ndarray:
+    """
+    计算结构因子 S(k)
+
+    Args:
+        field: 形状为 (nz, ny, nx) 的标量场
+
+    Returns:
+        rfftn 半谱上的 S(k)，形状为 (nz, ny, nx // 2 + 1)
+    """
+    fluctuation = np.asarray(field, dtype=np.float64)
+    fluctuation = fluctuation - fluctuation.mean()
+    amplitude = np.fft.rfftn(fluctuation)
+    return (amplitude.real ** 2 + amplitude.imag ** 2) / fluctuation.size
+
+
+def wavenumber_magnitude(shape: Sequence[int], spacing: Sequence[float]) -> np.ndarray:
+    """
+    rfftn 半谱各点的 |k|（单位 1/长度）
+
+    Args:
+        shape: 实空间形状 (nz, ny, nx)
+        spacing: 网格间距 [dx, dy, dz]
+    """
+    nz, ny, nx = shape
+    dx, dy, dz = spacing
+    kz = np.fft.fftfreq(nz, d=dz)[:, None, None]
+    ky = np.fft.fftfreq(ny, d=dy)[None, :, None]
+    kx = np.fft.rfftfreq(nx, d=dx)[None, None, :]
+    return np.sqrt(kz ** 2 + ky ** 2 + kx ** 2)
+
+
+def radial_spectrum(
+    s_k: np.ndarray, shape: Sequence[int], spacing: Sequence[float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    径向平均谱
+
+    Args:
+        s_k: structure_factor 的结果
+        shape: 实空间形状 (nz, ny, nx)
+        spacing: 网格间距 [dx, dy, dz]
+
+    Returns:
+        (各壳中心 k, 各壳平均 S)，不含 k=0，空壳已去除
+    """
+    k = wavenumber_magnitude(shape, spacing)
+    # 壳宽取最粗方向的频率分辨率
+    dk = 1.0 / max(n * d for n, d in zip(shape, reversed(list(spacing))))
+    shell = np.rint(k / dk).astype(np.int64).ravel()
+    counts = np.bincount(shell)
+    sums = np.bincount(shell, weights=s_k.ravel())
+    valid = counts > 0
+    valid[0] = False
+    shells = np.nonzero(valid)[0]
+    return shells * dk, sums[valid] / counts[valid]
+
+
+def characteristic_wavelengths(k: np.ndarray, spectrum: np.ndarray) -> Dict[str, Optional[float]]:
+    """
+    由径向谱计算特征波长
+
+    Returns:
+        {"peak_k", "peak_wavelength", "mean_k", "mean_wavelength"}，谱为零时为 None
+    """
+    total = float(spectrum.sum())
+    if len(k) == 0 or total <= 0:
+        return {"peak_k": None, "peak_wavelength": None, "mean_k": None, "mean_wavelength": None}
+    peak_k = float(k[int(np.argmax(spectrum))])
+    mean_k = float((k * spectrum).sum() / total)
+    return {
+        "peak_k": peak_k,
+        "peak_wavelength": 1.0 / peak_k,
+        "mean_k": mean_k,
+        "mean_wavelength": 1.0 / mean_k,
+    }
+
+
+def interface_area(field: np.ndarray, threshold: float, spacing: Sequence[float]) -> float:
+    """
+    阈值等值面的面积（物理单位，按周期性边界计算）
+
+    场按周期延拓一层后提取等值面，只保留重心落在一个周期 [-0.5, n-0.5) 内的三角形，
+    既补上边界处缺失的半个单元，又不会重复计数。
+
+    Args:
+        field: 形状为 (nz, ny, nx) 的标量场
+        threshold: 相界阈值
+        spacing: 网格间距 [dx, dy, dz]
+    """
+    vertices, triangles = surface_nets(np.pad(field, 1, mode="wrap"), threshold)
+    if len(triangles) == 0:
+        return 0.0
+    corners = vertices.astype(np.float64)[triangles] - 1.0  # (M, 3 顶点, xyz)
+    period = np.asarray(field.shape[::-1], dtype=np.float64)
+    centroid = corners.mean(axis=1)
+    keep = np.all((centroid >= -0.5) & (centroid < period - 0.5), axis=1)
+    corners = corners[keep] * np.asarray(spacing, dtype=np.float64)
+    a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+    return float(0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum())
+
+
+def compute_frame_stats(
+    field: np.ndarray, spacing: Sequence[float], threshold: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    计算一帧的全部统计量
+
+    Args:
+        field: 形状为 (nz, ny, nx) 的标量场
+        spacing: 网格间距 [dx, dy, dz]
+        threshold: 相界阈值（默认为场均值，对守恒的调幅分解即平均成分）
+
+    Returns:
+        统计结果字典
+    """
+    field = np.asarray(field, dtype=np.float32)
+    mean = float(field.mean())
+    threshold = mean if threshold is None else float(threshold)
+
+    s_k = structure_factor(field)
+    k, spectrum = radial_spectrum(s_k, field.shape, spacing)
+
+    rich_fraction = float(np.count_nonzero(field > threshold)) / field.size
+    volume = float(field.size * np.prod(spacing))
+    area = interface_area(field, threshold, spacing)
+
+    return {
+        "version": STATS_VERSION,
+        "threshold": threshold,
+        "mean": mean,
+        "std": float(field.std()),
+        "range": [float(field.min()), float(field.max())],
+        "volume_fraction": {"rich": rich_fraction, "lean": 1.0 - rich_fraction},
+        "interface_area": area,
+        "specific_interface_area": area / volume if volume > 0 else None,
+        **characteristic_wavelengths(k, spectrum),
+        "spectrum": {"k": k.tolist(), "s": spectrum.tolist()},
+    }
+
+
+def get_frame_stats(cache: FrameCache, source: Path, threshold: Optional[float] = None) -> Dict[str, Any]:
+    """
+    获取一帧的统计结果（按帧 + 阈值缓存）
+
+    Args:
+        cache: 帧缓存
+        source: VTK 源文件
+        threshold: 相界阈值（None 为场均值）
+
+    Returns:
+        统计结果字典（含 spacing 与 dimensions）
+    """
+    suffix = ".stats.json" if threshold is None else f".t{threshold:g}.stats.json"
+    target = cache.path_for(source, "stats", suffix)
+    if target.exists():
+        return json.loads(target.read_text(encoding="utf-8"))
+
+    field, meta = load_scalars(source)
+    stats = compute_frame_stats(field, meta["spacing"], threshold)
+    stats["dimensions"] = meta["dimensions"]
+    stats["spacing"] = meta["spacing"]
+    stats["scalar_name"] = meta["scalar_name"]
+    cache.write_atomic(target, json.dumps(stats, ensure_ascii=False).encode("utf-8"))
+    return stats
+
+
+def summarize_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """去掉径向谱数组的精简版本（用于模拟结果与 Agent 上下文）"""
+    return {key: value for key, value in stats.items() if key != "spectrum"}
@@ -0,0 +1,203 @@
+"""
+时间序列增量编码打包
+
+将一个文件夹内的全部帧打包为单个数据流：
+- 所有帧先按固定量化步长 quantum 量化为整数（最大误差 quantum / 2，解码为 float32 另有舍入）
+- 第一帧作为关键帧存储量化值，后续帧存储与前一帧量化值的整数差
+- 每帧选用能容纳的最窄整数类型，按字节平面重排后用 zlib / lzma 压缩
+
+在整数域做差分，解码时逐帧累加不会产生误差累积。
+
+数据流格式（小端序）：
+    b"VTKS" | uint32 头部长度 | JSON 头部（空格填充到 4 字节对齐）| 各帧压缩数据
+头部 frames[i].offset 为相对于数据区起点的偏移。
+"""
+import json
+import lzma
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .cache import FrameCache
+from .reader import load_scalars
+from .series import list_series_frames
+
+
+BUNDLE_MAGIC = b"VTKS"
+BUNDLE_VERSION = 1
+
+# 默认量化步长（TopPhi 输出约 6 位有效数字，c ∈ [0, 1]）
+DEFAULT_QUANTUM = 1e-5
+
+# 压缩编解码器: 名称 -> (压缩, 解压)
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+
+
+def _narrowest_int(values: np.ndarray) -> np.dtype:
+    """选择能容纳全部取值的最窄有符号整数类型"""
+    bound = int(np.abs(values).max()) if values.size else 0
+    for dtype in (np.int8, np.int16, np.int32):
+        if bound <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """按字节平面重排（同一字节位集中存放，高位字节大多为 0/0xFF，利于压缩）"""
+    raw = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder("<"))
+    return raw.view(np.uint8).reshape(-1, values.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype, count: int) -> np.ndarray:
+    """_shuffle 的逆操作"""
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, count)
+    return np.ascontiguousarray(planes.T).view(dtype.newbyteorder("<")).reshape(count)
+
+
+def encode_series(
+    frames: List[Tuple[int, str, np.ndarray]],
+    meta: Dict[str, Any],
+    quantum: float = DEFAULT_QUANTUM,
+    codec: str = "zlib",
+) -> bytes:
+    """
+    编码时间序列
+
+    Args:
+        frames: (时间步, 文件名, 形状为 (nz, ny, nx) 的标量场) 列表，按时间步排序
+        meta: 首帧元数据（dimensions/origin/spacing/scalar_name）
+        quantum: 量化步长
+        codec: 压缩方式（zlib / lzma）
+
+    Returns:
+        打包后的字节串
+    """
+    if codec not in CODECS:
+        raise ValueError(f"不支持的压缩方式: {codec}")
+    if quantum <= 0:
+        raise ValueError("量化步长必须大于 0")
+    compress, _ = CODECS[codec]
+
+    entries = []
+    blobs = []
+    offset = 0
+    previous = None
+    for time_step, name, array in frames:
+        quantized = np.rint(np.asarray(array, dtype=np.float64) / quantum).astype(np.int64).ravel()
+        payload = quantized if previous is None else quantized - previous
+        previous = quantized
+
+        dtype = _narrowest_int(payload)
+        blob = compress(_shuffle(payload.astype(dtype)))
+        entries.append({
+            "time_step": time_step,
+            "name": name,
+            "kind": "key" if len(entries) == 0 else "delta",
+            "dtype": dtype.name,
+            "offset": offset,
+            "length": len(blob),
+            "range": [float(np.min(array)), float(np.max(array))],
+        })
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = {
+        "version": BUNDLE_VERSION,
+        "dimensions": meta["dimensions"],
+        "origin": meta["origin"],
+        "spacing": meta["spacing"],
+        "scalar_name": meta["scalar_name"],
+        "point_count": int(frames[0][2].size) if frames else 0,
+        "quantum": quantum,
+        "max_error": quantum / 2,
+        "codec": codec,
+        "frame_count": len(entries),
+        "frames": entries,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 4)
+    return BUNDLE_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + b"".join(blobs)
+
+
+def decode_series(buffer: bytes) -> Tuple[Dict[str, Any], List[np.ndarray]]:
+    """
+    解码时间序列
+
+    Args:
+        buffer: encode_series 生成的字节串
+
+    Returns:
+        (头部, 各帧形状为 (nz, ny, nx) 的 float32 数组列表)
+    """
+    if buffer[:4] != BUNDLE_MAGIC:
+        raise ValueError("不是有效的时间序列数据包")
+    (header_len,) = struct.unpack_from("<I", buffer, 4)
+    header = json.loads(buffer[8:8 + header_len].decode("utf-8"))
+    _, decompress = CODECS[header["codec"]]
+
+    nx, ny, nz = header["dimensions"]
+    count = nx * ny * nz
+    base = 8 + header_len
+    quantum = header["quantum"]
+
+    arrays = []
+    current = None
+    for entry in header["frames"]:
+        start = base + entry["offset"]
+        data = decompress(buffer[start:start + entry["length"]])
+        payload = _unshuffle(data, np.dtype(entry["dtype"]), count).astype(np.int64)
+        current = payload if entry["kind"] == "key" else current + payload
+        arrays.append((current * quantum).astype(np.float32).reshape(nz, ny, nx))
+    return header, arrays
+
+
+def get_series_bundle(
+    cache: FrameCache,
+    folder: Path,
+    quantum: float = DEFAULT_QUANTUM,
+    codec: str = "zlib",
+) -> Path:
+    """
+    获取文件夹的时间序列数据包（不存在则编码生成）
+
+    Args:
+        cache: 帧缓存
+        folder: 时间序列文件夹
+        quantum: 量化步长
+        codec: 压缩方式
+
+    Returns:
+        数据包缓存路径
+    """
+    frames = list_series_frames(folder)
+    if not frames:
+        raise ValueError(f"文件夹中没有VTK文件: {folder.name}")
+
+    key = cache.series_key([path for _, path in frames])
+    target = cache.cache_dir / "bundle" / f"{key}.{codec}.q{quantum:g}.vtks"
+    if target.exists():
+        return target
+
+    loaded = []
+    meta = None
+    for time_step, path in frames:
+        array, frame_meta = load_scalars(path)
+        meta = meta or frame_meta
+        if frame_meta["dimensions"] != meta["dimensions"]:
+            raise ValueError(f"时间序列帧尺寸不一致: {path.name}")
+        loaded.append((time_step, path.name, array))
+
+    cache.write_atomic(target, encode_series(loaded, meta, quantum, codec))
+    source_size = sum(path.stat().st_size for _, path in frames)
+    logger.info(
+        f"[VTK打包] {folder.name}: {len(frames)} 帧, "
+        f"{source_size / 1024 / 1024:.2f} MB -> {target.stat().st_size / 1024 / 1024:.2f} MB ({codec})"
+    )
+    return target
@@ -0,0 +1,273 @@
+"""
+VTK 派生数据磁盘缓存
+
+以「相对路径 + mtime + 文件大小」作为帧的缓存键，源文件一旦改动缓存自动失效。
+目前提供 ASCII -> 二进制 float32 的转码缓存。
+
+二进制帧格式（小端序）：
+    b"VTKB" | uint32 头部长度 | JSON 头部（空格填充到 4 字节对齐）| float32 数据
+前端可直接用 Float32Array(buffer, 8 + 头部长度) 读取数据，无需文本解析。
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .config import get_vtk_config
+from .reader import load_scalars
+
+
+BINARY_MAGIC = b"VTKB"
+BINARY_VERSION = 1
+
+# 读取二进制帧头部时的最大字节数
+MAX_BINARY_HEADER = 64 * 1024
+
+class FrameCache:
+    """
+    帧级派生数据缓存
+
+    目录结构: {cache_dir}/{kind}/{key}{suffix}
+    """
+
+    def __init__(self, cache_dir: Path, data_root: Path):
+        self.cache_dir = Path(cache_dir)
+        self.data_root = Path(data_root)
+
+    def frame_key(self, source: Path) -> str:
+        """计算帧缓存键（源文件变化后键随之变化）"""
+        stat = source.stat()
+        try:
+            rel = source.resolve().relative_to(self.data_root.resolve()).as_posix()
+        except ValueError:
+            rel = source.resolve().as_posix()
+        raw = f"{rel}|{stat.st_mtime_ns}|{stat.st_size}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def series_key(self, sources: List[Path]) -> str:
+        """计算一组帧的缓存键（任一帧变化、增删帧后键随之变化）"""
+        raw = "|".join(self.frame_key(source) for source in sources)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def path_for(self, source: Path, kind: str, suffix: str) -> Path:
+        """获取某类派生数据的缓存路径"""
+        return self.cache_dir / kind / f"{self.frame_key(source)}{suffix}"
+
+    def purge(self, sources: List[Path]) -> int:
+        """
+        删除一组帧的全部派生数据（源文件删除前调用，需要源文件仍存在以计算缓存键）
+
+        删除各类别下以帧缓存键开头的文件（二进制、LOD、统计、缩略图、网格等），
+        以及以整组帧的序列键命名的条目（值域、动力学、序列包、分块存储）
+
+        Args:
+            sources: 同一时间序列的帧（按时间步升序）
+
+        Returns:
+            删除的条目数
+        """
+        sources = [source for source in sources if source.exists()]
+        if not sources or not self.cache_dir.is_dir():
+            return 0
+        prefixes = [self.frame_key(source) for source in sources]
+        prefixes.append(self.series_key(sources))
+        removed = 0
+        for kind_dir in self.cache_dir.iterdir():
+            if not kind_dir.is_dir():
+                continue
+            for prefix in prefixes:
+                for path in kind_dir.glob(f"{prefix}*"):
+                    if path.is_dir():
+                        shutil.rmtree(path, ignore_errors=True)
+                    else:
+                        path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+    def write_atomic(self, path: Path, data: bytes, mode: Optional[int] = None) -> Path:
+        """
+        原子写入缓存文件（先写临时文件再替换，避免并发读到半成品）
+
+        Args:
+            path: 目标路径
+            data: 文件内容
+            mode: 文件权限（默认同普通新建文件，由内核按 umask 从 0666 去掉相应位；
+                不用 mkstemp：其临时文件只有属主可读，nginx 等以其他用户运行的进程无法读取）
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.parent / f"{path.name}.{uuid.uuid4().hex[:8]}.tmp"
+        fd = os.open(tmp, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            if mode is not None:
+                os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return path
+
+    def get_binary_frame(self, source: Path) -> Path:
+        """
+        获取帧的二进制缓存（不存在则转码生成）
+
+        Args:
+            source: VTK 源文件
+
+        Returns:
+            二进制缓存文件路径
+        """
+        target = self.path_for(source, "binary", ".vtkb")
+        if target.exists():
+            return target
+
+        array, meta = load_scalars(source)
+        self.write_atomic(target, encode_binary_frame(array, binary_header(array, meta)))
+        logger.info(
+            f"[VTK缓存] 转码完成: {source.name} -> {target.name}, "
+            f"{source.stat().st_size / 1024 / 1024:.2f} MB -> {target.stat().st_size / 1024 / 1024:.2f} MB"
+        )
+        return target
+
+    def get_frame_range(self, source: Path) -> Tuple[float, float]:
+        """
+        帧的取值范围（不转码）
+
+        依次取二进制缓存头部的 range、按帧缓存的范围文件；都没有时读取数据计算
+        （模拟工作进程已发布的共享帧直接取共享元数据中的 range），结果写入范围文件
+
+        Args:
+            source: VTK 源文件
+
+        Returns:
+            (vmin, vmax)
+        """
+        binary = self.path_for(source, "binary", ".vtkb")
+        if binary.exists():
+            with open(binary, "rb") as f:
+                header, _ = read_binary_header(f.read(MAX_BINARY_HEADER))
+            vmin, vmax = header["range"]
+            return vmin, vmax
+
+        target = self.path_for(source, "range", ".frame.json")
+        if target.exists():
+            vmin, vmax = json.loads(target.read_text(encoding="utf-8"))["range"]
+            return vmin, vmax
+
+        array, meta = load_scalars(source)
+        vmin, vmax = meta.get("range") or (float(array.min()), float(array.max()))
+        self.write_atomic(target, json.dumps({"range": [vmin, vmax]}).encode("utf-8"))
+        return vmin, vmax
+
+
+def binary_header(array: np.ndarray, meta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    float32 二进制帧头部
+
+    Args:
+        array: 形状为 (nz, ny, nx) 的标量场
+        meta: 源文件元数据（含 range 时不再遍历数组求取值范围）
+    """
+    value_range = meta.get("range") or [float(array.min()), float(array.max())]
+    return {
+        "version": BINARY_VERSION,
+        "dimensions": meta["dimensions"],
+        "origin": meta["origin"],
+        "spacing": meta["spacing"],
+        "point_count": int(array.size),
+        "scalar_name": meta["scalar_name"],
+        "dtype": "float32",
+        "byte_order": "little",
+        "range": value_range,
+    }
+
+
+# 头部 dtype 字段 -> 小端 NumPy dtype
+PAYLOAD_DTYPES = {
+    "float32": "<f4",
+    "uint16": "<u2",
+    "uint8": "u1",
+}
+
+
+def encode_binary_frame(array: np.ndarray, header: Dict[str, Any]) -> bytes:
+    """
+    编码二进制帧
+
+    Args:
+        array: 标量场（任意形状，按 C 顺序展平）
+        header: JSON 头部，dtype 字段决定数据类型（默认 float32）
+
+    Returns:
+        二进制帧字节串
+    """
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    # 8 字节前缀 + 头部后保持 4 字节对齐，保证 Float32Array 可直接视图
+    header_bytes += b" " * (-len(header_bytes) % 4)
+    dtype = PAYLOAD_DTYPES[header.get("dtype", "float32")]
+    data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+    return BINARY_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + data
+
+
+def read_binary_header(buffer: bytes) -> Tuple[Dict[str, Any], int]:
+    """
+    解析二进制帧头部
+
+    Args:
+        buffer: 至少包含完整头部的字节串
+
+    Returns:
+        (头部, 数据段起始偏移)
+    """
+    if buffer[:4] != BINARY_MAGIC:
+        raise ValueError("不是有效的二进制VTK帧")
+    (header_len,) = struct.unpack_from("<I", buffer, 4)
+    header = json.loads(buffer[8:8 + header_len].decode("utf-8"))
+    return header, 8 + header_len
+
+
+def payload_shape(header: Dict[str, Any]) -> Tuple[int, ...]:
+    """数据段形状：优先使用 shape 字段，否则按 dimensions (x, y, z) 得到 (nz, ny, nx)"""
+    if "shape" in header:
+        return tuple(header["shape"])
+    nx, ny, nz = header["dimensions"]
+    return nz, ny, nx
+
+
+def decode_binary_frame(buffer: bytes) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    解码二进制帧
+
+    Args:
+        buffer: 二进制帧字节串
+
+    Returns:
+        (头部, 数据数组；体数据形状为 (nz, ny, nx))
+    """
+    header, offset = read_binary_header(buffer)
+    shape = payload_shape(header)
+    dtype = PAYLOAD_DTYPES[header.get("dtype", "float32")]
+    array = np.frombuffer(buffer, dtype=dtype, offset=offset, count=int(np.prod(shape)))
+    return header, array.reshape(shape)
+
+
+@lru_cache()
+def get_frame_cache() -> FrameCache:
+    """
+    获取帧缓存单例
+
+    返回:
+        FrameCache: 帧缓存实例
+    """
+    config = get_vtk_config()
+    return FrameCache(config.cache_dir, config.data_root)
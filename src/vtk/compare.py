@@ -0,0 +1,160 @@
+"""
+帧间差异与模拟结果对比
+
+对两个 VTK 帧（同一次或不同模拟）计算差值场 b - a 及其统计：
+- 范数：L2（总和）、RMS、L∞、相对 L2（||b - a|| / ||a||）
+- 差值直方图（区间关于 0 对称）
+- 微结构指标的差：结构因子峰位 / 调幅波长、富相体积分数、比界面面积（复用按帧缓存的 get_frame_stats）
+
+结果按两帧的指纹对（路径 + mtime + 大小，有序）缓存为 JSON，差值场按需缓存为二进制帧。
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .analytics import get_frame_stats
+from .cache import BINARY_VERSION, FrameCache, encode_binary_frame
+from .slicing import open_volume
+
+
+COMPARE_VERSION = 1
+
+# 默认直方图区间数
+DEFAULT_BINS = 64
+
+# 参与对比的微结构指标
+STAT_KEYS = (
+    "mean",
+    "std",
+    "peak_k",
+    "peak_wavelength",
+    "mean_k",
+    "mean_wavelength",
+    "specific_interface_area",
+)
+
+
+def pair_key(cache: FrameCache, source_a: Path, source_b: Path) -> str:
+    """两帧的有序缓存键（交换顺序后差值符号相反，键也不同）"""
+    raw = f"{cache.frame_key(source_a)}|{cache.frame_key(source_b)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def compare_fields(a: np.ndarray, b: np.ndarray, bins: int = DEFAULT_BINS) -> Dict[str, Any]:
+    """
+    计算差值场 b - a 的范数与直方图
+
+    Args:
+        a: 基准场
+        b: 对比场（形状与 a 相同）
+        bins: 直方图区间数
+
+    Returns:
+        {"l2", "rms", "linf", "relative_l2", "mean_diff", "histogram": {"edges", "counts"}}
+    """
+    if a.shape != b.shape:
+        raise ValueError(f"两帧网格尺寸不一致: {a.shape} != {b.shape}")
+    a = np.asarray(a, dtype=np.float64)
+    diff = np.asarray(b, dtype=np.float64) - a
+    l2 = float(np.sqrt(np.square(diff).sum()))
+    norm_a = float(np.sqrt(np.square(a).sum()))
+    linf = float(np.abs(diff).max())
+    counts, edges = np.histogram(diff, bins=bins, range=(-linf, linf) if linf > 0 else (-1.0, 1.0))
+    return {
+        "l2": l2,
+        "rms": l2 / np.sqrt(diff.size),
+        "linf": linf,
+        "relative_l2": l2 / norm_a if norm_a > 0 else None,
+        "mean_diff": float(diff.mean()),
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+    }
+
+
+def compare_stats(stats_a: Dict[str, Any], stats_b: Dict[str, Any]) -> Dict[str, Any]:
+    """微结构指标对比：{指标: {"a", "b", "delta", "relative"}}"""
+    metrics = {key: (stats_a.get(key), stats_b.get(key)) for key in STAT_KEYS}
+    metrics["rich_fraction"] = (stats_a["volume_fraction"]["rich"], stats_b["volume_fraction"]["rich"])
+    result = {}
+    for key, (value_a, value_b) in metrics.items():
+        delta = value_b - value_a if value_a is not None and value_b is not None else None
+        result[key] = {
+            "a": value_a,
+            "b": value_b,
+            "delta": delta,
+            "relative": delta / value_a if delta is not None and value_a else None,
+        }
+    return result
+
+
+def get_comparison(
+    cache: FrameCache, source_a: Path, source_b: Path, bins: int = DEFAULT_BINS
+) -> Dict[str, Any]:
+    """
+    获取两帧的对比结果（按帧指纹对 + 区间数缓存）
+
+    Args:
+        cache: 帧缓存
+        source_a: 基准帧
+        source_b: 对比帧
+        bins: 直方图区间数
+
+    Returns:
+        {"a", "b", "field": compare_fields 结果, "microstructure": compare_stats 结果}
+    """
+    target = cache.cache_dir / "compare" / f"{pair_key(cache, source_a, source_b)}.b{bins}.json"
+    if target.exists():
+        return json.loads(target.read_text(encoding="utf-8"))
+
+    _, a = open_volume(cache, source_a)
+    _, b = open_volume(cache, source_b)
+    result = {
+        "version": COMPARE_VERSION,
+        "a": source_a.name,
+        "b": source_b.name,
+        "dimensions": list(a.shape[::-1]),
+        "field": compare_fields(a, b, bins),
+        "microstructure": compare_stats(get_frame_stats(cache, source_a), get_frame_stats(cache, source_b)),
+    }
+    cache.write_atomic(target, json.dumps(result, ensure_ascii=False).encode("utf-8"))
+    return result
+
+
+def get_diff_frame(cache: FrameCache, source_a: Path, source_b: Path) -> Path:
+    """
+    获取差值场 b - a 的二进制帧（格式同 /files?format=binary，几何信息取自帧 a）
+
+    Returns:
+        二进制帧缓存路径
+    """
+    target = cache.cache_dir / "compare" / f"{pair_key(cache, source_a, source_b)}.diff.vtkb"
+    if target.exists():
+        return target
+
+    header_a, a = open_volume(cache, source_a)
+    _, b = open_volume(cache, source_b)
+    if a.shape != b.shape:
+        raise ValueError(f"两帧网格尺寸不一致: {a.shape} != {b.shape}")
+    diff = np.asarray(b, dtype=np.float32) - np.asarray(a, dtype=np.float32)
+    header = {
+        "version": BINARY_VERSION,
+        "dimensions": header_a["dimensions"],
+        "origin": header_a["origin"],
+        "spacing": header_a["spacing"],
+        "point_count": int(diff.size),
+        "scalar_name": f"diff_{header_a.get('scalar_name', 'scalars')}",
+        "dtype": "float32",
+        "byte_order": "little",
+        "range": [float(diff.min()), float(diff.max())],
+        "a": source_a.name,
+        "b": source_b.name,
+    }
+    return cache.write_atomic(target, encode_binary_frame(diff, header))
+
+
+def summarize_comparison(result: Dict[str, Any]) -> Dict[str, Any]:
+    """精简版本（去掉直方图，用于 Agent 上下文）"""
+    field = {key: value for key, value in result["field"].items() if key != "histogram"}
+    return {**result, "field": field}
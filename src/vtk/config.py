@@ -0,0 +1,95 @@
+"""
+VTK 模块配置
+
+从环境变量加载 VTK 数据根目录与派生数据缓存目录
+"""
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from functools import lru_cache
+
+
+# 项目根目录（与 vtk_routes.PROJECT_ROOT 保持一致）
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def _default_shared_dir() -> Path:
+    """共享数组默认目录：优先内存文件系统 /dev/shm（按缓存目录区分部署），否则放在缓存目录下"""
+    cache_dir = Path(os.getenv("VTK_CACHE_DIR", str(PROJECT_ROOT / ".vtk_cache"))).resolve()
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / f"topmat-vtk-{hashlib.sha1(str(cache_dir).encode('utf-8')).hexdigest()[:8]}"
+    return cache_dir / "shared"
+
+
+@dataclass
+class VTKConfig:
+    """
+    VTK 配置类
+
+    属性:
+        data_root: VTK 文件所在的根目录
+        cache_dir: 派生数据（二进制帧等）的磁盘缓存目录
+        index_ttl: 元数据索引中文件夹扫描结果的有效期（秒）
+        max_workers: CPU 密集任务（等值面提取等）进程池的最大进程数
+        io_threads: 阻塞文件操作（读取、缓存、索引）线程池的线程数
+        watch_enabled: 是否启动后台目录监视（新增/变化的 VTK 文件自动预计算派生数据）
+        watch_interval: 目录监视的轮询间隔（秒）
+        watch_queue: 目录监视待处理任务队列上限（队列满时暂停入队）
+        shared_enabled: 模拟工作进程是否把写出的帧发布为共享内存映射数组（读取时跳过 ASCII 解析）
+        shared_dir: 共享数组目录（默认 /dev/shm 下，不存在时为缓存目录下的 shared）
+        shared_budget_mb: 共享数组总大小上限（MB），超出时淘汰最久未访问且无引用的数组
+        shared_ttl: 无引用的共享数组在最后一次访问后保留的时间（秒）
+        shared_pin_frames: 模拟运行期间持有引用的最近帧数（更早的帧释放引用，按 TTL / 预算清理）
+    """
+    data_root: Path = field(
+        default_factory=lambda: Path(os.getenv("VTK_DATA_ROOT", str(PROJECT_ROOT)))
+    )
+    cache_dir: Path = field(
+        default_factory=lambda: Path(os.getenv("VTK_CACHE_DIR", str(PROJECT_ROOT / ".vtk_cache")))
+    )
+    index_ttl: float = field(
+        default_factory=lambda: float(os.getenv("VTK_INDEX_TTL", "30"))
+    )
+    max_workers: int = field(
+        default_factory=lambda: int(os.getenv("VTK_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+    )
+    io_threads: int = field(
+        default_factory=lambda: int(os.getenv("VTK_IO_THREADS", "8"))
+    )
+    watch_enabled: bool = field(
+        default_factory=lambda: os.getenv("VTK_WATCH", "true").lower() in ("1", "true", "yes")
+    )
+    watch_interval: float = field(
+        default_factory=lambda: float(os.getenv("VTK_WATCH_INTERVAL", "10"))
+    )
+    watch_queue: int = field(
+        default_factory=lambda: int(os.getenv("VTK_WATCH_QUEUE", "64"))
+    )
+    shared_enabled: bool = field(
+        default_factory=lambda: os.getenv("VTK_SHARED_FRAMES", "true").lower() in ("1", "true", "yes")
+    )
+    shared_dir: Path = field(
+        default_factory=lambda: Path(os.getenv("VTK_SHARED_DIR", "") or _default_shared_dir())
+    )
+    shared_budget_mb: float = field(
+        default_factory=lambda: float(os.getenv("VTK_SHARED_BUDGET_MB", "512"))
+    )
+    shared_ttl: float = field(
+        default_factory=lambda: float(os.getenv("VTK_SHARED_TTL", "600"))
+    )
+    shared_pin_frames: int = field(
+        default_factory=lambda: int(os.getenv("VTK_SHARED_PIN_FRAMES", "4"))
+    )
+
+
+@lru_cache()
+def get_vtk_config() -> VTKConfig:
+    """
+    获取 VTK 配置单例
+
+    返回:
+        VTKConfig: VTK 配置实例
+    """
+    return VTKConfig()
@@ -0,0 +1,244 @@
+"""
+VTK 元数据索引
+
+用 SQLite 持久化每一帧的元数据（维度、点数、标量名、取值范围、时间步），
+列表接口直接查询索引而不再逐个打开文件。
+
+失效与增量更新：
+- 每个文件夹记录最近一次扫描时间，TTL 内的查询不访问文件系统
+- 超过 TTL 后重新扫描该文件夹（一次 scandir），仅对 mtime/大小变化的帧重新解析，
+  已删除的帧从索引中移除
+- 解析失败的帧连同 mtime/大小与错误信息一并记录（列表中不出现），文件不变时不再重复解析
+- 取值范围取自帧缓存（二进制缓存头部、共享数组元数据或按帧缓存的范围），不必每次读取整个数据段
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from loguru import logger
+
+from .cache import get_frame_cache
+from .config import get_vtk_config
+from .reader import parse_header, read_header
+from .series import parse_time_step
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    time_step INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    dimensions TEXT,
+    point_count INTEGER,
+    scalar_name TEXT,
+    data_type TEXT,
+    value_min REAL,
+    value_max REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_frames_folder ON frames (folder, time_step);
+CREATE TABLE IF NOT EXISTS folders (
+    folder TEXT PRIMARY KEY,
+    scanned_at REAL NOT NULL
+);
+"""
+
+
+class VTKIndex:
+    """
+    VTK 元数据索引
+
+    folder 与 path 均为相对 data_root 的 POSIX 路径，根目录的 folder 为 ""。
+    """
+
+    def __init__(self, db_path: Path, data_root: Path, ttl: float = 30.0):
+        self.db_path = Path(db_path)
+        self.data_root = Path(data_root)
+        self.ttl = ttl
+        self._write_lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(frames)")}
+            if "error" not in columns:
+                conn.execute("ALTER TABLE frames ADD COLUMN error TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开连接，正常退出时提交，结束后关闭"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def list_folder(self, folder: str) -> List[Dict[str, Any]]:
+        """
+        获取文件夹内全部帧的元数据（按时间步排序，过期时先增量刷新）
+
+        Args:
+            folder: 相对 data_root 的文件夹路径（根目录为 ""）
+
+        Returns:
+            帧元数据列表
+        """
+        self.ensure_fresh(folder)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM frames WHERE folder = ? AND error IS NULL ORDER BY time_step, name", (folder,)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def ensure_fresh(self, folder: str) -> None:
+        """文件夹超过 TTL 未扫描时刷新"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT scanned_at FROM folders WHERE folder = ?", (folder,)).fetchone()
+        if row is None or time.time() - row["scanned_at"] > self.ttl:
+            self.refresh_folder(folder)
+
+    def refresh_folder(self, folder: str) -> Dict[str, int]:
+        """
+        增量刷新一个文件夹
+
+        Args:
+            folder: 相对 data_root 的文件夹路径
+
+        Returns:
+            统计信息 {"scanned", "updated", "failed", "removed"}
+        """
+        folder_path = self.data_root / folder
+        on_disk = {}
+        if folder_path.is_dir():
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".vtk") and entry.is_file():
+                        on_disk[entry.name] = entry.stat()
+
+        with self._connect() as conn:
+            known = {
+                row["name"]: (row["size"], row["mtime_ns"])
+                for row in conn.execute("SELECT name, size, mtime_ns FROM frames WHERE folder = ?", (folder,))
+            }
+
+        # 解析放在写锁之外，只对新增/变化的帧读取数据；失败的帧同样记录，文件不变时不再重试
+        described = []
+        failed = 0
+        for name, stat in on_disk.items():
+            if known.get(name) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            try:
+                described.append(self._describe(folder, name, stat))
+            except Exception as e:
+                logger.warning(f"[VTK索引] 无法解析 {folder}/{name}: {e}")
+                described.append(self._failed(folder, name, stat, e))
+                failed += 1
+        removed = [name for name in known if name not in on_disk]
+
+        with self._write_lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO frames "
+                "(path, folder, name, time_step, size, mtime_ns, header, dimensions, "
+                "point_count, scalar_name, data_type, value_min, value_max, error) VALUES "
+                "(:path, :folder, :name, :time_step, :size, :mtime_ns, :header, :dimensions, "
+                ":point_count, :scalar_name, :data_type, :value_min, :value_max, :error)",
+                described,
+            )
+            conn.executemany(
+                "DELETE FROM frames WHERE folder = ? AND name = ?", [(folder, name) for name in removed]
+            )
+            conn.execute("INSERT OR REPLACE INTO folders VALUES (?, ?)", (folder, time.time()))
+
+        updated = len(described) - failed
+        if described or removed:
+            logger.info(
+                f"[VTK索引] 刷新 {folder or '/'}: 更新 {updated} 帧, 失败 {failed} 帧, 移除 {len(removed)} 帧"
+            )
+        return {"scanned": len(on_disk), "updated": updated, "failed": failed, "removed": len(removed)}
+
+    def _describe(self, folder: str, name: str, stat: os.stat_result) -> Dict[str, Any]:
+        """解析一帧的元数据（头部 + 取值范围，范围优先取自帧缓存）"""
+        path = self.data_root / folder / name
+        header_lines, _ = read_header(path)
+        meta = parse_header(header_lines)
+        if not meta["dimensions"]:
+            raise ValueError(f"VTK文件缺少 DIMENSIONS: {path}")
+        nx, ny, nz = meta["dimensions"]
+        vmin, vmax = get_frame_cache().get_frame_range(path)
+        return {
+            "path": f"{folder}/{name}" if folder else name,
+            "folder": folder,
+            "name": name,
+            "time_step": parse_time_step(name),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "header": json.dumps(header_lines, ensure_ascii=False),
+            "dimensions": json.dumps(meta["dimensions"]),
+            "point_count": nx * ny * nz,
+            "scalar_name": meta["scalar_name"],
+            "data_type": meta["data_type"],
+            "value_min": float(vmin),
+            "value_max": float(vmax),
+            "error": None,
+        }
+
+    @staticmethod
+    def _failed(folder: str, name: str, stat: os.stat_result, error: Exception) -> Dict[str, Any]:
+        """解析失败的帧（只记录 mtime/大小与错误信息）"""
+        return {
+            "path": f"{folder}/{name}" if folder else name,
+            "folder": folder,
+            "name": name,
+            "time_step": parse_time_step(name),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "header": "[]",
+            "dimensions": None,
+            "point_count": None,
+            "scalar_name": None,
+            "data_type": None,
+            "value_min": None,
+            "value_max": None,
+            "error": str(error),
+        }
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "path": row["path"],
+            "folder": row["folder"],
+            "name": row["name"],
+            "time_step": row["time_step"],
+            "size": row["size"],
+            "modified": row["mtime_ns"] / 1e9,
+            "header": json.loads(row["header"]),
+            "dimensions": json.loads(row["dimensions"]) if row["dimensions"] else None,
+            "point_count": row["point_count"],
+            "scalar_name": row["scalar_name"],
+            "data_type": row["data_type"],
+            "value_range": [row["value_min"], row["value_max"]],
+        }
+
+
+@lru_cache()
+def get_vtk_index() -> VTKIndex:
+    """
+    获取元数据索引单例
+
+    返回:
+        VTKIndex: 元数据索引实例
+    """
+    config = get_vtk_config()
+    return VTKIndex(config.cache_dir / "index.sqlite3", config.data_root, config.index_ttl)
@@ -0,0 +1,233 @@
+"""
+等值面网格提取
+
+使用向量化的 Naive Surface Nets：
+1. 每个跨越等值面的体素单元放置一个顶点，位置为其 12 条棱上插值交点的平均
+2. 每条跨越等值面的网格棱生成一个四边形，连接共享该棱的 4 个单元顶点，拆为 2 个三角形
+3. 可选顶点聚类简化：按 decimation 个体素的网格合并顶点，去除退化/重复三角形
+
+网格格式（小端序）：
+    b"VTKM" | uint32 头部长度 | JSON 头部（4 字节对齐）| float32 顶点 (N×3) | uint32 索引 (M×3)
+顶点为世界坐标（已应用 origin/spacing）。
+"""
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .cache import FrameCache, get_frame_cache
+from .reader import load_scalars
+
+
+MESH_MAGIC = b"VTKM"
+MESH_VERSION = 1
+
+# 棱方向 -> (该方向的轴, 围绕该轴按右手顺序排列的另外两个轴)，轴下标对应 (z, y, x)
+EDGE_AXES = {
+    "x": (2, (1, 0)),
+    "y": (1, (0, 2)),
+    "z": (0, (2, 1)),
+}
+
+
+def surface_nets(field: np.ndarray, iso: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Naive Surface Nets 等值面提取
+
+    Args:
+        field: 形状为 (nz, ny, nx) 的标量场
+        iso: 等值面取值
+
+    Returns:
+        (顶点 (N, 3) 体素坐标 (x, y, z), 三角形索引 (M, 3))
+    """
+    f = np.asarray(field, dtype=np.float32) - np.float32(iso)
+    inside = f > 0
+    cells_shape = tuple(n - 1 for n in f.shape)
+    if min(cells_shape) < 1:
+        return np.zeros((0, 3), np.float32), np.zeros((0, 3), np.uint32)
+
+    point_sum = np.zeros(cells_shape + (3,), dtype=np.float32)
+    point_count = np.zeros(cells_shape, dtype=np.uint8)
+    grid = np.indices(f.shape, dtype=np.float32)  # (3, nz, ny, nx)，依次为 z, y, x
+    crossings = {}
+
+    for name, (axis, others) in EDGE_AXES.items():
+        lo = [slice(None)] * 3
+        hi = [slice(None)] * 3
+        lo[axis] = slice(0, -1)
+        hi[axis] = slice(1, None)
+        f0, f1 = f[tuple(lo)], f[tuple(hi)]
+        mask = inside[tuple(lo)] != inside[tuple(hi)]
+        crossings[name] = (mask, inside[tuple(lo)])
+
+        # 棱上线性插值的交点（体素坐标 x, y, z）
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(mask, f0 / (f0 - f1), 0).astype(np.float32)
+        point = np.stack([grid[2][tuple(lo)], grid[1][tuple(lo)], grid[0][tuple(lo)]], axis=-1)
+        point[..., 2 - axis] += t
+        point *= mask[..., None]
+
+        # 每条棱被 4 个单元共享：另外两个轴上偏移 0 或 1
+        for d0 in (0, 1):
+            for d1 in (0, 1):
+                window = [slice(None)] * 3
+                window[others[0]] = slice(d0, d0 + cells_shape[others[0]])
+                window[others[1]] = slice(d1, d1 + cells_shape[others[1]])
+                point_sum += point[tuple(window)]
+                point_count += mask[tuple(window)]
+
+    active = point_count > 0
+    vertex_ids = np.full(cells_shape, -1, dtype=np.int64)
+    vertex_ids[active] = np.arange(int(active.sum()))
+    vertices = point_sum[active] / point_count[active][:, None]
+
+    quads = []
+    for name, (axis, (b, c)) in EDGE_AXES.items():
+        mask, lower_inside = crossings[name]
+        # 只有不在边界上的棱才被 4 个单元包围
+        interior = [slice(None)] * 3
+        interior[b] = slice(1, mask.shape[b] - 1)
+        interior[c] = slice(1, mask.shape[c] - 1)
+        edge_idx = np.nonzero(mask[tuple(interior)])
+        if edge_idx[0].size == 0:
+            continue
+        coords = [edge_idx[i] + (1 if i in (b, c) else 0) for i in range(3)]
+        flip = lower_inside[tuple(coords)]
+
+        corners = []
+        for db, dc in ((-1, -1), (0, -1), (0, 0), (-1, 0)):
+            cell = list(coords)
+            cell[b] = cell[b] + db
+            cell[c] = cell[c] + dc
+            corners.append(vertex_ids[tuple(cell)])
+        quad = np.stack(corners, axis=-1)
+        quad[flip] = quad[flip][:, ::-1]
+        quads.append(quad)
+
+    if not quads:
+        return vertices.astype(np.float32), np.zeros((0, 3), np.uint32)
+    quads = np.concatenate(quads)
+    triangles = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+    return vertices.astype(np.float32), triangles.astype(np.uint32)
+
+
+def decimate(vertices: np.ndarray, triangles: np.ndarray, cell_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    顶点聚类简化
+
+    Args:
+        vertices: 顶点 (N, 3)
+        triangles: 三角形 (M, 3)
+        cell_size: 聚类网格边长（体素）
+
+    Returns:
+        简化后的 (顶点, 三角形)
+    """
+    if cell_size <= 1 or len(vertices) == 0:
+        return vertices, triangles
+    keys = np.floor(vertices / cell_size).astype(np.int64)
+    _, cluster, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+    merged = np.zeros((len(counts), 3), dtype=np.float64)
+    np.add.at(merged, cluster, vertices)
+    merged /= counts[:, None]
+
+    remapped = cluster[triangles]
+    valid = (
+        (remapped[:, 0] != remapped[:, 1])
+        & (remapped[:, 1] != remapped[:, 2])
+        & (remapped[:, 0] != remapped[:, 2])
+    )
+    remapped = remapped[valid]
+    # 去除顶点集合相同的重复三角形（保留首次出现的朝向）
+    _, first = np.unique(np.sort(remapped, axis=1), axis=0, return_index=True)
+    remapped = remapped[np.sort(first)]
+
+    # 丢弃不再被引用的顶点
+    used, compact = np.unique(remapped, return_inverse=True)
+    return merged[used].astype(np.float32), compact.reshape(-1, 3).astype(np.uint32)
+
+
+def encode_mesh(vertices: np.ndarray, triangles: np.ndarray, header: Dict[str, Any]) -> bytes:
+    """编码网格为二进制缓冲区"""
+    header = {
+        **header,
+        "version": MESH_VERSION,
+        "vertex_count": int(len(vertices)),
+        "triangle_count": int(len(triangles)),
+        "vertex_dtype": "float32",
+        "index_dtype": "uint32",
+        "byte_order": "little",
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % 4)
+    return (
+        MESH_MAGIC
+        + struct.pack("<I", len(header_bytes))
+        + header_bytes
+        + np.ascontiguousarray(vertices, dtype="<f4").tobytes()
+        + np.ascontiguousarray(triangles, dtype="<u4").tobytes()
+    )
+
+
+def decode_mesh(buffer: bytes) -> Tuple[Dict[str, Any], np.ndarray, np.ndarray]:
+    """解码二进制网格，返回 (头部, 顶点 (N, 3), 三角形 (M, 3))"""
+    if buffer[:4] != MESH_MAGIC:
+        raise ValueError("不是有效的网格数据")
+    (header_len,) = struct.unpack_from("<I", buffer, 4)
+    header = json.loads(buffer[8:8 + header_len].decode("utf-8"))
+    offset = 8 + header_len
+    n, m = header["vertex_count"], header["triangle_count"]
+    vertices = np.frombuffer(buffer, dtype="<f4", offset=offset, count=n * 3).reshape(n, 3)
+    triangles = np.frombuffer(buffer, dtype="<u4", offset=offset + n * 12, count=m * 3).reshape(m, 3)
+    return header, vertices, triangles
+
+
+def mesh_cache_path(cache: FrameCache, source: Path, iso: float, decimation: int) -> Path:
+    """网格缓存路径（按帧 + 等值 + 简化粒度区分）"""
+    return cache.path_for(source, "mesh", f".iso{iso:g}.d{decimation}.vtkm")
+
+
+def build_isosurface(source: str, iso: float, decimation: int = 2) -> str:
+    """
+    提取并缓存等值面网格（进程池任务入口，参数与返回值均可序列化）
+
+    Args:
+        source: VTK 源文件路径
+        iso: 等值面取值
+        decimation: 顶点聚类网格边长（体素），1 表示不简化
+
+    Returns:
+        网格缓存文件路径
+    """
+    cache = get_frame_cache()
+    source_path = Path(source)
+    target = mesh_cache_path(cache, source_path, iso, decimation)
+    if target.exists():
+        return str(target)
+
+    field, meta = load_scalars(source_path)
+    vertices, triangles = surface_nets(field, iso)
+    raw_count = len(triangles)
+    vertices, triangles = decimate(vertices, triangles, decimation)
+
+    # 体素坐标 -> 世界坐标
+    vertices = vertices * np.asarray(meta["spacing"], dtype=np.float32) + np.asarray(meta["origin"], dtype=np.float32)
+    header = {
+        "iso": iso,
+        "decimation": decimation,
+        "scalar_name": meta["scalar_name"],
+        "dimensions": meta["dimensions"],
+        "bounds": (
+            [vertices.min(axis=0).tolist(), vertices.max(axis=0).tolist()] if len(vertices) else None
+        ),
+    }
+    cache.write_atomic(target, encode_mesh(vertices, triangles, header))
+    logger.info(
+        f"[VTK等值面] {source_path.name} iso={iso:g}: {raw_count} -> {len(triangles)} 三角形"
+    )
+    return str(target)
@@ -0,0 +1,156 @@
+"""
+时间序列粗化动力学分析
+
+对整个时间序列逐帧计算统计量（复用 analytics.get_frame_stats 的帧级缓存），
+帧级计算分发到进程池并行执行，然后拟合粗化律 L(t) ~ t^n：
+- L 取结构因子一阶矩波长（mean_wavelength），另给出界面密度长度 1/S_v 的拟合
+- 拟合区间从成分振幅（场标准差）饱和开始，即调幅分解进入粗化阶段之后；
+  LSW 体扩散控制的粗化理论值为 n = 1/3
+
+整个序列的结果按文件夹指纹（全部帧的 路径 + mtime + 大小）缓存为 JSON。
+"""
+import json
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .analytics import get_frame_stats
+from .cache import FrameCache, get_frame_cache
+from .series import list_series_frames
+
+
+KINETICS_VERSION = 1
+
+# 振幅达到最大值的该比例后视为进入粗化阶段
+AMPLITUDE_SATURATION = 0.9
+
+# 拟合所需的最少帧数
+MIN_FIT_POINTS = 3
+
+
+def frame_summary(source: str) -> Dict[str, Any]:
+    """
+    计算一帧的动力学相关统计量（进程池任务入口，参数与返回值均可序列化）
+
+    Args:
+        source: VTK 源文件路径
+
+    Returns:
+        {"length", "peak_length", "amplitude", "interface_density", "rich_fraction"}
+    """
+    stats = get_frame_stats(get_frame_cache(), Path(source))
+    return {
+        "length": stats["mean_wavelength"],
+        "peak_length": stats["peak_wavelength"],
+        "amplitude": stats["std"],
+        "interface_density": stats["specific_interface_area"],
+        "rich_fraction": stats["volume_fraction"]["rich"],
+    }
+
+
+def fit_power_law(times: np.ndarray, lengths: np.ndarray) -> Optional[Dict[str, Any]]:
+    """
+    对数坐标下最小二乘拟合 L = A * t^n
+
+    Args:
+        times: 时间步
+        lengths: 特征长度
+
+    Returns:
+        {"exponent", "prefactor", "r2", "points", "t_range"}，有效点不足时返回 None
+    """
+    valid = (times > 0) & np.isfinite(lengths) & (lengths > 0)
+    if np.count_nonzero(valid) < MIN_FIT_POINTS:
+        return None
+    log_t, log_l = np.log(times[valid]), np.log(lengths[valid])
+    exponent, intercept = np.polyfit(log_t, log_l, 1)
+    residual = log_l - (exponent * log_t + intercept)
+    total = ((log_l - log_l.mean()) ** 2).sum()
+    return {
+        "exponent": float(exponent),
+        "prefactor": float(np.exp(intercept)),
+        "r2": float(1 - (residual ** 2).sum() / total) if total > 0 else 1.0,
+        "points": int(np.count_nonzero(valid)),
+        "t_range": [int(times[valid].min()), int(times[valid].max())],
+    }
+
+
+def coarsening_onset(times: np.ndarray, amplitudes: np.ndarray) -> int:
+    """粗化阶段起点：振幅首次达到最大值 AMPLITUDE_SATURATION 倍的时间步"""
+    saturated = np.nonzero(amplitudes >= AMPLITUDE_SATURATION * amplitudes.max())[0]
+    return int(times[saturated[0]]) if saturated.size else int(times[0])
+
+
+def analyze_series(
+    cache: FrameCache, folder: Path, executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """
+    分析整个时间序列的粗化动力学
+
+    Args:
+        cache: 帧缓存
+        folder: 时间序列文件夹
+        executor: 帧级计算的执行器（通常为进程池），None 时在当前线程顺序计算
+
+    Returns:
+        序列汇总（逐帧统计 + 粗化律拟合）
+    """
+    frames = list_series_frames(folder)
+    if not frames:
+        raise ValueError(f"文件夹中没有VTK文件: {folder.name}")
+
+    sources = [source for _, source in frames]
+    target = cache.cache_dir / "kinetics" / f"{cache.series_key(sources)}.json"
+    if target.exists():
+        return json.loads(target.read_text(encoding="utf-8"))
+
+    paths = [str(source) for source in sources]
+    summaries: List[Dict[str, Any]] = list(
+        executor.map(frame_summary, paths) if executor else map(frame_summary, paths)
+    )
+
+    times = np.array([time_step for time_step, _ in frames], dtype=np.float64)
+    lengths = np.array([s["length"] or np.nan for s in summaries], dtype=np.float64)
+    densities = np.array([s["interface_density"] or np.nan for s in summaries], dtype=np.float64)
+    amplitudes = np.array([s["amplitude"] for s in summaries], dtype=np.float64)
+
+    onset = coarsening_onset(times, amplitudes)
+    late = times >= onset
+    result = {
+        "version": KINETICS_VERSION,
+        "folder": folder.name,
+        "frame_count": len(frames),
+        "coarsening_onset": onset,
+        "fits": {
+            "wavelength": fit_power_law(times[late], lengths[late]),
+            "interface_length": fit_power_law(times[late], 1.0 / densities[late]),
+        },
+        "reference_exponent": 1 / 3,
+        "frames": [
+            {"time_step": time_step, "name": source.name, **summary}
+            for (time_step, source), summary in zip(frames, summaries)
+        ],
+    }
+    cache.write_atomic(target, json.dumps(result, ensure_ascii=False).encode("utf-8"))
+
+    fit = result["fits"]["wavelength"]
+    exponent = f"{fit['exponent']:.3f}" if fit else "有效帧不足，未拟合"
+    logger.info(f"[VTK动力学] {folder.name}: {len(frames)} 帧, 粗化起点 t={onset}, n={exponent}")
+    return result
+
+
+def summarize_kinetics(result: Dict[str, Any]) -> Dict[str, Any]:
+    """精简版本（只保留首末帧与拟合结果，用于 Agent 上下文）"""
+    frames = result["frames"]
+    return {
+        "folder": result["folder"],
+        "frame_count": result["frame_count"],
+        "coarsening_onset": result["coarsening_onset"],
+        "fits": result["fits"],
+        "reference_exponent": result["reference_exponent"],
+        "first_frame": frames[0],
+        "last_frame": frames[-1],
+    }
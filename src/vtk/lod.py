@@ -0,0 +1,113 @@
+"""
+多分辨率 LOD 金字塔
+
+对标量场做 2×2×2 块平均逐级降采样，直到最短边不超过 MIN_LOD_SIZE（默认 8）。
+level 0 为原始分辨率，level 越大越粗糙。
+"""
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .cache import BINARY_VERSION, FrameCache, encode_binary_frame
+from .reader import load_scalars
+
+
+# 金字塔最粗一级的最短边
+MIN_LOD_SIZE = 8
+
+
+def downsample(array: np.ndarray) -> np.ndarray:
+    """
+    2×2×2 块平均降采样
+
+    奇数边先按边缘值补齐到偶数，保证每个体素都参与平均。
+
+    Args:
+        array: 形状为 (nz, ny, nx) 的标量场
+
+    Returns:
+        各边减半（向上取整）的标量场
+    """
+    pad = [(0, n % 2) for n in array.shape]
+    if any(p[1] for p in pad):
+        array = np.pad(array, pad, mode="edge")
+    nz, ny, nx = array.shape
+    blocks = array.reshape(nz // 2, 2, ny // 2, 2, nx // 2, 2)
+    return blocks.mean(axis=(1, 3, 5), dtype=np.float64).astype(np.float32)
+
+
+def build_pyramid(array: np.ndarray, min_size: int = MIN_LOD_SIZE) -> List[np.ndarray]:
+    """
+    构建 LOD 金字塔
+
+    Args:
+        array: 原始标量场 (nz, ny, nx)
+        min_size: 最粗一级的最短边
+
+    Returns:
+        各级标量场列表，下标即 level
+    """
+    levels = [np.asarray(array, dtype=np.float32)]
+    while min(levels[-1].shape) > min_size:
+        levels.append(downsample(levels[-1]))
+    return levels
+
+
+def level_geometry(meta: Dict[str, Any], level: int) -> Dict[str, List[float]]:
+    """
+    计算某一级的原点与间距
+
+    块平均后的体素位于原始 2^level 个体素的中心。
+    """
+    factor = 2 ** level
+    spacing = [s * factor for s in meta["spacing"]]
+    origin = [o + s * (factor - 1) / 2 for o, s in zip(meta["origin"], meta["spacing"])]
+    return {"origin": origin, "spacing": spacing}
+
+
+def get_lod_frame(cache: FrameCache, source: Path, level: int, metadata: Dict[str, Any] = None) -> Path:
+    """
+    获取指定 LOD 级别的二进制帧（首次请求时生成整座金字塔并缓存）
+
+    Args:
+        cache: 帧缓存
+        source: VTK 源文件
+        level: 请求的级别（超过最粗级别时取最粗级别）
+        metadata: 附加到头部的原始文件元数据
+
+    Returns:
+        该级别二进制帧的缓存路径
+    """
+    index_path = cache.path_for(source, "lod", ".levels")
+    if index_path.exists():
+        count = int(index_path.read_text())
+        level = max(0, min(level, count - 1))
+        target = cache.path_for(source, "lod", f".L{level}.vtkb")
+        if target.exists():
+            return target
+
+    array, meta = load_scalars(source)
+    pyramid = build_pyramid(array)
+    count = len(pyramid)
+    for i, data in enumerate(pyramid):
+        nz, ny, nx = data.shape
+        header = {
+            "version": BINARY_VERSION,
+            "level": i,
+            "levels": count,
+            "dimensions": [nx, ny, nz],
+            **level_geometry(meta, i),
+            "point_count": int(data.size),
+            "scalar_name": meta["scalar_name"],
+            "dtype": "float32",
+            "byte_order": "little",
+            "range": [float(data.min()), float(data.max())],
+            "metadata": metadata or {},
+        }
+        cache.write_atomic(cache.path_for(source, "lod", f".L{i}.vtkb"), encode_binary_frame(data, header))
+    # 级数索引最后写入，作为整座金字塔已生成的标记
+    cache.write_atomic(index_path, str(count).encode("ascii"))
+
+    level = max(0, min(level, count - 1))
+    return cache.path_for(source, "lod", f".L{level}.vtkb")
@@ -0,0 +1,73 @@
+"""
+请求延迟统计
+
+按路由模板聚合每个请求的处理耗时（保留最近 window 个样本），
+提供 p50/p95/p99/最大值，供 /api/vtk/metrics 查询。
+"""
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Any, Deque, Dict
+
+import numpy as np
+
+
+# 每个路由保留的最近样本数
+DEFAULT_WINDOW = 1024
+
+
+class LatencyMetrics:
+    """按路由聚合的延迟统计"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"total": 0, "4xx": 0, "5xx": 0})
+
+    def record(self, route: str, seconds: float, status: int) -> None:
+        """
+        记录一次请求
+
+        Args:
+            route: 路由模板（如 /api/vtk/files/{filename:path}）
+            seconds: 处理耗时（秒）
+            status: 响应状态码
+        """
+        self._samples[route].append(seconds)
+        counts = self._counts[route]
+        counts["total"] += 1
+        if 400 <= status < 500:
+            counts["4xx"] += 1
+        elif status >= 500:
+            counts["5xx"] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """各路由的请求数与耗时分位数（毫秒）"""
+        result = {}
+        for route, samples in sorted(self._samples.items()):
+            ms = np.asarray(samples) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            result[route] = {
+                **self._counts[route],
+                "window": len(ms),
+                "mean_ms": round(float(ms.mean()), 3),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(ms.max()), 3),
+            }
+        return result
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._counts.clear()
+
+
+@lru_cache()
+def get_latency_metrics() -> LatencyMetrics:
+    """
+    获取延迟统计单例
+
+    返回:
+        LatencyMetrics: 延迟统计实例
+    """
+    return LatencyMetrics()
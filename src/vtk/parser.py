@@ -0,0 +1,358 @@
+"""
+流式 Legacy VTK 解析器
+
+与 reader.load_scalars（一次性读入第一个 SCALARS 块）互补：
+- 先扫描出文件中全部 SCALARS / VECTORS 数据块的位置，再按需定位读取
+- ASCII 数据段按大块读取，由 numpy.fromstring 在 C 层转换，不经过 Python split
+- BINARY 数据段（大端序）按 z 平面直接 frombuffer
+- iter_planes 逐个 z 平面产出数据，内存占用与单个平面同阶，适合大体数据的流式处理
+
+ASCII 数据块之间以关键字行分隔，扫描时用正则在原始字节上查找关键字行，
+不解析数值；FIELD 数据块暂不支持（会被跳过）。
+"""
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .reader import VTK_DTYPES, parse_header
+
+
+# ASCII 读取块大小
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# 属性数据段中的关键字行（以换行开头：字面量前缀让正则引擎快速跳过数值，
+# 比 MULTILINE 的 ^ 锚点快一个数量级）
+KEYWORD_LINE = re.compile(
+    rb"\n[ \t]*(POINT_DATA|CELL_DATA|SCALARS|VECTORS|NORMALS|TENSORS|LOOKUP_TABLE|FIELD|"
+    rb"COLOR_SCALARS|TEXTURE_COORDINATES|METADATA)\b[^\n]*"
+)
+
+# 关键字行的最大长度（超过此长度的行视为数值行）
+MAX_KEYWORD_LINE = 1024
+
+# 每种属性块的分量数
+BLOCK_COMPONENTS = {"VECTORS": 3, "NORMALS": 3}
+
+
+@dataclass
+class VTKField:
+    """
+    文件中的一个数据块
+
+    属性:
+        name: 数组名
+        kind: SCALARS / VECTORS / NORMALS
+        data_type: VTK 数据类型（float / double / int ...）
+        components: 每个点的分量数
+        location: POINT_DATA / CELL_DATA
+        shape: 数据网格形状 (nz, ny, nx)（CELL_DATA 每维少 1）
+        offset: 数据段起始字节偏移
+    """
+    name: str
+    kind: str
+    data_type: str
+    components: int
+    location: str
+    shape: Tuple[int, int, int]
+    offset: int
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(VTK_DTYPES.get(self.data_type, np.float32))
+
+    @property
+    def plane_values(self) -> int:
+        """单个 z 平面的数值个数"""
+        return self.shape[1] * self.shape[2] * self.components
+
+    @property
+    def value_count(self) -> int:
+        return self.shape[0] * self.plane_values
+
+
+def _grid_shape(meta: Dict[str, Any], location: str) -> Tuple[int, int, int]:
+    """数据网格形状 (nz, ny, nx)"""
+    nx, ny, nz = meta["dimensions"]
+    if location == "CELL_DATA":
+        return max(nz - 1, 1), max(ny - 1, 1), max(nx - 1, 1)
+    return nz, ny, nx
+
+
+def scan_fields(path: Path, chunk_size: int = CHUNK_SIZE) -> Tuple[Dict[str, Any], List[VTKField]]:
+    """
+    扫描文件中的全部数据块
+
+    ASCII 文件只做一遍字节级正则扫描；BINARY 文件按块大小直接跳过数据段。
+
+    Args:
+        path: VTK 文件路径
+        chunk_size: 扫描块大小
+
+    Returns:
+        (几何元数据, 数据块列表)
+    """
+    header_lines: List[str] = []
+    with open(path, "rb") as f:
+        # 几何头部：直到第一个 POINT_DATA / CELL_DATA
+        while True:
+            raw = f.readline()
+            if not raw:
+                break
+            line = raw.decode("utf-8", errors="ignore").strip()
+            keyword = line.split()[0].upper() if line else ""
+            if keyword in ("POINT_DATA", "CELL_DATA"):
+                f.seek(f.tell() - len(raw))
+                break
+            header_lines.append(line)
+        meta = parse_header(header_lines)
+        if not meta["dimensions"]:
+            raise ValueError(f"VTK文件缺少 DIMENSIONS: {path}")
+
+        if meta["format"] == "BINARY":
+            fields = _scan_binary(f, meta)
+        else:
+            fields = _scan_ascii(f, meta, chunk_size)
+    return meta, fields
+
+
+def _parse_block_line(line: str, location: str, meta: Dict[str, Any], offset: int) -> Optional[VTKField]:
+    """解析 SCALARS / VECTORS / NORMALS 行，其他关键字返回 None"""
+    parts = line.split()
+    kind = parts[0].upper()
+    if kind == "SCALARS":
+        components = int(parts[3]) if len(parts) > 3 else 1
+    elif kind in BLOCK_COMPONENTS:
+        components = BLOCK_COMPONENTS[kind]
+    else:
+        return None
+    return VTKField(
+        name=parts[1] if len(parts) > 1 else kind.lower(),
+        kind=kind,
+        data_type=parts[2] if len(parts) > 2 else "float",
+        components=components,
+        location=location,
+        shape=_grid_shape(meta, location),
+        offset=offset,
+    )
+
+
+def _scan_ascii(f, meta: Dict[str, Any], chunk_size: int) -> List[VTKField]:
+    """在 ASCII 数据段中查找关键字行，记录各块数据起始偏移"""
+    fields: List[VTKField] = []
+    location = "POINT_DATA"
+    pending: Optional[VTKField] = None  # SCALARS 行之后等待 LOOKUP_TABLE 行
+    # buffer 总以换行开头，buffer[0] 对应文件偏移 base（首行前补一个虚拟换行）
+    base = f.tell() - 1
+    tail = b"\n"
+    skip_line = False
+    while True:
+        chunk = f.read(chunk_size)
+        if skip_line and chunk:
+            # 上一块以超长数值行结尾，跳到下一个换行
+            newline = chunk.find(b"\n")
+            if newline < 0:
+                base += len(chunk)
+                continue
+            base += newline
+            chunk = chunk[newline:]
+            skip_line = False
+        buffer = tail + chunk
+        # 最后一行可能不完整，从其前面的换行起留到下一块（文件末尾除外）
+        cut = len(buffer) if not chunk else max(buffer.rfind(b"\n"), 0)
+        for match in KEYWORD_LINE.finditer(buffer, 0, cut):
+            line = match.group(0).decode("ascii", errors="ignore").strip()
+            keyword = match.group(1).decode()
+            # 数据从关键字行之后的下一行开始
+            data_offset = base + match.end() + 1
+            if keyword in ("POINT_DATA", "CELL_DATA"):
+                location = keyword
+            elif keyword == "LOOKUP_TABLE" and pending is not None:
+                pending.offset = data_offset
+                fields.append(pending)
+                pending = None
+            else:
+                field = _parse_block_line(line, location, meta, data_offset)
+                if field is not None and field.kind == "SCALARS":
+                    pending = field
+                elif field is not None:
+                    fields.append(field)
+        if not chunk:
+            break
+        base += cut
+        tail = buffer[cut:]
+        if len(tail) > MAX_KEYWORD_LINE:
+            # 关键字行都很短，超长的不完整行只可能是数值行（如整个数据段写在一行）
+            base += len(tail)
+            tail = b""
+            skip_line = True
+    if pending is not None:
+        # 缺少 LOOKUP_TABLE 行时数据紧随 SCALARS 行
+        fields.append(pending)
+    return fields
+
+
+def _scan_binary(f, meta: Dict[str, Any]) -> List[VTKField]:
+    """逐块读取关键字行，按数据块字节数跳过数据段"""
+    fields: List[VTKField] = []
+    location = "POINT_DATA"
+    while True:
+        raw = f.readline()
+        if not raw:
+            break
+        line = raw.decode("ascii", errors="ignore").strip()
+        if not line:
+            continue
+        keyword = line.split()[0].upper()
+        if keyword in ("POINT_DATA", "CELL_DATA"):
+            location = keyword
+            continue
+        field = _parse_block_line(line, location, meta, f.tell())
+        if field is None:
+            continue
+        if field.kind == "SCALARS":
+            # 可选的 LOOKUP_TABLE 行
+            position = f.tell()
+            if f.readline().strip().upper().startswith(b"LOOKUP_TABLE"):
+                field.offset = f.tell()
+            else:
+                f.seek(position)
+        fields.append(field)
+        f.seek(field.offset + field.value_count * field.dtype.itemsize)
+    return fields
+
+
+def _select_field(fields: List[VTKField], name: Optional[str], path: Path) -> VTKField:
+    if not fields:
+        raise ValueError(f"VTK文件中没有数据块: {path}")
+    if name is None:
+        return fields[0]
+    for field in fields:
+        if field.name == name:
+            return field
+    raise ValueError(f"VTK文件中不存在数据块 {name}，可用: {[field.name for field in fields]}")
+
+
+def iter_planes(
+    path: Path, name: Optional[str] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    逐个 z 平面读取数据块
+
+    Args:
+        path: VTK 文件路径
+        name: 数据块名称（None 为第一个数据块）
+        chunk_size: ASCII 读取块大小
+
+    Yields:
+        (z 下标, 形状为 (ny, nx) 或 (ny, nx, 分量数) 的数组)
+    """
+    meta, fields = scan_fields(path, chunk_size)
+    yield from _read_planes(path, meta, _select_field(fields, name, path), chunk_size)
+
+
+def _read_planes(
+    path: Path, meta: Dict[str, Any], field: VTKField, chunk_size: int
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """从数据块起始偏移开始逐平面读取"""
+    plane_shape = field.shape[1:] + ((field.components,) if field.components > 1 else ())
+
+    with open(path, "rb") as f:
+        f.seek(field.offset)
+        if meta["format"] == "BINARY":
+            dtype = field.dtype.newbyteorder(">")
+            plane_bytes = field.plane_values * dtype.itemsize
+            for z in range(field.shape[0]):
+                data = f.read(plane_bytes)
+                if len(data) < plane_bytes:
+                    raise ValueError(f"VTK数据不完整: {field.name} 第 {z} 层")
+                yield z, np.frombuffer(data, dtype=dtype).astype(field.dtype).reshape(plane_shape)
+            return
+
+        z = 0
+        pending = np.empty(0, dtype=field.dtype)
+        tail = b""
+        while z < field.shape[0]:
+            chunk = f.read(chunk_size)
+            buffer = tail + chunk
+            # 数据块以下一个关键字行结束；否则截断在最后一个空白处，
+            # 不完整的数值（以及其前面的空白，保证关键字行前的换行不丢失）留到下一块
+            keyword = KEYWORD_LINE.search(buffer)
+            if keyword is not None:
+                cut = keyword.start()
+            elif chunk:
+                cut = max(buffer.rfind(b" "), buffer.rfind(b"\n"), buffer.rfind(b"\t"), 0)
+            else:
+                cut = len(buffer)
+            values = np.fromstring(buffer[:cut].decode("ascii"), dtype=field.dtype, sep=" ")
+            tail = buffer[cut:]
+            pending = np.concatenate([pending, values]) if pending.size else values
+
+            planes = min(pending.size // field.plane_values, field.shape[0] - z)
+            for i in range(planes):
+                yield z, pending[i * field.plane_values:(i + 1) * field.plane_values].reshape(plane_shape)
+                z += 1
+            pending = pending[planes * field.plane_values:]
+            if keyword is not None or not chunk:
+                break
+
+    if z < field.shape[0]:
+        raise ValueError(f"VTK数据不完整: {field.name} 期望 {field.shape[0]} 层，实际 {z} 层")
+
+
+def read_scalar_block(path: Path, meta: Dict[str, Any], offset: int, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    从已知偏移读取单分量 POINT_DATA 标量块（头部已由 reader.read_header 解析，不扫描全文件）
+
+    ASCII 数据逐块解析，读满 nx*ny*nz 个数值或遇到下一个关键字行即停止。
+
+    Args:
+        path: VTK 文件路径
+        meta: parse_header 返回的元数据
+        offset: 数据段起始字节偏移
+
+    Returns:
+        形状为 (nz, ny, nx) 的数组
+    """
+    field = VTKField(
+        name=meta["scalar_name"] or "scalars",
+        kind="SCALARS",
+        data_type=meta["data_type"] or "float",
+        components=1,
+        location="POINT_DATA",
+        shape=_grid_shape(meta, "POINT_DATA"),
+        offset=offset,
+    )
+    result = np.empty(field.shape, dtype=field.dtype)
+    for z, plane in _read_planes(path, meta, field, chunk_size):
+        result[z] = plane
+    return result
+
+
+def read_field(path: Path, name: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    读取整个数据块（预分配结果数组，逐平面填充）
+
+    Args:
+        path: VTK 文件路径
+        name: 数据块名称（None 为第一个数据块）
+        chunk_size: ASCII 读取块大小
+
+    Returns:
+        (形状为 (nz, ny, nx[, 分量数]) 的数组, 元数据（含 fields 列表）)
+    """
+    meta, fields = scan_fields(path, chunk_size)
+    field = _select_field(fields, name, path)
+    shape = field.shape + ((field.components,) if field.components > 1 else ())
+    result = np.empty(shape, dtype=field.dtype)
+    for z, plane in _read_planes(path, meta, field, chunk_size):
+        result[z] = plane
+    meta["fields"] = [
+        {"name": f.name, "kind": f.kind, "data_type": f.data_type, "components": f.components, "location": f.location}
+        for f in fields
+    ]
+    meta["scalar_name"] = field.name
+    meta["data_type"] = field.data_type
+    return result, meta
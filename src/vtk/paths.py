@@ -0,0 +1,71 @@
+"""
+数据路径校验
+
+接口参数与对话工具参数中的 VTK 文件 / 时间序列文件夹均为相对数据根目录（VTK_DATA_ROOT）的路径，
+解析后必须仍位于数据根目录之内（拒绝 ../ 与指向外部的符号链接）。
+
+- 非法路径、格式不符抛出 ValueError，不存在抛出 FileNotFoundError（路由据此返回 400 / 404）
+- 阻塞函数（resolve + stat），异步代码经 run_io 调用
+"""
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from .config import get_vtk_config
+
+
+def _contained(relative: str, data_root: Optional[Path], error: str) -> Path:
+    """解析相对路径，不在数据根目录之内时以 error 为消息抛出 ValueError"""
+    root = Path(data_root or get_vtk_config().data_root).resolve()
+    path = (root / relative).resolve()
+    if root not in path.parents:
+        raise ValueError(error)
+    return path
+
+
+def resolve_vtk_path(filename: str, data_root: Optional[Path] = None) -> Path:
+    """
+    解析并校验 VTK 文件路径
+
+    Args:
+        filename: 相对数据根目录的 VTK 文件路径
+        data_root: 数据根目录（默认 VTK_DATA_ROOT）
+
+    Returns:
+        VTK 文件绝对路径
+
+    Raises:
+        ValueError: 不是 .vtk 文件，或路径位于数据根目录之外
+        FileNotFoundError: 文件不存在
+    """
+    if not filename.endswith(".vtk"):
+        raise ValueError("只支持VTK文件格式")
+    file_path = _contained(filename, data_root, f"非法文件路径: {filename}")
+    if not file_path.is_file():
+        logger.warning(f"[VTK] 文件不存在: {file_path}")
+        raise FileNotFoundError(f"文件不存在: {filename}")
+    return file_path
+
+
+def resolve_folder(folder_name: str, data_root: Optional[Path] = None) -> Path:
+    """
+    解析并校验时间序列文件夹路径
+
+    Args:
+        folder_name: 相对数据根目录的文件夹路径
+        data_root: 数据根目录（默认 VTK_DATA_ROOT）
+
+    Returns:
+        文件夹绝对路径
+
+    Raises:
+        ValueError: 路径位于数据根目录之外，或不是文件夹
+        FileNotFoundError: 文件夹不存在
+    """
+    folder_path = _contained(folder_name, data_root, f"非法文件夹路径: {folder_name}")
+    if not folder_path.exists():
+        raise FileNotFoundError(f"文件夹不存在: {folder_name}")
+    if not folder_path.is_dir():
+        raise ValueError(f"不是文件夹: {folder_name}")
+    return folder_path
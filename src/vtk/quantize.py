@@ -0,0 +1,142 @@
+"""
+量化传输
+
+显示只需要按已知 [min, max] 量化后的标量场：uint8 体数据约为 float64 文本的 1/8 以下。
+量化规则（线性，levels = 2^bits - 1）：
+    q = round((value - offset) / scale)，value ≈ q * scale + offset
+    offset = vmin，scale = (vmax - vmin) / levels
+最大误差 scale / 2。头部 quantize 字段给出 {bits, scale, offset}，range 字段为量化所用的范围。
+
+默认以整个时间序列（帧所在文件夹的全部帧）的全局范围量化，各帧色标一致；
+全局范围按文件夹指纹缓存，只需计算一次。
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .cache import (
+    MAX_BINARY_HEADER,
+    FrameCache,
+    decode_binary_frame,
+    encode_binary_frame,
+    read_binary_header,
+)
+from .lod import get_lod_frame
+from .series import list_series_frames
+
+
+# 量化位数 -> 头部 dtype
+QUANTIZE_DTYPES = {8: "uint8", 16: "uint16"}
+
+
+def quantize(array: np.ndarray, vmin: float, vmax: float, bits: int = 8) -> np.ndarray:
+    """
+    按 [vmin, vmax] 线性量化到 0 ~ 2^bits - 1（范围外的值截断）
+
+    Args:
+        array: 数据
+        vmin: 范围下限
+        vmax: 范围上限
+        bits: 8 或 16
+    """
+    if bits not in QUANTIZE_DTYPES:
+        raise ValueError(f"不支持的量化位数: {bits}，可选 8 / 16")
+    levels = 2 ** bits - 1
+    span = vmax - vmin
+    if span <= 0:
+        return np.zeros(array.shape, dtype=QUANTIZE_DTYPES[bits])
+    scaled = (np.asarray(array, dtype=np.float64) - vmin) * (levels / span)
+    return np.clip(np.rint(scaled), 0, levels).astype(QUANTIZE_DTYPES[bits])
+
+
+def quantize_params(vmin: float, vmax: float, bits: int) -> Dict[str, Any]:
+    """头部 quantize 字段"""
+    levels = 2 ** bits - 1
+    return {"bits": bits, "scale": (vmax - vmin) / levels if vmax > vmin else 0.0, "offset": vmin}
+
+
+def get_series_range(cache: FrameCache, folder: Path) -> Tuple[float, float]:
+    """
+    时间序列的全局取值范围（各帧范围的并集，按文件夹指纹缓存）
+
+    各帧范围由 FrameCache.get_frame_range 提供（不转码，按帧缓存），
+    序列增加新帧后只需计算新帧的范围
+
+    Args:
+        cache: 帧缓存
+        folder: 时间序列文件夹
+
+    Returns:
+        (vmin, vmax)
+    """
+    frames = list_series_frames(folder)
+    if not frames:
+        raise ValueError(f"文件夹中没有VTK文件: {folder.name}")
+
+    sources = [source for _, source in frames]
+    target = cache.cache_dir / "range" / f"{cache.series_key(sources)}.json"
+    if target.exists():
+        vmin, vmax = json.loads(target.read_text(encoding="utf-8"))["range"]
+        return vmin, vmax
+
+    ranges = [cache.get_frame_range(source) for source in sources]
+    vmin, vmax = min(r[0] for r in ranges), max(r[1] for r in ranges)
+    cache.write_atomic(target, json.dumps({"folder": folder.name, "frames": len(sources), "range": [vmin, vmax]}).encode("utf-8"))
+    return vmin, vmax
+
+
+def resolve_range(cache: FrameCache, source: Path, scope: str) -> Optional[Tuple[float, float]]:
+    """
+    量化范围：series 为帧所在文件夹的全局范围，frame 为 None（使用数据自身的范围）
+    """
+    if scope == "series":
+        return get_series_range(cache, source.parent)
+    if scope == "frame":
+        return None
+    raise ValueError(f"不支持的量化范围: {scope}，可选 series / frame")
+
+
+def get_quantized_frame(
+    cache: FrameCache,
+    source: Path,
+    bits: int,
+    level: Optional[int] = None,
+    value_range: Optional[Tuple[float, float]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """
+    获取量化后的二进制帧（按 源帧 + 级别 + 位数 + 范围 缓存）
+
+    Args:
+        cache: 帧缓存
+        source: VTK 源文件
+        bits: 8 或 16
+        level: LOD 级别（None 为全分辨率）
+        value_range: 量化范围（None 为该帧自身的范围）
+        metadata: 生成 LOD 金字塔时附加到头部的元数据
+
+    Returns:
+        量化帧缓存路径（头部 dtype 为 uint8/uint16，附 quantize 字段）
+    """
+    if bits not in QUANTIZE_DTYPES:
+        raise ValueError(f"不支持的量化位数: {bits}，可选 8 / 16")
+    base = cache.get_binary_frame(source) if level is None else get_lod_frame(cache, source, level, metadata)
+    with open(base, "rb") as f:
+        base_header, _ = read_binary_header(f.read(MAX_BINARY_HEADER))
+    vmin, vmax = value_range or base_header["range"]
+    # 级别超出最粗一级时 get_lod_frame 已截断，以实际级别命名
+    tag = "F" if level is None else f"L{base_header['level']}"
+    target = cache.path_for(source, "quantized", f".{tag}.q{bits}.{vmin:.9g}_{vmax:.9g}.vtkb")
+    if target.exists():
+        return target
+
+    header, array = decode_binary_frame(base.read_bytes())
+    header.update({
+        "dtype": QUANTIZE_DTYPES[bits],
+        "range": [vmin, vmax],
+        "data_range": base_header["range"],
+        "quantize": quantize_params(vmin, vmax, bits),
+    })
+    return cache.write_atomic(target, encode_binary_frame(quantize(array, vmin, vmax, bits), header))
@@ -0,0 +1,138 @@
+"""
+Legacy VTK 读取器
+
+读取 TopPhi 输出的 STRUCTURED_POINTS 文件：
+- 头部按关键字解析（不依赖固定行号）
+- 二进制数据段一次性交给 NumPy 读取；ASCII 数据段逐块解析，读满数据点即停止（见 parser.read_scalar_block）
+- 模拟工作进程已发布共享数组的帧直接内存映射（见 shared.py），不解析数据段
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .shared import lookup_shared
+
+
+# 头部最多扫描的行数（TopPhi 输出只有 11 行头部）
+MAX_HEADER_LINES = 64
+
+# VTK 数据类型 -> NumPy dtype
+VTK_DTYPES = {
+    "bit": np.uint8,
+    "unsigned_char": np.uint8,
+    "char": np.int8,
+    "unsigned_short": np.uint16,
+    "short": np.int16,
+    "unsigned_int": np.uint32,
+    "int": np.int32,
+    "unsigned_long": np.uint64,
+    "long": np.int64,
+    "float": np.float32,
+    "double": np.float64,
+}
+
+
+def read_header(path: Path) -> Tuple[List[str], int]:
+    """
+    读取 VTK 头部
+
+    Args:
+        path: VTK 文件路径
+
+    Returns:
+        (头部行列表, 数据段起始字节偏移)
+    """
+    lines = []
+    offset = 0
+    with open(path, "rb") as f:
+        for _ in range(MAX_HEADER_LINES):
+            raw = f.readline()
+            if not raw:
+                break
+            offset += len(raw)
+            line = raw.decode("utf-8", errors="ignore").strip()
+            lines.append(line)
+            if line.startswith("LOOKUP_TABLE"):
+                break
+    return lines, offset
+
+
+def parse_header(lines: List[str]) -> Dict[str, Any]:
+    """
+    按关键字解析 VTK 头部
+
+    Args:
+        lines: 头部行
+
+    Returns:
+        元数据字典（dimensions 按 x, y, z 顺序）
+    """
+    meta: Dict[str, Any] = {
+        "format": "ASCII",
+        "dimensions": None,
+        "origin": [0.0, 0.0, 0.0],
+        "spacing": [1.0, 1.0, 1.0],
+        "point_count": None,
+        "scalar_name": None,
+        "data_type": None,
+    }
+    for i, line in enumerate(lines):
+        parts = line.split()
+        if not parts:
+            continue
+        keyword = parts[0].upper()
+        if i == 1:
+            meta["description"] = line
+        elif keyword in ("ASCII", "BINARY"):
+            meta["format"] = keyword
+        elif keyword == "DIMENSIONS":
+            meta["dimensions"] = [int(p) for p in parts[1:4]]
+        elif keyword == "ORIGIN":
+            meta["origin"] = [float(p) for p in parts[1:4]]
+        elif keyword in ("SPACING", "ASPECT_RATIO"):
+            meta["spacing"] = [float(p) for p in parts[1:4]]
+        elif keyword == "POINT_DATA":
+            meta["point_count"] = int(parts[1])
+        elif keyword == "SCALARS":
+            meta["scalar_name"] = parts[1] if len(parts) > 1 else "scalars"
+            meta["data_type"] = parts[2] if len(parts) > 2 else "float"
+    return meta
+
+
+def load_scalars(path: Path) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    读取第一个 SCALARS 数据块
+
+    Args:
+        path: VTK 文件路径
+
+    Returns:
+        (形状为 (nz, ny, nx) 的数组, 元数据)；共享数组为 float32 的写时复制 memmap
+    """
+    shared = lookup_shared(path)
+    if shared is not None:
+        return shared
+
+    lines, offset = read_header(path)
+    meta = parse_header(lines)
+    if not meta["dimensions"]:
+        raise ValueError(f"VTK文件缺少 DIMENSIONS: {path}")
+    nx, ny, nz = meta["dimensions"]
+    count = nx * ny * nz
+    dtype = np.dtype(VTK_DTYPES.get(meta["data_type"] or "float", np.float32))
+
+    if meta["format"] != "BINARY":
+        # parser 在模块级导入本模块
+        from .parser import read_scalar_block
+
+        return read_scalar_block(path, meta, offset), meta
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        # Legacy VTK 二进制数据为大端序
+        values = np.fromfile(f, dtype=dtype.newbyteorder(">"), count=count)
+
+    if values.size < count:
+        raise ValueError(f"VTK数据点不足: 期望 {count}, 实际 {values.size}")
+    return values[:count].reshape(nz, ny, nx), meta
@@ -0,0 +1,34 @@
+"""
+时间序列工具
+
+TopPhi 将每个输出时间步写为 {scalar}-{step}.vtk（如 conc-100.vtk），
+本模块负责按时间步排序列出同一文件夹中的帧。
+"""
+import re
+from pathlib import Path
+from typing import List, Tuple
+
+
+# 从文件名提取时间步（例如: conc-100.vtk -> 100）
+TIME_STEP_PATTERN = re.compile(r"-(\d+)\.vtk$")
+
+
+def parse_time_step(name: str) -> int:
+    """从文件名提取时间步，无法识别时返回 0"""
+    match = TIME_STEP_PATTERN.search(name)
+    return int(match.group(1)) if match else 0
+
+
+def list_series_frames(folder: Path) -> List[Tuple[int, Path]]:
+    """
+    列出文件夹中的时间序列帧
+
+    Args:
+        folder: 时间序列文件夹
+
+    Returns:
+        按时间步升序排列的 (时间步, 文件路径) 列表
+    """
+    frames = [(parse_time_step(p.name), p) for p in folder.glob("*.vtk")]
+    frames.sort(key=lambda item: (item[0], item[1].name))
+    return frames
@@ -0,0 +1,178 @@
+"""
+VTK 文件 HTTP 传输辅助
+
+- 强 ETag：由 mtime（纳秒）与文件大小生成，不同内容编码使用不同 ETag
+- 条件请求：If-None-Match 命中时返回 304
+- 字节范围：解析单段 Range 请求头，用于按偏移读取帧的一部分
+- 预压缩：gzip（以及安装了 brotli 时的 br）变体只生成一次，
+  存放在源文件旁（conc-0.vtk.gz，与 nginx gzip_static 约定一致），
+  数据目录不可写时退回到缓存目录
+"""
+import gzip
+import stat
+from pathlib import Path
+from typing import Optional, Tuple
+
+from loguru import logger
+
+from .cache import FrameCache
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# 内容编码 -> (文件后缀, 压缩函数)
+ENCODINGS = {
+    "gzip": (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)),
+}
+if BROTLI_AVAILABLE:
+    ENCODINGS["br"] = (".br", lambda data: brotli.compress(data, quality=9))
+
+# 协商时的优先顺序
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def make_etag(path: Path, encoding: Optional[str] = None) -> str:
+    """
+    生成强 ETag
+
+    Args:
+        path: 源文件路径
+        encoding: 内容编码（None 表示原始内容）
+
+    Returns:
+        带引号的 ETag
+    """
+    st = path.stat()
+    tag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    if encoding:
+        tag += f"-{encoding}"
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """判断 If-None-Match 是否命中（按弱比较，忽略 W/ 前缀）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择内容编码
+
+    Args:
+        accept_encoding: 请求头 Accept-Encoding
+
+    Returns:
+        选中的编码（br / gzip），不压缩时返回 None
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        if not parts[0]:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        accepted[parts[0].lower()] = quality
+
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in ENCODINGS:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    解析单段字节范围
+
+    Args:
+        range_header: 请求头 Range（如 bytes=0-1023、bytes=-500）
+        size: 文件大小
+
+    Returns:
+        闭区间 (start, end)；格式不支持时返回 None（按完整响应处理）
+
+    Raises:
+        ValueError: 范围无法满足（应返回 416）
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_str, _, end_str = spec.strip().partition("-")
+    if not all(part == "" or part.isdigit() for part in (start_str, end_str)):
+        return None
+    if start_str == "":
+        if end_str == "":
+            return None
+        # 后缀范围: 最后 N 个字节
+        length = int(end_str)
+        if length == 0:
+            raise ValueError(f"范围无法满足: {range_header}")
+        return max(0, size - length), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start > end:
+        return None
+    if start >= size:
+        raise ValueError(f"范围无法满足: {range_header}")
+    return start, min(end, size - 1)
+
+
+def read_range(path: Path, start: int, end: int) -> bytes:
+    """读取闭区间 [start, end] 的字节"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start + 1)
+
+
+def get_precompressed(cache: FrameCache, source: Path, encoding: str) -> Path:
+    """
+    获取预压缩变体（不存在或已过期时生成）
+
+    Args:
+        cache: 帧缓存（数据目录不可写时的退路）
+        source: 源文件
+        encoding: 内容编码（gzip / br）
+
+    Returns:
+        压缩变体路径
+    """
+    suffix, compress = ENCODINGS[encoding]
+    sibling = source.with_name(source.name + suffix)
+    if sibling.exists() and sibling.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+        return sibling
+
+    fallback = cache.path_for(source, "encoded", suffix)
+    if fallback.exists():
+        return fallback
+
+    data = compress(source.read_bytes())
+    try:
+        # 与源文件同权限，nginx gzip_static 等以其他用户运行时也能读取
+        target = cache.write_atomic(sibling, data, mode=stat.S_IMODE(source.stat().st_mode))
+    except OSError as e:
+        logger.warning(f"[VTK] 数据目录不可写，压缩变体改存缓存目录: {e}")
+        target = cache.write_atomic(fallback, data)
+    logger.info(
+        f"[VTK] 预压缩完成: {source.name} ({encoding}), "
+        f"{source.stat().st_size / 1024 / 1024:.2f} MB -> {len(data) / 1024 / 1024:.2f} MB"
+    )
+    return target
@@ -0,0 +1,268 @@
+"""
+共享帧交接
+
+模拟工作进程写出 VTK 帧的同时，把同一帧的数组以 float32 原始数据发布到共享目录
+（默认 /dev/shm 下的内存文件系统）；API 进程的读取路径（reader.load_scalars、slicing.open_volume，
+进而二进制帧 / 切片 / LOD / 统计 / 等值面）按源文件找到共享数组后直接内存映射，
+不再解析 ASCII，也不经 pickle 在进程间复制。
+
+- 帧标识：源文件的 (设备, inode, mtime, 大小)，暂存文件夹改名为缓存条目后不变，源文件改动后失效
+- 引用计数：SQLite 记录每个持有进程的引用数；模拟运行期间发布者只持有最近 pin_frames 帧，
+  发布新帧时释放更早的帧，结束（含取消）时全部释放；被持有的数组总大小不超过预算，
+  否则新帧不发布（读取方回退到解析 VTK 文件）
+- 清理：无引用且超过 TTL 未访问、或总大小超出预算（按最近访问 LRU）的数组被删除；
+  持有进程已退出的引用视为失效。已建立的映射在数组释放前仍然有效，读取方无需持有引用
+- 未使用 multiprocessing.shared_memory：其段登记在创建进程的 resource_tracker 中，
+  工作进程退出时会被回收；内存文件系统上的映射文件同样零拷贝，且可在任意进程按名称打开
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .config import get_vtk_config
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS arrays (
+    name TEXT PRIMARY KEY,
+    meta TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    name TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (name, pid)
+);
+"""
+
+# 共享数组的数据类型（与二进制帧缓存相同）
+SHARED_DTYPE = "<f4"
+
+
+def _alive(pid: int) -> bool:
+    """进程是否仍存在"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedFrameStore:
+    """
+    共享帧存储
+
+    目录结构: {root}/{name}.f32（形状为 (nz, ny, nx) 的 float32 原始数据）+ {root}/shared.db
+    """
+
+    def __init__(self, root: Path, budget_bytes: int, ttl: float, pin_frames: int = 4):
+        self.root = Path(root)
+        self.budget_bytes = budget_bytes
+        self.ttl = ttl
+        self.pin_frames = pin_frames
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "shared.db"
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开连接，正常退出时提交，结束后关闭"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def frame_name(source: Path) -> str:
+        """帧标识（源文件改名不变，改动后随之变化）"""
+        stat = os.stat(source)
+        raw = f"{stat.st_dev}:{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def data_path(self, name: str) -> Path:
+        return self.root / f"{name}.f32"
+
+    def publish(self, source: Path, array: np.ndarray, meta: Dict[str, Any], pin: bool = True) -> Optional[str]:
+        """
+        发布一帧（源文件写出后调用；被持有的数组加上本帧会超出预算时不发布）
+
+        Args:
+            source: 已写出的 VTK 源文件
+            array: 形状为 (nz, ny, nx) 的标量场
+            meta: 源文件头部元数据（同 reader.parse_header），附加取值范围 range
+            pin: 是否由当前进程持有一个引用（之后调用 release 释放）
+
+        Returns:
+            帧标识；超出预算未发布时为 None
+        """
+        name = self.frame_name(source)
+        data = np.ascontiguousarray(array, dtype=SHARED_DTYPE)
+        pinned = self.pinned_bytes()
+        if pinned + data.nbytes > self.budget_bytes:
+            logger.debug(
+                f"[共享帧] 被持有的数组已占 {pinned / 1024 / 1024:.1f} MB，{source.name} 不发布"
+            )
+            return None
+        meta = {**meta, "shape": list(data.shape), "range": [float(data.min()), float(data.max())]}
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                data.tofile(f)
+            os.replace(tmp, self.data_path(name))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO arrays (name, meta, nbytes, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (name, json.dumps(meta, ensure_ascii=False), data.nbytes, now, now),
+            )
+        if pin:
+            self.acquire(name)
+        self.cleanup()
+        return name
+
+    def lookup(self, source: Path) -> Optional[Tuple[np.memmap, Dict[str, Any]]]:
+        """
+        按源文件查找共享数组
+
+        Returns:
+            (形状为 (nz, ny, nx) 的写时复制 memmap, 元数据)；未发布或已清理时为 None
+        """
+        try:
+            name = self.frame_name(source)
+        except OSError:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT meta FROM arrays WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE arrays SET last_access = ? WHERE name = ?", (time.time(), name))
+        meta = json.loads(row["meta"])
+        try:
+            # 写时复制：调用方原地修改不会影响共享数据
+            array = np.memmap(self.data_path(name), dtype=SHARED_DTYPE, mode="c", shape=tuple(meta["shape"]))
+        except (OSError, ValueError):
+            # 数据文件在查询后被清理
+            return None
+        return array, meta
+
+    def pinned_bytes(self) -> int:
+        """被持有（有引用）的数组总大小"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(nbytes), 0) FROM arrays WHERE name IN (SELECT name FROM refs)"
+            ).fetchone()[0]
+
+    def acquire(self, name: str) -> None:
+        """当前进程对帧加一个引用（持有期间不会被清理）"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO refs (name, pid, count) VALUES (?, ?, 1) "
+                "ON CONFLICT(name, pid) DO UPDATE SET count = count + 1",
+                (name, os.getpid()),
+            )
+
+    def release(self, name: str) -> None:
+        """当前进程对帧减一个引用"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE refs SET count = count - 1 WHERE name = ? AND pid = ?", (name, os.getpid())
+            )
+            conn.execute("DELETE FROM refs WHERE count <= 0")
+
+    def _remove(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute("DELETE FROM arrays WHERE name = ?", (name,))
+        conn.execute("DELETE FROM refs WHERE name = ?", (name,))
+        try:
+            self.data_path(name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def cleanup(self) -> int:
+        """
+        清理失效引用与过期数组
+
+        Returns:
+            删除的数组数
+        """
+        now = time.time()
+        removed = 0
+        with self._connect() as conn:
+            for row in conn.execute("SELECT DISTINCT pid FROM refs").fetchall():
+                if not _alive(row["pid"]):
+                    conn.execute("DELETE FROM refs WHERE pid = ?", (row["pid"],))
+            conn.execute("DELETE FROM refs WHERE name NOT IN (SELECT name FROM arrays)")
+            rows = conn.execute(
+                "SELECT a.name, a.nbytes, a.last_access, COUNT(r.pid) AS holders "
+                "FROM arrays a LEFT JOIN refs r ON r.name = a.name "
+                "GROUP BY a.name ORDER BY a.last_access"
+            ).fetchall()
+            total = sum(row["nbytes"] for row in rows)
+            for row in rows:
+                if row["holders"]:
+                    continue
+                if row["last_access"] < now - self.ttl or total > self.budget_bytes:
+                    self._remove(conn, row["name"])
+                    total -= row["nbytes"]
+                    removed += 1
+        if removed:
+            logger.info(f"[共享帧] 清理 {removed} 个数组，剩余 {total / 1024 / 1024:.1f} MB")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """数组数、总大小与被持有的数组数"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) AS count, COALESCE(SUM(nbytes), 0) AS nbytes FROM arrays").fetchone()
+            pinned = conn.execute("SELECT COUNT(DISTINCT name) FROM refs").fetchone()[0]
+        return {
+            "root": str(self.root),
+            "arrays": row["count"],
+            "size_mb": round(row["nbytes"] / 1024 / 1024, 2),
+            "budget_mb": round(self.budget_bytes / 1024 / 1024, 2),
+            "pinned": pinned,
+        }
+
+
+@lru_cache()
+def get_shared_frames() -> Optional[SharedFrameStore]:
+    """
+    获取共享帧存储单例
+
+    返回:
+        SharedFrameStore: 存储实例；VTK_SHARED_FRAMES 关闭时为 None
+    """
+    config = get_vtk_config()
+    if not config.shared_enabled:
+        return None
+    return SharedFrameStore(
+        config.shared_dir, int(config.shared_budget_mb * 1024 * 1024), config.shared_ttl, config.shared_pin_frames
+    )
+
+
+def lookup_shared(source: Path) -> Optional[Tuple[np.memmap, Dict[str, Any]]]:
+    """按源文件查找共享数组（未启用或未发布时为 None）"""
+    store = get_shared_frames()
+    return store.lookup(source) if store is not None else None
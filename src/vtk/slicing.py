@@ -0,0 +1,181 @@
+"""
+二维切片提取
+
+基于二进制帧缓存做 numpy.memmap，切片只读取所需的页，不加载整个体数据；
+模拟工作进程已发布共享数组的帧直接映射共享数组，不再转码。
+切片以二进制帧格式返回（头部 shape 为 [行, 列]），可选 float32 或线性量化的
+uint8/uint16（默认按切片自身 min/max，也可传入时间序列的全局范围，见 quantize.py）。
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import (
+    BINARY_VERSION,
+    MAX_BINARY_HEADER,
+    FrameCache,
+    binary_header,
+    encode_binary_frame,
+    payload_shape,
+    read_binary_header,
+)
+from .quantize import QUANTIZE_DTYPES, quantize, quantize_params
+from .series import list_series_frames
+from .shared import lookup_shared
+
+
+# 切片轴 -> 体数据 (z, y, x) 中的维度
+AXES = {"z": 0, "y": 1, "x": 2}
+
+# 切片数据类型 -> 量化位数（float32 不量化）
+SLICE_BITS = {dtype: bits for bits, dtype in QUANTIZE_DTYPES.items()}
+
+
+def open_volume(cache: FrameCache, source: Path) -> Tuple[Dict[str, Any], np.memmap]:
+    """
+    以内存映射方式打开帧：优先共享数组，否则为二进制缓存（不存在则先转码）
+
+    Args:
+        cache: 帧缓存
+        source: VTK 源文件
+
+    Returns:
+        (二进制帧头部, 形状为 (nz, ny, nx) 的 memmap)
+    """
+    shared = lookup_shared(source)
+    if shared is not None:
+        volume, meta = shared
+        return binary_header(volume, meta), volume
+    binary_path = cache.get_binary_frame(source)
+    with open(binary_path, "rb") as f:
+        header, offset = read_binary_header(f.read(MAX_BINARY_HEADER))
+    volume = np.memmap(binary_path, dtype="<f4", mode="r", offset=offset, shape=payload_shape(header))
+    return header, volume
+
+
+def extract_slice(volume: np.ndarray, axis: str, index: int) -> np.ndarray:
+    """
+    提取切片
+
+    Args:
+        volume: 形状为 (nz, ny, nx) 的体数据
+        axis: 法向轴（x / y / z）
+        index: 沿该轴的下标
+
+    Returns:
+        二维 float32 数组（z: (ny, nx)，y: (nz, nx)，x: (nz, ny)）
+    """
+    if axis not in AXES:
+        raise ValueError(f"不支持的切片轴: {axis}")
+    size = volume.shape[AXES[axis]]
+    if not 0 <= index < size:
+        raise ValueError(f"切片下标越界: {axis}={index}，范围 0~{size - 1}")
+    return np.asarray(np.take(volume, index, axis=AXES[axis]), dtype=np.float32)
+
+
+def quantize_uint8(array: np.ndarray, vmin: float, vmax: float) -> np.ndarray:
+    """按 [vmin, vmax] 线性量化到 0~255"""
+    return quantize(array, vmin, vmax, 8)
+
+
+def _encode_planes(data: np.ndarray, header: Dict[str, Any], dtype: str, value_range: Optional[Tuple[float, float]]) -> bytes:
+    """按 dtype 编码切片数据（量化时补充 range/quantize 字段）"""
+    if dtype == "float32":
+        return encode_binary_frame(data, header)
+    if dtype not in SLICE_BITS:
+        raise ValueError(f"不支持的切片数据类型: {dtype}")
+    vmin, vmax = value_range or header["range"]
+    bits = SLICE_BITS[dtype]
+    header.update({
+        "data_range": header["range"],
+        "range": [vmin, vmax],
+        "quantize": quantize_params(vmin, vmax, bits),
+    })
+    return encode_binary_frame(quantize(data, vmin, vmax, bits), header)
+
+
+def get_slice(
+    cache: FrameCache,
+    source: Path,
+    axis: str,
+    index: int,
+    dtype: str = "float32",
+    value_range: Optional[Tuple[float, float]] = None,
+) -> bytes:
+    """
+    获取单帧切片
+
+    Args:
+        cache: 帧缓存
+        source: VTK 源文件
+        axis: 法向轴
+        index: 下标
+        dtype: float32 / uint8 / uint16
+        value_range: 量化范围（None 为切片自身的 range）
+
+    Returns:
+        二进制帧字节串
+    """
+    _, volume = open_volume(cache, source)
+    plane = extract_slice(volume, axis, index)
+    vmin, vmax = float(plane.min()), float(plane.max())
+    header = {
+        "version": BINARY_VERSION,
+        "axis": axis,
+        "index": index,
+        "shape": list(plane.shape),
+        "dtype": dtype,
+        "byte_order": "little",
+        "range": [vmin, vmax],
+    }
+    return _encode_planes(plane, header, dtype, value_range)
+
+
+def get_slice_stack(
+    cache: FrameCache,
+    folder: Path,
+    axis: str,
+    index: int,
+    dtype: str = "float32",
+    value_range: Optional[Tuple[float, float]] = None,
+) -> bytes:
+    """
+    获取整个时间序列同一位置的切片堆栈（用于 kymograph 等视图）
+
+    Args:
+        cache: 帧缓存
+        folder: 时间序列文件夹
+        axis: 法向轴
+        index: 下标
+        dtype: float32 / uint8 / uint16（默认按整个堆栈的 range 量化，保证各帧色标一致）
+        value_range: 量化范围（None 为堆栈的 range）
+
+    Returns:
+        二进制帧字节串，shape 为 [帧数, 行, 列]
+    """
+    frames = list_series_frames(folder)
+    if not frames:
+        raise ValueError(f"文件夹中没有VTK文件: {folder.name}")
+
+    planes: List[np.ndarray] = []
+    for _, source in frames:
+        _, volume = open_volume(cache, source)
+        planes.append(extract_slice(volume, axis, index))
+    if len({plane.shape for plane in planes}) > 1:
+        raise ValueError(f"时间序列帧尺寸不一致: {folder.name}")
+    stack = np.stack(planes)
+
+    vmin, vmax = float(stack.min()), float(stack.max())
+    header = {
+        "version": BINARY_VERSION,
+        "axis": axis,
+        "index": index,
+        "shape": list(stack.shape),
+        "dtype": dtype,
+        "byte_order": "little",
+        "range": [vmin, vmax],
+        "time_steps": [time_step for time_step, _ in frames],
+        "frame_ranges": [[float(p.min()), float(p.max())] for p in planes],
+    }
+    return _encode_planes(stack, header, dtype, value_range)
@@ -0,0 +1,361 @@
+"""
+分块压缩的四维 (t, z, y, x) 数组存储
+
+把整个时间序列转换为按时间和空间分块的压缩数组（类似 zarr 的本地目录布局，
+只依赖 NumPy + zlib），按时间的随机访问（如单个体素的浓度历史）只需读取相关的块，
+不必解析全部帧文件：
+- 目录布局: {root}/store.json（形状、块形状、时间步等）+ {root}/chunks/{it}.{iz}.{iy}.{ix}
+- 每块按 C 顺序展平为小端 float32，经字节重排（shuffle，同一字节位的数据连续）后 zlib 压缩；
+  边缘块按实际大小存储，不做填充
+- 读取支持 numpy 风格的整数/切片下标（步长为 1），只解压与区域相交的块，
+  解压后的块保存在实例级 LRU 中
+
+时间序列的存储按文件夹指纹（全部帧的 路径 + mtime + 大小）缓存在 {cache_dir}/store/ 下。
+"""
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+from .cache import BINARY_VERSION, FrameCache, encode_binary_frame
+from .series import list_series_frames
+from .slicing import open_volume
+
+
+STORE_VERSION = 1
+STORE_META = "store.json"
+
+# 默认块形状 (t, z, y, x)
+DEFAULT_CHUNKS = (8, 16, 16, 16)
+
+ZLIB_LEVEL = 6
+
+# 每个存储实例缓存的已解压块数
+CHUNK_CACHE_SIZE = 256
+
+# 单次区域读取的最大点数
+MAX_REGION_POINTS = 32 * 1024 * 1024
+
+Index = Union[int, slice]
+
+
+def _shuffle(data: bytes, itemsize: int) -> bytes:
+    """字节重排：把每个元素的第 k 个字节排在一起（提高浮点数据的压缩率）"""
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, itemsize: int) -> bytes:
+    return np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1).T.tobytes()
+
+
+class ChunkedStore:
+    """
+    四维分块存储
+
+    属性:
+        root: 存储目录
+        shape: 数组形状 (t, z, y, x)
+        chunks: 块形状
+        time_steps: 每帧的时间步
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        meta_path = self.root / STORE_META
+        if not meta_path.exists():
+            raise ValueError(f"不是有效的分块存储: {self.root}")
+        self.meta: Dict[str, Any] = json.loads(meta_path.read_text(encoding="utf-8"))
+        self.shape: Tuple[int, ...] = tuple(self.meta["shape"])
+        self.chunks: Tuple[int, ...] = tuple(self.meta["chunks"])
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.time_steps: List[int] = self.meta["time_steps"]
+        self.chunk_reads = 0
+        self._chunk = lru_cache(maxsize=CHUNK_CACHE_SIZE)(self._load_chunk)
+
+    @classmethod
+    def create(
+        cls,
+        root: Path,
+        shape: Sequence[int],
+        chunks: Sequence[int] = DEFAULT_CHUNKS,
+        time_steps: Optional[List[int]] = None,
+        attrs: Optional[Dict[str, Any]] = None,
+    ) -> "ChunkedStore":
+        """
+        创建空存储（写入 store.json，块由 write_block 写入）
+
+        Args:
+            root: 存储目录
+            shape: 数组形状 (t, z, y, x)
+            chunks: 块形状
+            time_steps: 每帧的时间步（默认 0..t-1）
+            attrs: 附加元数据（来源、原点、间距等）
+        """
+        if len(shape) != 4 or len(chunks) != 4 or min(chunks) < 1:
+            raise ValueError(f"形状与块形状都必须是 4 维正整数: {shape}, {chunks}")
+        root = Path(root)
+        (root / "chunks").mkdir(parents=True, exist_ok=True)
+        meta = {
+            "version": STORE_VERSION,
+            "shape": [int(s) for s in shape],
+            "chunks": [int(c) for c in chunks],
+            "dtype": "<f4",
+            "order": "C",
+            "compressor": {"id": "zlib", "level": ZLIB_LEVEL},
+            "filters": ["shuffle"],
+            "time_steps": list(time_steps) if time_steps is not None else list(range(shape[0])),
+            "attrs": attrs or {},
+        }
+        (root / STORE_META).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        return cls(root)
+
+    @property
+    def chunk_grid(self) -> Tuple[int, ...]:
+        """每个维度上的块数"""
+        return tuple(-(-s // c) for s, c in zip(self.shape, self.chunks))
+
+    def chunk_path(self, index: Sequence[int]) -> Path:
+        return self.root / "chunks" / ".".join(str(i) for i in index)
+
+    def chunk_shape(self, index: Sequence[int]) -> Tuple[int, ...]:
+        """块的实际形状（边缘块小于 chunks）"""
+        return tuple(min(c, s - i * c) for i, s, c in zip(index, self.shape, self.chunks))
+
+    def write_block(self, t0: int, block: np.ndarray) -> None:
+        """
+        写入从帧 t0 开始的一段时间块（t0 必须与时间块边界对齐）
+
+        Args:
+            t0: 起始帧
+            block: 形状为 (帧数, z, y, x) 的数据，帧数不超过时间块大小
+        """
+        ct = self.chunks[0]
+        if t0 % ct or block.shape[0] > ct or tuple(block.shape[1:]) != self.shape[1:]:
+            raise ValueError(f"时间块与存储不匹配: t0={t0}, 形状 {block.shape}")
+        it = t0 // ct
+        block = np.ascontiguousarray(block, dtype=self.dtype)
+        for spatial in itertools.product(*(range(n) for n in self.chunk_grid[1:])):
+            region = tuple(slice(i * c, (i + 1) * c) for i, c in zip(spatial, self.chunks[1:]))
+            data = np.ascontiguousarray(block[(slice(None),) + region]).tobytes()
+            self.chunk_path((it,) + spatial).write_bytes(
+                zlib.compress(_shuffle(data, self.dtype.itemsize), ZLIB_LEVEL)
+            )
+
+    def _load_chunk(self, index: Tuple[int, ...]) -> np.ndarray:
+        self.chunk_reads += 1
+        data = _unshuffle(zlib.decompress(self.chunk_path(index).read_bytes()), self.dtype.itemsize)
+        return np.frombuffer(data, dtype=self.dtype).reshape(self.chunk_shape(index))
+
+    def _normalize(self, key: Any) -> Tuple[List[Tuple[int, int]], Tuple[int, ...]]:
+        """下标 -> 各维 [start, stop) 与需要压缩掉的整数下标维度"""
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > 4:
+            raise IndexError(f"下标维数过多: {len(key)}")
+        key = key + (slice(None),) * (4 - len(key))
+        bounds, squeeze = [], []
+        for axis, (k, size) in enumerate(zip(key, self.shape)):
+            if isinstance(k, (int, np.integer)):
+                i = int(k) + size if k < 0 else int(k)
+                if not 0 <= i < size:
+                    raise IndexError(f"第 {axis} 维下标越界: {k}，范围 0~{size - 1}")
+                bounds.append((i, i + 1))
+                squeeze.append(axis)
+            elif isinstance(k, slice):
+                start, stop, step = k.indices(size)
+                if step != 1:
+                    raise ValueError("分块存储只支持步长为 1 的切片")
+                bounds.append((start, max(start, stop)))
+            else:
+                raise TypeError(f"不支持的下标类型: {type(k).__name__}")
+        return bounds, tuple(squeeze)
+
+    def __getitem__(self, key: Any) -> np.ndarray:
+        """
+        读取区域，例如 store[:, 10, 20, 30]（体素历史）、store[5]（整帧）、
+        store[0:10, :, 32]（时间范围内的 XZ 切片）
+        """
+        bounds, squeeze = self._normalize(key)
+        out = np.empty([stop - start for start, stop in bounds], dtype=self.dtype)
+        ranges = [
+            range(start // c, (stop - 1) // c + 1) if stop > start else range(0)
+            for (start, stop), c in zip(bounds, self.chunks)
+        ]
+        for index in itertools.product(*ranges):
+            src, dst = [], []
+            for (start, stop), c, i in zip(bounds, self.chunks, index):
+                lo, hi = max(start, i * c), min(stop, (i + 1) * c)
+                src.append(slice(lo - i * c, hi - i * c))
+                dst.append(slice(lo - start, hi - start))
+            out[tuple(dst)] = self._chunk(index)[tuple(src)]
+        return out.squeeze(axis=squeeze) if squeeze else out
+
+    def point_history(self, x: int, y: int, z: int) -> np.ndarray:
+        """单个体素在全部帧上的取值"""
+        return self[:, z, y, x]
+
+    def info(self) -> Dict[str, Any]:
+        """存储概况（含磁盘占用与压缩率）"""
+        files = list((self.root / "chunks").iterdir())
+        stored = sum(f.stat().st_size for f in files)
+        raw = int(np.prod(self.shape)) * self.dtype.itemsize
+        return {
+            **self.meta,
+            "chunk_grid": list(self.chunk_grid),
+            "chunk_count": len(files),
+            "stored_bytes": stored,
+            "raw_bytes": raw,
+            "compression_ratio": round(raw / stored, 3) if stored else None,
+        }
+
+
+def convert_series(
+    cache: FrameCache,
+    folder: Path,
+    target: Path,
+    chunks: Sequence[int] = DEFAULT_CHUNKS,
+) -> ChunkedStore:
+    """
+    把时间序列文件夹转换为分块存储
+
+    按时间块逐段读入帧（经二进制帧缓存），内存占用约为一个时间块的体数据。
+
+    Args:
+        cache: 帧缓存
+        folder: 时间序列文件夹
+        target: 存储目录（已存在时覆盖）
+        chunks: 块形状 (t, z, y, x)
+
+    Returns:
+        ChunkedStore
+    """
+    frames = list_series_frames(folder)
+    if not frames:
+        raise ValueError(f"文件夹中没有VTK文件: {folder.name}")
+
+    header, first = open_volume(cache, frames[0][1])
+    if Path(target).exists():
+        shutil.rmtree(target)
+    store = ChunkedStore.create(
+        target,
+        (len(frames),) + first.shape,
+        chunks,
+        time_steps=[time_step for time_step, _ in frames],
+        attrs={
+            "folder": folder.name,
+            "names": [source.name for _, source in frames],
+            "origin": header.get("origin"),
+            "spacing": header.get("spacing"),
+            "scalar_name": header.get("scalar_name"),
+        },
+    )
+    ct = store.chunks[0]
+    for t0 in range(0, len(frames), ct):
+        volumes = []
+        for _, source in frames[t0:t0 + ct]:
+            _, volume = open_volume(cache, source)
+            if volume.shape != first.shape:
+                raise ValueError(f"时间序列帧尺寸不一致: {source.name} {volume.shape} != {first.shape}")
+            volumes.append(volume)
+        store.write_block(t0, np.stack(volumes))
+    return store
+
+
+@lru_cache(maxsize=8)
+def _open_store(root: str) -> ChunkedStore:
+    return ChunkedStore(Path(root))
+
+
+def get_series_store(
+    cache: FrameCache, folder: Path, chunks: Sequence[int] = DEFAULT_CHUNKS
+) -> ChunkedStore:
+    """
+    获取时间序列的分块存储（不存在则转换生成）
+
+    Args:
+        cache: 帧缓存
+        folder: 时间序列文件夹
+        chunks: 块形状（只影响新生成的存储）
+
+    Returns:
+        ChunkedStore（同一存储目录复用实例，共享已解压块）
+    """
+    frames = list_series_frames(folder)
+    if not frames:
+        raise ValueError(f"文件夹中没有VTK文件: {folder.name}")
+
+    target = cache.cache_dir / "store" / cache.series_key([source for _, source in frames])
+    if not (target / STORE_META).exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=target.parent, suffix=".tmp"))
+        try:
+            store = convert_series(cache, folder, tmp, chunks)
+            info = store.info()
+            try:
+                os.replace(tmp, target)
+            except OSError:
+                # 并发生成时以先完成的为准
+                pass
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        logger.info(
+            f"[VTK存储] 转换完成: {folder.name}, 形状 {info['shape']}, 块 {info['chunks']}, "
+            f"{info['raw_bytes'] / 1024 / 1024:.2f} MB -> {info['stored_bytes'] / 1024 / 1024:.2f} MB"
+        )
+    return _open_store(str(target))
+
+
+def parse_span(spec: Optional[str], size: int) -> Index:
+    """
+    解析区域参数：None/"" 为整个维度，"i" 为单个下标，"a:b" 为半开区间（端点可省略）
+
+    Args:
+        spec: 参数字符串
+        size: 维度大小（仅用于错误信息）
+    """
+    if spec is None or spec.strip() in ("", ":"):
+        return slice(None)
+    try:
+        if ":" not in spec:
+            return int(spec)
+        start, stop = spec.split(":", 1)
+        return slice(int(start) if start.strip() else None, int(stop) if stop.strip() else None)
+    except ValueError:
+        raise ValueError(f"无效的区域参数: {spec}（应为 i 或 a:b，维度大小 {size}）")
+
+
+def encode_region(store: ChunkedStore, key: Tuple[Index, ...]) -> bytes:
+    """
+    读取区域并编码为二进制帧（头部 shape 为读取结果的形状，附带对应的时间步）
+
+    Args:
+        store: 分块存储
+        key: (t, z, y, x) 下标
+
+    Returns:
+        二进制帧字节串
+    """
+    bounds, _ = store._normalize(key)
+    points = int(np.prod([stop - start for start, stop in bounds]))
+    if points > MAX_REGION_POINTS:
+        raise ValueError(f"读取区域过大: {points} 个点，上限 {MAX_REGION_POINTS}")
+    data = store[key]
+    t_start, t_stop = bounds[0]
+    header = {
+        "version": BINARY_VERSION,
+        "shape": list(data.shape),
+        "region": [list(b) for b in bounds],
+        "dtype": "float32",
+        "byte_order": "little",
+        "range": [float(data.min()), float(data.max())] if data.size else None,
+        "time_steps": store.time_steps[t_start:t_stop],
+    }
+    return encode_binary_frame(data, header)
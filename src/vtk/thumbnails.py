@@ -0,0 +1,168 @@
+"""
+投影缩略图
+
+沿某个轴对体数据做最大值投影（MIP）或平均投影，按固定色标着色后编码为 PNG，
+供时间序列进度条显示整段模拟的缩略图，浏览器无需加载任何体数据：
+- 色标与 VtkTimeSeriesViewer 的 Cool to Warm 传递函数一致
+- 着色范围为时间序列的全局范围（quantize.get_series_range，各帧范围按帧缓存，不转码），各帧色标一致
+- 投影平面超过 MAX_THUMBNAIL_SIZE 的大网格先在平面内等间隔抽样再投影
+- PNG 由 zlib 直接编码（仅 IHDR/IDAT/IEND，无第三方图像库依赖）
+- build_thumbnail 为进程池任务入口，新帧入库时由目录监视器预先生成
+"""
+import struct
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .cache import FrameCache, get_frame_cache
+from .quantize import get_series_range
+from .slicing import AXES, open_volume
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# 投影方式
+PROJECTIONS = ("max", "mean")
+
+# 缩略图边长上限（投影平面内的抽样步长按此确定）
+MAX_THUMBNAIL_SIZE = 256
+
+# Cool to Warm 色标控制点（位置, R, G, B），与前端体渲染传递函数相同
+COOL_TO_WARM = np.array([
+    (0.00, 0.230, 0.299, 0.754),
+    (0.25, 0.553, 0.691, 0.996),
+    (0.50, 0.865, 0.865, 0.865),
+    (0.75, 0.956, 0.647, 0.510),
+    (1.00, 0.706, 0.016, 0.150),
+])
+
+# 256 级查找表
+COLORMAP_LUT = np.stack(
+    [np.interp(np.linspace(0, 1, 256), COOL_TO_WARM[:, 0], COOL_TO_WARM[:, i]) for i in (1, 2, 3)],
+    axis=1,
+).__mul__(255).round().astype(np.uint8)
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """
+    编码 8 位 PNG
+
+    Args:
+        image: (h, w) 灰度或 (h, w, 3) RGB 的 uint8 数组
+
+    Returns:
+        PNG 字节串
+    """
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    color_type = 2 if image.ndim == 3 else 0
+    # 每行前加过滤类型字节 0（None）
+    rows = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)], axis=1)
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (
+        PNG_SIGNATURE
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 9))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def project(volume: np.ndarray, axis: str = "z", mode: str = "max") -> np.ndarray:
+    """
+    沿轴投影
+
+    Args:
+        volume: 形状为 (nz, ny, nx) 的体数据
+        axis: 投影方向（x / y / z）
+        mode: max（最大值投影）/ mean（平均投影）
+
+    Returns:
+        二维 float32 数组（z: (ny, nx)，y: (nz, nx)，x: (nz, ny)）
+    """
+    if axis not in AXES:
+        raise ValueError(f"不支持的投影轴: {axis}")
+    if mode not in PROJECTIONS:
+        raise ValueError(f"不支持的投影方式: {mode}，可选 {' / '.join(PROJECTIONS)}")
+    reduce = np.max if mode == "max" else np.mean
+    return reduce(volume, axis=AXES[axis]).astype(np.float32)
+
+
+def downsample_plane(volume: np.ndarray, axis: str, max_size: int = MAX_THUMBNAIL_SIZE) -> np.ndarray:
+    """
+    在投影平面内等间隔抽样，使两个平面维度都不超过 max_size（投影方向保持全分辨率）
+
+    Returns:
+        抽样后的视图（无需抽样时为原数组）
+    """
+    if axis not in AXES:
+        raise ValueError(f"不支持的投影轴: {axis}")
+    index = [slice(None)] * volume.ndim
+    for dim, size in enumerate(volume.shape[:3]):
+        if dim != AXES[axis] and size > max_size:
+            index[dim] = slice(None, None, -(-size // max_size))
+    return volume[tuple(index)]
+
+
+def render_thumbnail(
+    volume: np.ndarray,
+    axis: str = "z",
+    mode: str = "max",
+    value_range: Optional[Tuple[float, float]] = None,
+    max_size: int = MAX_THUMBNAIL_SIZE,
+) -> bytes:
+    """
+    渲染投影缩略图
+
+    Args:
+        volume: 体数据 (nz, ny, nx)
+        axis: 投影方向
+        mode: 投影方式
+        value_range: 着色范围（None 为投影结果自身的范围）
+        max_size: 缩略图边长上限
+
+    Returns:
+        PNG 字节串（图像第一行对应投影平面的最大行坐标，即纵轴朝上）
+    """
+    image = project(downsample_plane(volume, axis, max_size), axis, mode)
+    vmin, vmax = value_range or (float(image.min()), float(image.max()))
+    span = vmax - vmin
+    levels = np.zeros(image.shape, dtype=np.uint8) if span <= 0 else (
+        np.clip(np.rint((image - vmin) * (255 / span)), 0, 255).astype(np.uint8)
+    )
+    return encode_png(COLORMAP_LUT[levels[::-1]])
+
+
+def thumbnail_path(
+    cache: FrameCache, source: Path, axis: str, mode: str, value_range: Tuple[float, float]
+) -> Path:
+    """缩略图缓存路径（按 源帧 + 投影参数 + 着色范围）"""
+    vmin, vmax = value_range
+    return cache.path_for(source, "thumbs", f".{mode}{axis}.{vmin:.9g}_{vmax:.9g}.png")
+
+
+def build_thumbnail(source: str, axis: str = "z", mode: str = "max") -> str:
+    """
+    生成并缓存一帧的缩略图（进程池任务入口，参数与返回值均可序列化）
+
+    Args:
+        source: VTK 源文件路径
+        axis: 投影方向
+        mode: 投影方式
+
+    Returns:
+        缩略图缓存路径
+    """
+    cache = get_frame_cache()
+    path = Path(source)
+    value_range = get_series_range(cache, path.parent)
+    target = thumbnail_path(cache, path, axis, mode, value_range)
+    if not target.exists():
+        _, volume = open_volume(cache, path)
+        cache.write_atomic(target, render_thumbnail(volume, axis, mode, value_range))
+    return str(target)
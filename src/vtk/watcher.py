@@ -0,0 +1,210 @@
+"""
+模拟输出目录监视与派生数据预计算
+
+后台轮询 data_root 下的 *.vtk 文件（按 mtime + 大小判断新增/变化），
+把预计算任务（二进制转码、LOD 金字塔、帧统计、投影缩略图）放入有界队列，由固定数量的
+消费者提交到进程池执行：
+- 队列满时扫描协程在 put 处等待（背压），不会无限堆积任务
+- 每次扫描后对有变化的文件夹增量刷新元数据索引
+- status() 提供队列深度与进度，供 /api/vtk/watcher 查询
+
+data_root 默认是项目根目录，递归 inotify 需要监视 src/、frontend/ 等大量无关目录，
+因此采用限制深度的轮询（只看根目录及其下 WATCH_DEPTH 层子目录）。
+"""
+import asyncio
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from .analytics import get_frame_stats
+from .cache import get_frame_cache
+from .config import get_vtk_config
+from .index import get_vtk_index
+from .lod import get_lod_frame
+from .thumbnails import PROJECTIONS, build_thumbnail
+from .workers import get_process_pool, run_io
+
+
+# 扫描的子目录深度（0 只看根目录）
+WATCH_DEPTH = 2
+
+# 不扫描的目录
+IGNORED_DIRS = {"src", "frontend", "node_modules", "__pycache__", "venv", "env", "logs"}
+
+
+def precompute_frame(source: str) -> Dict[str, Any]:
+    """
+    预计算一帧的派生数据（进程池任务入口，参数与返回值均可序列化）
+
+    Args:
+        source: VTK 源文件路径
+
+    Returns:
+        各步骤耗时（秒）
+    """
+    cache = get_frame_cache()
+    path = Path(source)
+    timings = {}
+    for step, func in (
+        ("binary", lambda: cache.get_binary_frame(path)),
+        ("lod", lambda: get_lod_frame(cache, path, 0)),
+        ("stats", lambda: get_frame_stats(cache, path)),
+        ("thumbs", lambda: [build_thumbnail(source, "z", mode) for mode in PROJECTIONS]),
+    ):
+        start = time.perf_counter()
+        func()
+        timings[step] = round(time.perf_counter() - start, 4)
+    return timings
+
+
+class VTKWatcher:
+    """VTK 目录监视器"""
+
+    def __init__(self, data_root: Path, interval: float = 10.0, max_pending: int = 64, workers: int = 2):
+        self.data_root = Path(data_root)
+        self.interval = interval
+        self.max_pending = max_pending
+        self.workers = workers
+        self.ignored = set(IGNORED_DIRS)
+        self._seen: Dict[str, Tuple[int, int]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running: Set[str] = set()
+        self._progress = {"discovered": 0, "completed": 0, "failed": 0}
+        self._last_scan: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """启动扫描协程与消费者"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.create_task(self._scan_loop())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(
+            f"[VTK监视] 已启动: {self.data_root}, 间隔 {self.interval:g}s, "
+            f"队列上限 {self.max_pending}, 消费者 {self.workers}"
+        )
+
+    async def stop(self) -> None:
+        """停止全部后台任务"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("[VTK监视] 已停止")
+
+    def status(self) -> Dict[str, Any]:
+        """队列深度与进度"""
+        return {
+            "running": self.running,
+            "data_root": str(self.data_root),
+            "interval": self.interval,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_limit": self.max_pending,
+            "in_progress": sorted(self._running),
+            "tracked_files": len(self._seen),
+            **self._progress,
+            "last_scan": self._last_scan,
+            "last_error": self._last_error,
+        }
+
+    def scan(self) -> List[Path]:
+        """
+        扫描一次，返回新增/变化的 VTK 文件（同时记录其签名，避免重复入队）
+        """
+        changed = []
+        current = set()
+        pending = [(self.data_root, 0)]
+        while pending:
+            folder, depth = pending.pop()
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if depth < WATCH_DEPTH and not entry.name.startswith(".") and entry.name not in self.ignored:
+                        pending.append((Path(entry.path), depth + 1))
+                elif entry.name.endswith(".vtk") and entry.is_file():
+                    stat = entry.stat()
+                    signature = (stat.st_mtime_ns, stat.st_size)
+                    current.add(entry.path)
+                    if self._seen.get(entry.path) != signature:
+                        self._seen[entry.path] = signature
+                        changed.append(Path(entry.path))
+        for path in set(self._seen) - current:
+            del self._seen[path]
+        self._last_scan = time.time()
+        return sorted(changed)
+
+    async def _scan_loop(self) -> None:
+        while True:
+            try:
+                changed = await run_io(self.scan)
+                if changed:
+                    logger.info(f"[VTK监视] 发现 {len(changed)} 个新增/变化的文件")
+                    await self._refresh_index({path.parent for path in changed})
+                for path in changed:
+                    self._progress["discovered"] += 1
+                    # 队列满时在此等待（背压）
+                    await self._queue.put(path)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"[VTK监视] 扫描失败: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _refresh_index(self, folders: Set[Path]) -> None:
+        """增量刷新有变化的文件夹的元数据索引"""
+        index = get_vtk_index()
+        for folder in folders:
+            try:
+                key = folder.relative_to(self.data_root).as_posix()
+                await run_io(index.refresh_folder, "" if key == "." else key)
+            except Exception as e:
+                logger.warning(f"[VTK监视] 刷新索引失败 {folder}: {e}")
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            path = await self._queue.get()
+            name = str(path.relative_to(self.data_root))
+            self._running.add(name)
+            try:
+                timings = await loop.run_in_executor(get_process_pool(), precompute_frame, str(path))
+                self._progress["completed"] += 1
+                logger.debug(f"[VTK监视] 预计算完成 {name}: {timings}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._progress["failed"] += 1
+                self._last_error = f"{name}: {e}"
+                logger.warning(f"[VTK监视] 预计算失败 {name}: {e}")
+            finally:
+                self._running.discard(name)
+                self._queue.task_done()
+
+
+@lru_cache()
+def get_vtk_watcher() -> VTKWatcher:
+    """
+    获取目录监视器单例
+
+    返回:
+        VTKWatcher: 监视器实例
+    """
+    config = get_vtk_config()
+    watcher = VTKWatcher(config.data_root, config.watch_interval, config.watch_queue, config.max_workers)
+    # 缓存目录位于 data_root 之下时不扫描
+    watcher.ignored.add(config.cache_dir.name)
+    return watcher
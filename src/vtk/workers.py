@@ -0,0 +1,102 @@
+"""
+VTK 任务执行器
+
+- 进程池：等值面提取等纯计算任务放到独立进程中执行，避免占用事件循环与线程池，
+  也绕开 GIL。任务函数须为模块级函数，参数与返回值可序列化。
+- I/O 线程池：路由中所有阻塞的文件操作（open/stat/glob、缓存读写、索引查询）经 run_io
+  提交到独立的有界线程池。数据目录在慢速存储（如 NFS）上时，阻塞只占用这些线程，
+  不会卡住事件循环，也不会耗尽其他请求（对话推流等）共用的默认线程池。
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, TypeVar
+
+from loguru import logger
+
+from .config import get_vtk_config
+
+T = TypeVar("T")
+
+# 已提交到 I/O 线程池、尚未完成的调用数（只在事件循环线程中修改）
+_io_in_flight = 0
+
+# 进程池启动方式：进程池在服务运行中按需创建，此时已有 I/O 线程池、日志处理器与 SQLite 连接，
+# fork 多线程进程可能让子进程卡在 fork 时被其他线程持有的锁上，因此由干净的 forkserver 进程派生
+# （不支持 forkserver 的平台使用 spawn）
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def pool_context() -> multiprocessing.context.BaseContext:
+    """进程池的 multiprocessing 上下文（ProcessPoolExecutor 的 mp_context）"""
+    return multiprocessing.get_context(POOL_START_METHOD)
+
+
+@lru_cache()
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    获取进程池单例（首次使用时创建）
+
+    返回:
+        ProcessPoolExecutor: 进程池实例
+    """
+    max_workers = get_vtk_config().max_workers
+    logger.info(f"[VTK] 创建进程池: {max_workers} 个进程")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=pool_context())
+
+
+def shutdown_process_pool() -> None:
+    """关闭进程池（应用关闭时调用，未创建过则跳过）"""
+    if get_process_pool.cache_info().currsize == 0:
+        return
+    get_process_pool().shutdown(wait=False, cancel_futures=True)
+    get_process_pool.cache_clear()
+    logger.info("[VTK] 进程池已关闭")
+
+
+@lru_cache()
+def get_io_executor() -> ThreadPoolExecutor:
+    """
+    获取 I/O 线程池单例（首次使用时创建）
+
+    返回:
+        ThreadPoolExecutor: 线程池实例
+    """
+    io_threads = get_vtk_config().io_threads
+    logger.info(f"[VTK] 创建 I/O 线程池: {io_threads} 个线程")
+    return ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix="vtk-io")
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    在 I/O 线程池中执行阻塞调用
+
+    线程全部占用时调用在线程池队列中等待，事件循环不受影响。
+    """
+    global _io_in_flight
+    loop = asyncio.get_running_loop()
+    _io_in_flight += 1
+    try:
+        return await loop.run_in_executor(get_io_executor(), partial(func, *args, **kwargs))
+    finally:
+        _io_in_flight -= 1
+
+
+def io_status() -> Dict[str, int]:
+    """I/O 线程池状态：线程数、进行中与排队的调用数"""
+    threads = get_vtk_config().io_threads
+    return {
+        "threads": threads,
+        "in_flight": _io_in_flight,
+        "queued": max(0, _io_in_flight - threads),
+    }
+
+
+def shutdown_io_executor() -> None:
+    """关闭 I/O 线程池（应用关闭时调用，未创建过则跳过）"""
+    if get_io_executor.cache_info().currsize == 0:
+        return
+    get_io_executor().shutdown(wait=False, cancel_futures=True)
+    get_io_executor.cache_clear()
+    logger.info("[VTK] I/O 线程池已关闭")
@@ -0,0 +1,20 @@
+"""测试公共夹具"""
+import pytest
+
+from src.vtk.cache import get_frame_cache
+from src.vtk.config import get_vtk_config
+from src.vtk.shared import get_shared_frames
+
+
+@pytest.fixture
+def vtk_env(tmp_path, monkeypatch):
+    """VTK 数据根目录与缓存目录指向临时目录，关闭共享帧（不写 /dev/shm）"""
+    monkeypatch.setenv("VTK_DATA_ROOT", str(tmp_path))
+    monkeypatch.setenv("VTK_CACHE_DIR", str(tmp_path / ".vtk_cache"))
+    monkeypatch.setenv("VTK_SHARED_FRAMES", "false")
+    singletons = (get_vtk_config, get_shared_frames, get_frame_cache)
+    for getter in singletons:
+        getter.cache_clear()
+    yield tmp_path
+    for getter in singletons:
+        getter.cache_clear()
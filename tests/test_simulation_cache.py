@@ -0,0 +1,66 @@
+"""模拟结果缓存：配方归一化与按预算淘汰"""
+import pytest
+
+from src.simulation.cache import SimulationCache, normalize_recipe, resolve_recipe
+from src.simulation.config import SimulationConfig
+
+
+BASE = {"al_content": 33.0, "ti_content": 17.0, "n_content": 50.0}
+
+
+def test_equivalent_recipes_share_a_key():
+    config = SimulationConfig()
+    _, _, key = resolve_recipe(BASE, {"deposition_temperature": 700}, config)
+    # 成分按比例缩放、键顺序不同、温度在仪器精度内
+    scaled = {"n_content": 100, "ti_content": 34, "al_content": 66}
+    _, _, same = resolve_recipe(scaled, {"deposition_temperature": 700.3}, config)
+    _, _, other = resolve_recipe(BASE, {"deposition_temperature": 800}, config)
+
+    assert key == same
+    assert key != other
+
+
+def test_normalize_recipe_scales_composition_to_100():
+    recipe = normalize_recipe({"al_content": 2, "ti_content": 1, "n_content": 1}, {})
+    assert sum(recipe["composition"].values()) == pytest.approx(100.0, abs=0.2)
+
+
+@pytest.mark.parametrize("composition", [{"al_content": 0}, {"al_content": "abc"}, {}])
+def test_invalid_composition_raises_value_error(composition):
+    with pytest.raises(ValueError):
+        normalize_recipe(composition, {})
+
+
+def _add_entry(cache: SimulationCache, key: str, size: int) -> None:
+    entry = cache.entry_dir(key)
+    entry.mkdir(parents=True)
+    (entry / "payload.bin").write_bytes(b"\0" * size)
+    cache.put(key, {"key": key}, {"key": key})
+
+
+def test_evict_respects_budget_and_keep(vtk_env):
+    cache = SimulationCache(vtk_env / "sims", budget_bytes=10 ** 9)
+    for key in ("a", "b", "c"):
+        _add_entry(cache, key, 1000)
+    # 最近访问：c 最新，a 最旧
+    with cache._connect() as conn:
+        for i, key in enumerate(("a", "b", "c")):
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (i, key))
+    size = cache.stats()["total_bytes"] // 3
+
+    cache.budget_bytes = size
+    removed = cache.evict(keep="a")
+
+    # 按最近访问从旧到新淘汰，跳过 keep
+    assert removed == ["b", "c"]
+    assert cache.stats()["total_bytes"] <= cache.budget_bytes
+    assert cache.get("a") is not None
+    assert all(not cache.entry_dir(key).exists() and cache.get(key) is None for key in removed)
+
+
+def test_evict_under_budget_removes_nothing(vtk_env):
+    cache = SimulationCache(vtk_env / "sims", budget_bytes=10 ** 9)
+    _add_entry(cache, "a", 1000)
+
+    assert cache.evict() == []
+    assert cache.get("a") is not None
@@ -0,0 +1,58 @@
+"""模拟任务表的状态转换"""
+import os
+
+import pytest
+
+from src.simulation.jobs import FINAL_STATUSES, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / "jobs.sqlite3")
+
+
+def test_create_records_owner_and_queued_status(store):
+    job = store.create("deposition", {"composition": {"al_content": 33}}, session_id="s1")
+
+    assert job["status"] == "queued"
+    assert job["owner_pid"] == os.getpid()
+    assert job["request"] == {"composition": {"al_content": 33}}
+    assert store.list("s1")[0]["id"] == job["id"]
+
+
+@pytest.mark.parametrize("final", FINAL_STATUSES)
+def test_finish_does_not_overwrite_final_status(store, final):
+    job = store.create("deposition", {})
+    store.finish(job["id"], final, error="first")
+    store.finish(job["id"], "failed" if final != "failed" else "completed", error="second")
+
+    finished = store.get(job["id"])
+    assert finished["status"] == final
+    assert finished["error"] == "first"
+
+
+def test_progress_and_result_round_trip(store):
+    job = store.create("deposition", {})
+    store.update(job["id"], status="running", progress={"step": 20, "steps": 100})
+    store.finish(job["id"], "completed", result={"frames": 6})
+
+    finished = store.get(job["id"])
+    assert finished["progress"] == {"step": 20, "steps": 100}
+    assert finished["result"] == {"frames": 6}
+    assert finished["finished_at"] is not None
+
+
+def test_interrupt_only_jobs_of_exited_processes(store):
+    alive = store.create("deposition", {})
+    dead = store.create("deposition", {})
+    done = store.create("deposition", {})
+    store.finish(done["id"], "completed")
+    with store._connect() as conn:
+        # PID 1 始终存在；超出 pid_max 的 PID 不可能存在
+        conn.execute("UPDATE jobs SET owner_pid = 1 WHERE id = ?", (alive["id"],))
+        conn.execute("UPDATE jobs SET owner_pid = ? WHERE id = ?", (2 ** 22 + 1, dead["id"]))
+
+    assert store.interrupt_unfinished() == 1
+    assert store.get(alive["id"])["status"] == "queued"
+    assert store.get(dead["id"])["status"] == "failed"
+    assert store.get(done["id"])["status"] == "completed"
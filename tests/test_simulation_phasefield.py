@@ -0,0 +1,35 @@
+"""相场模拟的提前停止"""
+from src.simulation.phasefield import ConvergenceCriteria, PhaseFieldParams, in_spinodal, run_simulation
+
+
+def _params(c0: float, steps: int) -> PhaseFieldParams:
+    return PhaseFieldParams(c0=c0, grid=16, steps=steps, save_every=20, seed=1)
+
+
+def test_outside_spinodal_stops_homogeneous(vtk_env):
+    assert not in_spinodal(0.1)
+    record = run_simulation(vtk_env / "run", _params(0.1, 2000), criteria=ConvergenceCriteria())
+
+    assert record["stop"]["reason"] == "homogeneous"
+    assert record["stop"]["step"] < 2000
+    # 首末帧总是写出
+    assert record["frames"][0] == "conc-0.vtk"
+    assert record["frames"][-1] == f"conc-{record['stop']['step']}.vtk"
+
+
+def test_without_criteria_runs_all_steps(vtk_env):
+    assert in_spinodal(0.5)
+    record = run_simulation(vtk_env / "run", _params(0.5, 200))
+
+    assert record["stop"] == {"reason": "max_steps", "step": 200}
+    assert record["frames"] == [f"conc-{step}.vtk" for step in range(0, 201, 20)]
+    assert all((vtk_env / "run" / name).is_file() for name in record["frames"])
+    assert (vtk_env / "run" / "run.json").is_file()
+
+
+def test_inside_spinodal_stops_converged_or_at_max_steps(vtk_env):
+    record = run_simulation(vtk_env / "run", _params(0.5, 3000), criteria=ConvergenceCriteria())
+
+    assert record["stop"]["reason"] in ("converged", "max_steps")
+    assert record["stop"]["reason"] != "homogeneous"
+    assert record["stop"]["step"] >= ConvergenceCriteria().min_steps
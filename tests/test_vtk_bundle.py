@@ -0,0 +1,46 @@
+"""时间序列增量编码打包的往返精度"""
+import numpy as np
+import pytest
+
+from src.vtk.bundle import CODECS, DEFAULT_QUANTUM, decode_series, encode_series
+
+
+META = {"dimensions": [12, 10, 8], "origin": [0.0, 0.0, 0.0], "spacing": [1.0, 1.0, 1.0], "scalar_name": "c"}
+
+
+def _frames(count: int = 5):
+    """逐帧缓慢演化的合成浓度场 (nz, ny, nx)"""
+    rng = np.random.default_rng(0)
+    field = 0.5 + 0.1 * rng.standard_normal((8, 10, 12))
+    frames = []
+    for i in range(count):
+        field = np.clip(field + 0.01 * rng.standard_normal(field.shape), 0.0, 1.0)
+        frames.append((i * 20, f"conc-{i * 20}.vtk", field.copy()))
+    return frames
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+@pytest.mark.parametrize("quantum", [DEFAULT_QUANTUM, 1e-3])
+def test_round_trip_error_within_half_quantum(codec, quantum):
+    frames = _frames()
+    header, decoded = decode_series(encode_series(frames, META, quantum=quantum, codec=codec))
+
+    assert header["codec"] == codec
+    assert header["frame_count"] == len(frames)
+    assert [entry["time_step"] for entry in header["frames"]] == [t for t, _, _ in frames]
+    for (_, _, original), array in zip(frames, decoded):
+        assert array.shape == original.shape
+        # 量化误差 quantum / 2，另加解码为 float32 的舍入
+        tolerance = quantum / 2 + np.finfo(np.float32).eps * np.abs(original)
+        assert np.all(np.abs(array.astype(np.float64) - original) <= tolerance)
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_keyframe_is_exact(codec):
+    frames = _frames()
+    quantum = DEFAULT_QUANTUM
+    header, decoded = decode_series(encode_series(frames, META, quantum=quantum, codec=codec))
+
+    assert header["frames"][0]["kind"] == "key"
+    expected = (np.rint(frames[0][2] / quantum) * quantum).astype(np.float32)
+    np.testing.assert_array_equal(decoded[0], expected)